@@ -8,6 +8,8 @@ SATELLITE_URL = "https://celestrak.org/NORAD/elements/gp.php?GROUP=active&FORMAT
 GROUND_STATIONS_URL = "https://network.satnogs.org/api/stations/"  # paginated
 SAGSIN_TABLE_URL = "https://www.ndbc.noaa.gov/data/stations/station_table.txt"
 AIRCRAFT_URL = "https://opensky-network.org/api/states/all"
+# aircraft absent from the feed for this long are dropped
+AIRCRAFT_TIMEOUT_SEC = 120
 
 
 @dataclass
@@ -44,7 +46,27 @@ class DataFetcher:
         self._satellites: Dict[int, Satellite] = {}
         self._ground_stations: Dict[str, GroundStation] = {}
         self._aircraft: Dict[str, Aircraft] = {}
+        self._aircraft_seen: Dict[str, float] = {}
         self.last_refresh: float | None = None
+        # url -> {"ETag": ..., "Last-Modified": ...} from the last 200 response
+        self._validators: Dict[str, Dict[str, str]] = {}
+
+    def _get(self, url: str) -> requests.Response | None:
+        """Conditional GET; returns None on 304 so callers keep what they already hold."""
+        v = self._validators.get(url, {})
+        headers = {}
+        if "ETag" in v:
+            headers["If-None-Match"] = v["ETag"]
+        if "Last-Modified" in v:
+            headers["If-Modified-Since"] = v["Last-Modified"]
+        resp = self.session.get(url, timeout=20, headers=headers)
+        if resp.status_code == 304:
+            return None
+        if resp.ok:
+            kept = {k: resp.headers[k] for k in ("ETag", "Last-Modified") if k in resp.headers}
+            if kept:
+                self._validators[url] = kept
+        return resp
 
     # Public API
     def refresh_all(self):
@@ -64,7 +86,9 @@ class DataFetcher:
     # Fetchers
     def fetch_satellites(self, limit: int | None = None):
         try:
-            resp = self.session.get(SATELLITE_URL, timeout=20)
+            resp = self._get(SATELLITE_URL)
+            if resp is None:
+                return
             resp.raise_for_status()
             data = resp.json()
             count = 0
@@ -85,7 +109,9 @@ class DataFetcher:
     def fetch_ground_stations(self, limit: int | None = None):
         try:
             # SatNOGS API is paginated. We'll just pull first page.
-            resp = self.session.get(GROUND_STATIONS_URL, timeout=20)
+            resp = self._get(GROUND_STATIONS_URL)
+            if resp is None:
+                return
             resp.raise_for_status()
             data = resp.json()
             count = 0
@@ -107,12 +133,15 @@ class DataFetcher:
 
     def fetch_aircraft(self, limit: int | None = None):
         try:
-            resp = self.session.get(AIRCRAFT_URL, timeout=20)
+            resp = self._get(AIRCRAFT_URL)
+            if resp is None:
+                return
             if resp.status_code == 429:
                 print("[fetch] aircraft rate limited")
                 return
             resp.raise_for_status()
             data = resp.json()
+            now = time.time()
             states = data.get("states", [])
             count = 0
             for st in states:
@@ -129,7 +158,17 @@ class DataFetcher:
                     continue
                 alt_km = baro_alt / 1000.0 if baro_alt else None
                 pos = Position(lat=lat, lon=lon, alt_km=alt_km)
-                self._aircraft[icao24] = Aircraft(icao24=icao24, callsign=callsign, position=pos)
+                known = self._aircraft.get(icao24)
+                if known is None:
+                    self._aircraft[icao24] = Aircraft(icao24=icao24, callsign=callsign, position=pos)
+                else:
+                    known.callsign = callsign
+                    known.position = pos
+                self._aircraft_seen[icao24] = now
                 count += 1
+            for icao24, seen in list(self._aircraft_seen.items()):
+                if now - seen > AIRCRAFT_TIMEOUT_SEC:
+                    del self._aircraft_seen[icao24]
+                    self._aircraft.pop(icao24, None)
         except Exception as e:
             print("[fetch] aircraft error", e)
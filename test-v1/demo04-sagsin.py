@@ -384,6 +384,18 @@ def segment_intersects_earth(p1, p2, R=RE):
 def has_los(p1, p2):
     return not segment_intersects_earth(p1, p2, RE)
 
+def los_mask(P1, P2, R=RE):
+    """Batch của has_los: P1, P2 là mảng (M,3); trả mask (M,) True nếu đoạn không cắt Trái Đất."""
+    P1 = np.asarray(P1, dtype=float); P2 = np.asarray(P2, dtype=float)
+    D = P2 - P1
+    a = np.einsum("ij,ij->i", D, D)
+    b = np.einsum("ij,ij->i", P1, D)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(a > 0, -b / a, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    closest = P1 + t[:, None]*D
+    return np.einsum("ij,ij->i", closest, closest) >= R*R
+
 # ---------- Node base ----------
 class Node:
     def __init__(self, name, kind, pos, range_km, trail_len=200):
@@ -617,15 +629,16 @@ def build_nodes():
 
 # ---------- Link computation ----------
 def compute_links(nodes):
-    links = []
     N = len(nodes)
-    for i in range(N):
-        for j in range(i+1, N):
-            a = nodes[i]; b = nodes[j]
-            d = norm(a.pos - b.pos)
-            if d <= min(a.range_km, b.range_km) and has_los(a.pos, b.pos):
-                links.append((i, j, d))
-    return links
+    if N < 2:
+        return []
+    pos = np.array([n.pos for n in nodes], dtype=float)
+    rng = np.array([n.range_km for n in nodes], dtype=float)
+    ii, jj = np.triu_indices(N, k=1)          # thứ tự (i,j) giống vòng lặp cũ
+    d = np.linalg.norm(pos[ii] - pos[jj], axis=1)
+    ok = d <= np.minimum(rng[ii], rng[jj])
+    ok[ok] = los_mask(pos[ii[ok]], pos[jj[ok]])
+    return [(int(i), int(j), float(dd)) for i, j, dd in zip(ii[ok], jj[ok], d[ok])]
 
 # ---------- Coordinate matrix string ----------
 def coords_matrix_str(nodes, t_s=None):
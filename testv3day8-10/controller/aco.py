@@ -3,27 +3,35 @@ from typing import Dict, Tuple, List
 # from .models import NodeInfo, NextHopTable
 # from .geo import haversine_km, los_possible
 from models import NodeInfo, NextHopTable  
-from geo import haversine_km, los_possible
+import numpy as np
+from geo import haversine_km, los_possible_mask, GeoCache
 
-def build_graph(nodes: Dict[int, NodeInfo], max_link_km: float) -> Dict[int, List[int]]:
+def build_graph(nodes: Dict[int, NodeInfo], max_link_km: float, geo: GeoCache = None) -> Dict[int, List[int]]:
+    # Tính toàn bộ cặp một lần bằng numpy thay vì los_possible/haversine từng cặp
+    # geo: GeoCache của tick hiện tại (None = tự dựng)
     adj = {nid: [] for nid in nodes}
-    ids = list(nodes.keys())
-    for i in range(len(ids)):
-        for j in range(i+1, len(ids)):
-            a = nodes[ids[i]]
-            b = nodes[ids[j]]
-            if los_possible(a.lat,a.lon,a.alt_km, b.lat,b.lon,b.alt_km) and \
-               haversine_km(a.lat,a.lon,b.lat,b.lon) <= max_link_km:
-                adj[a.node_id].append(b.node_id)
-                adj[b.node_id].append(a.node_id)
+    if len(nodes) < 2:
+        return adj
+    if geo is None:
+        geo = GeoCache(nodes)
+    d = geo.surface_km_matrix()
+    ok = los_possible_mask(d, geo.alt_km[:, None], geo.alt_km[None, :]) & (d <= max_link_km)
+    ii, jj = np.nonzero(np.triu(ok, k=1))
+    for i, j in zip(ii.tolist(), jj.tolist()):
+        a = geo.ids[i]; b = geo.ids[j]
+        adj[a].append(b)
+        adj[b].append(a)
     return adj
 
-def aco_next_hop(nodes: Dict[int, NodeInfo], max_link_km: float, iters=10, ants=40) -> NextHopTable:
+def aco_next_hop(nodes: Dict[int, NodeInfo], max_link_km: float, iters=10, ants=40,
+                 adj: Dict[int, List[int]] = None) -> NextHopTable:
     """
     Trả về bảng next-hop: (src,dst)->nhảy kế tiếp.
     Heuristic: 1/distance, pheromone trên cạnh.
+    adj: đồ thị tick đã dựng (None = dựng lại từ nodes).
     """
-    adj = build_graph(nodes, max_link_km)
+    if adj is None:
+        adj = build_graph(nodes, max_link_km)
     # Khởi tạo pheromone
     tau = {}  # (u,v) -> pheromone
     for u, nbrs in adj.items():
@@ -5,7 +5,7 @@ import logging, sys
 from models import NodeInfo
 from datasources import DataSource
 from aco import aco_next_hop, build_graph
-from geo import haversine_km
+from geo import GeoCache
 
 HOST = "0.0.0.0"
 CTRL_PORT = 7100        # kênh control (node kết nối vào)
@@ -194,7 +194,9 @@ async def periodic_update():
             await ds.update_from_opensky(nodes)
 
             # 2) Xây đồ thị & chạy ACO -> nexthop
-            adj = build_graph(nodes, MAX_LINK_KM)
+            # toạ độ ECEF tính 1 lần cho cả tick: đồ thị, ACO và fallback đều dùng chung
+            geo = GeoCache(nodes)
+            adj = build_graph(nodes, MAX_LINK_KM, geo)
             def comp_sizes(adj):
                 seen=set(); sizes=[]
                 for u in adj:
@@ -214,7 +216,7 @@ async def periodic_update():
                       len(nodes), edges, len(sizes), sizes[0] if sizes else 0)
 
             global nexthop
-            nexthop = aco_next_hop(nodes, MAX_LINK_KM, iters=8, ants=30)
+            nexthop = aco_next_hop(nodes, MAX_LINK_KM, iters=8, ants=30, adj=adj)
 
             # 3) Phát tán nexthop + directory tới mọi node
             dist_tbl = {}
@@ -224,20 +226,8 @@ async def periodic_update():
             directory = {nid: {"host": n.host, "port": n.port, "kind": n.kind}
                           for nid, n in nodes.items()}
             
-            fallback_next = {}
-            sats = [nid for nid,n in nodes.items() if n.kind == "sat"]
-            for s in nodes.keys():
-                best = None; best_d = 1e18
-                a = nodes[s]
-                for sid in sats:
-                    if sid == s: continue
-                    b = nodes[sid]
-                    # dùng haversine và (nếu có) kiểm tra LOS
-                    dkm = haversine_km(a.lat, a.lon, b.lat, b.lon)
-                     # if not los_possible(a, b): continue   # nếu bạn có check LOS
-                    if dkm < best_d:
-                        best_d = dkm; best = sid
-                fallback_next[s] = best
+            # fallback = vệ tinh gần nhất (khác chính nó), từ GeoCache của tick
+            fallback_next = geo.nearest_of_kind("sat")
 
             payload = {"nexthop": dist_tbl, "directory": directory, "fallback": fallback_next}
 
@@ -2,11 +2,12 @@
 import asyncio, time, json, math, random, os
 from typing import Dict, List, Tuple, Optional
 import aiohttp
-from sgp4.api import Satrec, jday
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, jday
 # from .models import NodeInfo
-# from .geo import teme_to_ecef, ecef_to_geodetic_wgs84
+# from .geo import teme_to_ecef_batch, ecef_to_geodetic_wgs84_batch
 from models import NodeInfo
-from geo import teme_to_ecef, ecef_to_geodetic_wgs84
+from geo import teme_to_ecef_batch, ecef_to_geodetic_wgs84_batch
 
 CELESTRAK_ACTIVE_JSON = "https://celestrak.org/NORAD/elements/gp.php?GROUP=active&FORMAT=json"
 SATNOGS_STATIONS_API = "https://network.satnogs.org/api/stations/"
@@ -22,6 +23,11 @@ class DataSource:
         self._tle_cache: Optional[List[dict]] = None
         self._tle_cache_time: float = 0.0
         self._tle_ttl_sec: int = 300
+        # Satrec đã parse, theo NORAD id; chỉ parse lại khi dòng TLE đổi
+        self._satrec_by_norad: Dict[int, Tuple[str, str, Satrec]] = {}
+        # SatrecArray cho tập vệ tinh đang dùng (key = tuple NORAD id theo thứ tự)
+        self._satrec_array_key: Tuple[int, ...] = ()
+        self._satrec_array: Optional[SatrecArray] = None
 
         # ---- SatNOGS (Ground) ----
         self._gn_assignment: Dict[int, int] = {}      # node_id ground -> index in satnogs list
@@ -36,7 +42,11 @@ class DataSource:
         self._ndbc_ttl_sec: int = 3600                # 60 phút
 
         # ---- OpenSky (Planes) ----
-        self._plane_assignment: Dict[int, int] = {}   # node_id plane -> index in plane list
+        self._plane_assignment: Dict[int, str] = {}   # node_id plane -> icao24 (ổn định giữa các lần poll)
+        self._plane_state: Dict[str, dict] = {}       # icao24 -> state mới nhất
+        self._plane_last_seen: Dict[str, float] = {}  # icao24 -> thời điểm thấy lần cuối
+        self._plane_timeout_sec: int = 120            # quá hạn mới gỡ máy bay khỏi node
+        self._plane_merged_at: float = 0.0            # thời điểm snapshot đã gộp gần nhất
         self._opensky_cache: Optional[List[dict]] = None
         self._opensky_cache_time: float = 0.0
         self._opensky_ttl_sec: int = 15               # 15s (đủ “sống” mà đỡ gọi liên tục)
@@ -72,6 +82,48 @@ class DataSource:
     def _assign_sat_indices(self, sat_nodes: List[int], tle_list_len: int):
         self._assign_indices(sat_nodes, tle_list_len, self._sat_assignment)
 
+    @staticmethod
+    def _norad_of(tle: dict) -> int:
+        try:
+            return int(tle.get("NORAD_CAT_ID"))
+        except Exception:
+            return int(tle["TLE_LINE1"][2:7])
+
+    def _satrec_for(self, tle: dict) -> Tuple[int, Satrec]:
+        """Satrec theo NORAD id, cache lại; parse lại chỉ khi TLE của vệ tinh đó thay đổi."""
+        norad = self._norad_of(tle)
+        l1, l2 = tle["TLE_LINE1"].strip(), tle["TLE_LINE2"].strip()
+        hit = self._satrec_by_norad.get(norad)
+        if hit is None or hit[0] != l1 or hit[1] != l2:
+            hit = (l1, l2, Satrec.twoline2rv(l1, l2))
+            self._satrec_by_norad[norad] = hit
+            self._satrec_array_key = ()   # buộc build lại SatrecArray
+        return norad, hit[2]
+
+    def _satrec_array_for(self, tles: List[dict]) -> Tuple[List[int], SatrecArray]:
+        pairs = [self._satrec_for(t) for t in tles]
+        key = tuple(n for n, _ in pairs)
+        if self._satrec_array is None or key != self._satrec_array_key:
+            self._satrec_array = SatrecArray([sat for _, sat in pairs])
+            self._satrec_array_key = key
+        return list(key), self._satrec_array
+
+    def propagate_batch(self, tles: List[dict], jd: float, fr: float):
+        """
+        Lan truyền SGP4 cho cả danh sách TLE trong 1 lần gọi SatrecArray,
+        rồi TEME -> ECEF -> geodetic bằng numpy.
+        Trả (lat_deg, lon_deg, alt_km, ok) dạng mảng (N,).
+        """
+        _, arr = self._satrec_array_for(tles)
+        e, r, _v = arr.sgp4(np.array([jd]), np.array([fr]))
+        r = r[:, 0, :]
+        ok = (e[:, 0] == 0) & np.all(np.isfinite(r), axis=1)
+        lat = np.zeros(len(tles)); lon = np.zeros(len(tles)); alt = np.zeros(len(tles))
+        if ok.any():
+            r_ecef = teme_to_ecef_batch(r[ok], jd, fr)
+            lat[ok], lon[ok], alt[ok] = ecef_to_geodetic_wgs84_batch(r_ecef)
+        return lat, lon, alt, ok
+
     async def update_from_celestrak(self, nodes: Dict[int, NodeInfo]):
         try:
             tle_list = await self._fetch_active_tles()
@@ -87,22 +139,21 @@ class DataSource:
         t = time.gmtime()
         jd, fr = jday(t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec + 0.0)
 
+        # mỗi TLE chỉ lan truyền 1 lần dù nhiều node dùng chung
+        idxs = sorted({self._sat_assignment.get(nid, 0) % len(tle_list) for nid in sat_node_ids})
+        try:
+            lat, lon, alt, ok = self.propagate_batch([tle_list[i] for i in idxs], jd, fr)
+        except Exception:
+            return nodes
+        pos = {i: k for k, i in enumerate(idxs)}
+
         for nid in sat_node_ids:
-            idx = self._sat_assignment.get(nid, 0) % len(tle_list)
-            tle = tle_list[idx]
-            l1, l2 = tle["TLE_LINE1"].strip(), tle["TLE_LINE2"].strip()
-            try:
-                sat = Satrec.twoline2rv(l1, l2)
-                e, r, v = sat.sgp4(jd, fr)
-                if e != 0: continue
-                r_ecef = teme_to_ecef(r, jd, fr)
-                lat_deg, lon_deg, alt_km = ecef_to_geodetic_wgs84(r_ecef)
-                n = nodes[nid]
-                n.lat = float(lat_deg)
-                n.lon = float(((lon_deg + 180) % 360) - 180)
-                n.alt_km = max(0.0, float(alt_km))
-            except Exception:
-                pass
+            k = pos[self._sat_assignment.get(nid, 0) % len(tle_list)]
+            if not ok[k]: continue
+            n = nodes[nid]
+            n.lat = float(lat[k])
+            n.lon = float(((lon[k] + 180) % 360) - 180)
+            n.alt_km = max(0.0, float(alt[k]))
         return nodes
 
     # =======================
@@ -303,9 +354,25 @@ class DataSource:
         self._opensky_cache_time = now
         return self._opensky_cache
 
+    def _merge_planes(self, planes: List[dict], seen_at: float, now: float) -> None:
+        """Gộp snapshot mới vào state theo icao24 (delta), xoá máy bay quá hạn."""
+        if seen_at > self._plane_merged_at:  # cache cũ (khi lỗi mạng) không làm "sống lại" máy bay
+            self._plane_merged_at = seen_at
+            for st in planes:
+                icao = st.get("icao24")
+                if not icao:
+                    continue
+                self._plane_state[icao] = st
+                self._plane_last_seen[icao] = seen_at
+        for icao, seen in list(self._plane_last_seen.items()):
+            if now - seen > self._plane_timeout_sec:
+                del self._plane_last_seen[icao]
+                self._plane_state.pop(icao, None)
+
     async def update_from_opensky(self, nodes: Dict[int, NodeInfo]):
         """
         Gán node kind='plane' từ OpenSky states/all.
+        Mỗi node bám theo một icao24 cố định; chỉ gán lại khi máy bay đó quá hạn.
         Với số node > số máy bay: node sẽ “chia sẻ” 1 máy bay (modulo).
         """
         plane_nodes = [nid for nid, n in nodes.items() if n.kind == "plane"]
@@ -316,14 +383,22 @@ class DataSource:
             planes = await self._fetch_opensky()
         except Exception:
             return nodes
-        if not planes:
+        self._merge_planes(planes or [], self._opensky_cache_time, time.time())
+        if not self._plane_state:
             return nodes
 
-        self._assign_indices(plane_nodes, len(planes), self._plane_assignment)
+        # node mất máy bay (quá hạn) -> gán lại, ưu tiên icao24 chưa ai dùng
+        taken = {self._plane_assignment[nid] for nid in plane_nodes
+                 if self._plane_assignment.get(nid) in self._plane_state}
+        free = sorted(set(self._plane_state) - taken)
+        universe = sorted(self._plane_state)
+        for k, nid in enumerate(sorted(plane_nodes)):
+            if self._plane_assignment.get(nid) in self._plane_state:
+                continue
+            self._plane_assignment[nid] = free.pop(0) if free else universe[k % len(universe)]
 
         for nid in plane_nodes:
-            idx = self._plane_assignment[nid] % len(planes)
-            st = planes[idx]
+            st = self._plane_state[self._plane_assignment[nid]]
             n = nodes[nid]
             n.lat = st["lat"]
             n.lon = ((st["lon"] + 180) % 360) - 180
@@ -2,6 +2,11 @@ import math
 import numpy as np
 from sgp4.api import jday
 
+try:
+    from scipy.spatial import cKDTree   # tuỳ chọn: KD-tree cho truy vấn node gần nhất
+except ImportError:
+    cKDTree = None
+
 EARTH_R_KM = 6371.0
 WGS84_A = 6378.137            # km (bán trục lớn)
 WGS84_F = 1/298.257223563
@@ -48,6 +53,34 @@ def ecef_to_geodetic_wgs84(r_ecef_km):
     # ra độ & km
     return math.degrees(lat), math.degrees(lon), alt / 1000.0
 
+def teme_to_ecef_batch(r_teme_km, jd, fr):
+    """Vectorized teme_to_ecef: r_teme_km (N,3) km cùng một thời điểm -> (N,3) km."""
+    theta = gmst_from_jd(jd + fr)
+    c, s = math.cos(theta), math.sin(theta)
+    R3 = np.array([[ c,  s, 0.0],
+                   [-s,  c, 0.0],
+                   [0.0, 0.0, 1.0]])
+    return np.asarray(r_teme_km, dtype=float) @ R3.T
+
+def ecef_to_geodetic_wgs84_batch(r_ecef_km, iters=5):
+    """Vectorized ecef_to_geodetic_wgs84: (N,3) km -> (lat_deg, lon_deg, alt_km) mảng (N,)."""
+    r_ecef = np.asarray(r_ecef_km, dtype=float) * 1000.0
+    x, y, z = r_ecef[:, 0], r_ecef[:, 1], r_ecef[:, 2]
+    a = WGS84_A * 1000.0
+    e2 = WGS84_E2
+    lon = np.arctan2(y, x)
+    r = np.hypot(x, y)
+    lat = np.arctan2(z, r)
+    for _ in range(iters):
+        sinlat = np.sin(lat)
+        N = a / np.sqrt(1 - e2 * sinlat*sinlat)
+        alt = r / np.cos(lat) - N
+        lat = np.arctan2(z, r * (1 - e2 * (N / (N + alt))))
+    sinlat = np.sin(lat)
+    N = a / np.sqrt(1 - e2 * sinlat*sinlat)
+    alt = r / np.cos(lat) - N
+    return np.degrees(lat), np.degrees(lon), alt / 1000.0
+
 def haversine_km(lat1, lon1, lat2, lon2):
     r = EARTH_R_KM
     p = math.pi / 180
@@ -70,3 +103,90 @@ def los_possible(lat1, lon1, alt1_km, lat2, lon2, alt2_km, earth_r_km=EARTH_R_KM
     d_hor1 = math.sqrt(2*earth_r_km*h1 + h1*h1)
     d_hor2 = math.sqrt(2*earth_r_km*h2 + h2*h2)
     return d_km <= (d_hor1 + d_hor2)
+
+def los_possible_mask(d_km, alt1_km, alt2_km, earth_r_km=EARTH_R_KM):
+    """
+    Bản vectorized của los_possible: nhận mảng khoảng cách bề mặt d_km và độ cao
+    hai đầu (broadcast được), trả mask LOS theo cùng công thức đường chân trời.
+    """
+    h1 = np.maximum(0.0, np.asarray(alt1_km, dtype=float))
+    h2 = np.maximum(0.0, np.asarray(alt2_km, dtype=float))
+    d_hor1 = np.sqrt(2*earth_r_km*h1 + h1*h1)
+    d_hor2 = np.sqrt(2*earth_r_km*h2 + h2*h2)
+    return np.asarray(d_km) <= (d_hor1 + d_hor2)
+
+def latlon_to_ecef_km(lat_deg, lon_deg, alt_km, earth_r_km=EARTH_R_KM):
+    """
+    Vectorized: mảng lat/lon (độ), alt (km) -> ECEF (N,3) km (Trái Đất cầu).
+    Trả thêm vector đơn vị (N,3) để so khoảng cách bề mặt mà không cần haversine.
+    """
+    lat = np.radians(np.asarray(lat_deg, dtype=float))
+    lon = np.radians(np.asarray(lon_deg, dtype=float))
+    cos_lat = np.cos(lat)
+    unit = np.stack((cos_lat*np.cos(lon), cos_lat*np.sin(lon), np.sin(lat)), axis=-1)
+    ecef = unit * (earth_r_km + np.asarray(alt_km, dtype=float))[:, None]
+    return ecef, unit
+
+class GeoCache:
+    """
+    Cache toạ độ ECEF cho toàn bộ node, cập nhật 1 lần mỗi tick.
+    Các bước sau (build graph, fallback relay) đọc lại mảng này thay vì tính lượng giác lại.
+    """
+    def __init__(self, nodes, earth_r_km=EARTH_R_KM):
+        self.ids = list(nodes.keys())
+        self.row = {nid: i for i, nid in enumerate(self.ids)}
+        self.kinds = np.array([nodes[nid].kind for nid in self.ids])
+        self.alt_km = np.array([nodes[nid].alt_km for nid in self.ids], dtype=float)
+        self._trees = {}
+        self.ecef, self.unit = latlon_to_ecef_km(
+            [nodes[nid].lat for nid in self.ids],
+            [nodes[nid].lon for nid in self.ids],
+            [nodes[nid].alt_km for nid in self.ids],
+            earth_r_km,
+        )
+
+    def surface_km_matrix(self):
+        """Ma trận khoảng cách bề mặt (N,N) km, tính 1 lần từ vector đơn vị."""
+        dots = np.clip(self.unit @ self.unit.T, -1.0, 1.0)
+        chord = np.sqrt(np.maximum(0.0, 2.0 - 2.0*dots))
+        return 2 * EARTH_R_KM * np.arcsin(np.clip(chord / 2, 0.0, 1.0))
+
+    def surface_km(self, i, j):
+        chord = np.linalg.norm(self.unit[i] - self.unit[j], axis=-1)
+        return 2 * EARTH_R_KM * np.arcsin(np.clip(chord / 2, 0.0, 1.0))
+
+    def _kind_tree(self, kind):
+        """KD-tree trên vector đơn vị của các node thuộc `kind`; dựng 1 lần mỗi tick (mỗi GeoCache)."""
+        hit = self._trees.get(kind)
+        if hit is None:
+            cand = np.nonzero(self.kinds == kind)[0]
+            tree = cKDTree(self.unit[cand]) if (cKDTree is not None and len(cand)) else None
+            hit = self._trees[kind] = (tree, cand)
+        return hit
+
+    def nearest_of_kind(self, kind):
+        """
+        Với mỗi node: node gần nhất (theo khoảng cách bề mặt) thuộc loại `kind`, khác chính nó.
+        Trả dict node_id -> node_id | None.
+        Dùng KD-tree: O(n log m) thay vì quét n x m.
+        """
+        tree, cand = self._kind_tree(kind)
+        if len(cand) == 0:
+            return {nid: None for nid in self.ids}
+        if tree is None:
+            # không có scipy: quét toàn bộ như cũ
+            dots = self.unit @ self.unit[cand].T          # cos góc tâm, lớn hơn = gần hơn
+            dots[cand, np.arange(len(cand))] = -np.inf     # bỏ chính nó
+            best = np.argmax(dots, axis=1)
+            ok = np.isfinite(dots[np.arange(len(self.ids)), best])
+            return {nid: (self.ids[cand[best[i]]] if ok[i] else None) for i, nid in enumerate(self.ids)}
+        k = min(2, len(cand))
+        _, idx = tree.query(self.unit, k=k)
+        idx = idx.reshape(len(self.ids), k)
+        rows = cand[idx]
+        out = {}
+        for i, nid in enumerate(self.ids):
+            # phần tử đầu là chính nó nếu node này cũng thuộc `kind`
+            j = 1 if rows[i, 0] == i else 0
+            out[nid] = self.ids[rows[i, j]] if j < k and rows[i, j] != i else None
+        return out
@@ -0,0 +1,441 @@
+"""Array (CSR) form of the routing graph and a colony that walks it."""
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from itertools import chain
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ..config import AcoParams
+from ..net.geometry import Geometry
+from ..types import GraphState
+
+GOAL_MODES = ("none", "dijkstra", "geo")
+
+
+@dataclass
+class CSRGraph:
+    """Directed, enabled, costed edges grouped by source row.
+
+    Rows follow ``gs.nodes`` order; the edges of row ``r`` are
+    ``indptr[r]:indptr[r+1]`` and keep ``gs.adj`` order, so ``indices[e]`` is
+    the target row, ``cost[e]`` the objective cost and ``rev[e]`` the edge id
+    of the opposite direction. ``xyz`` holds ECEF positions (m) per row.
+    """
+
+    ids: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    cost: np.ndarray
+    rev: np.ndarray
+    row_of: Dict[int, int]
+    xyz: Optional[np.ndarray] = None
+    version: int = 0
+    _lists: Optional[Tuple[List[int], List[List[int]], List[float], List[int]]] = field(default=None, repr=False)
+    _cands: Dict[int, List[List[Tuple[int, int]]]] = field(default_factory=dict, repr=False)
+    _per_m: Optional[float] = field(default=None, repr=False)
+
+    def __getstate__(self):
+        # the list forms are rebuilt on demand; don't ship them to worker processes
+        state = dict(self.__dict__)
+        state["_lists"] = None
+        state["_cands"] = {}
+        return state
+
+    @property
+    def n_edges(self) -> int:
+        return int(len(self.indices))
+
+    def lists(self) -> Tuple[List[int], List[List[int]], List[float], List[int]]:
+        """(indptr, per-row target rows, cost, rev) as Python lists for the scalar walk."""
+        if self._lists is None:
+            ptr = self.indptr.tolist()
+            idx = self.indices.tolist()
+            nbrs = [idx[ptr[r]:ptr[r + 1]] for r in range(len(ptr) - 1)]
+            self._lists = (ptr, nbrs, self.cost.tolist(), self.rev.tolist())
+        return self._lists
+
+    def candidates(self, k: int) -> List[List[Tuple[int, int]]]:
+        """Per row, the ``k`` cheapest (edge id, target row) pairs, ties in ``gs.adj`` order."""
+        out = self._cands.get(k)
+        if out is None:
+            ptr, nbrs, cost, _rev = self.lists()
+            out = []
+            for r, vs in enumerate(nbrs):
+                base = ptr[r]
+                es = sorted(range(base, base + len(vs)), key=cost.__getitem__)[:k]
+                out.append([(e, vs[e - base]) for e in es])
+            self._cands[k] = out
+        return out
+
+    def path_ids(self, rows: List[int]) -> List[int]:
+        return [int(self.ids[r]) for r in rows]
+
+    def distances(self, src: int, deadline: Optional[float] = None) -> Optional[np.ndarray]:
+        """Dijkstra costs from row ``src`` to every row (inf if unreachable).
+
+        Links are undirected with symmetric costs, so this is also every
+        row's cost *to* ``src``, i.e. an exact lower bound for goal direction.
+        Returns None once ``deadline`` (monotonic) has passed.
+        """
+        ptr, nbrs, cost, _rev = self.lists()
+        dist = [math.inf] * len(nbrs)
+        dist[src] = 0.0
+        heap = [(0.0, src)]
+        pops = 0
+        while heap:
+            if deadline is not None and not pops & 255 and time.monotonic() >= deadline:
+                return None
+            pops += 1
+            du, u = heapq.heappop(heap)
+            if du > dist[u]:
+                continue
+            base = ptr[u]
+            for j, v in enumerate(nbrs[u]):
+                nd = du + cost[base + j]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        return np.asarray(dist)
+
+    def geo_bound(self, src: int) -> np.ndarray:
+        """Straight-line lower bound on the cost from every row to ``src``.
+
+        Chord length times the smallest cost per metre of any edge: by the
+        triangle inequality no path can be cheaper.
+        """
+        if self.xyz is None or not self.n_edges:
+            return np.zeros(len(self.ids))
+        if self._per_m is None:
+            rows = np.repeat(np.arange(len(self.ids)), np.diff(self.indptr))
+            length = np.linalg.norm(self.xyz[rows] - self.xyz[self.indices], axis=1)
+            ok = length > 0
+            self._per_m = float(np.min(self.cost[ok] / length[ok])) if ok.any() else 0.0
+        return np.linalg.norm(self.xyz - self.xyz[src], axis=1) * self._per_m
+
+
+def build_csr(gs: GraphState, costs: Mapping[Tuple[int, int], float]) -> CSRGraph:
+    ids = np.fromiter((n.id for n in gs.nodes), dtype=np.int64, count=len(gs.nodes))
+    row_of = {int(i): r for r, i in enumerate(ids.tolist())}
+    indptr = [0]
+    indices: List[int] = []
+    cost: List[float] = []
+    eid: Dict[Tuple[int, int], int] = {}
+    links, edge_index = gs.links, gs.edge_index
+    for u in ids.tolist():
+        for v in gs.adj.get(u, []):
+            c = costs.get((u, v))
+            if c is None or v not in row_of:
+                continue
+            idx = edge_index.get((u, v))
+            if idx is None or not links[idx].enabled:
+                continue
+            eid[(u, v)] = len(indices)
+            indices.append(row_of[v])
+            cost.append(c)
+        indptr.append(len(indices))
+    rev = np.full(len(indices), -1, dtype=np.int64)
+    for (u, v), e in eid.items():
+        rev[e] = eid.get((v, u), -1)
+    geo = gs.geometry if gs.geometry is not None else Geometry.from_nodes(gs.nodes)
+    try:
+        xyz = geo.ecef[geo.rows(ids.tolist())]
+    except KeyError:
+        xyz = None
+    return CSRGraph(
+        ids=ids,
+        indptr=np.asarray(indptr, dtype=np.int64),
+        indices=np.asarray(indices, dtype=np.int32),
+        cost=np.asarray(cost, dtype=np.float64),
+        rev=rev,
+        row_of=row_of,
+        xyz=xyz,
+        version=getattr(gs, "version", 0),
+    )
+
+
+_CACHE: "OrderedDict[Hashable, CSRGraph]" = OrderedDict()
+_CACHE_SIZE = 8
+_LOCK = threading.Lock()
+
+
+def graph_for(gs: GraphState, costs: Mapping[Tuple[int, int], float], weights: Tuple[float, ...]) -> CSRGraph:
+    """``build_csr`` memoized per graph version and objective weights (candidate lists ride along)."""
+    key = (gs.version, tuple(weights), len(costs))
+    with _LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            _CACHE.move_to_end(key)
+            return hit
+    g = build_csr(gs, costs)
+    with _LOCK:
+        _CACHE[key] = g
+        while len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return g
+
+
+def item_view(a: np.ndarray):
+    """Indexable view of a float array for per-item reads in hot Python loops.
+
+    memoryview item access is much cheaper than NumPy scalar indexing.
+    """
+    return memoryview(a) if len(a) else []
+
+
+class Uniforms:
+    """Uniform [0, 1) draws from a ``np.random.Generator``, fetched a block at a time.
+
+    The Python walk takes one or two draws per step, and a ``Generator.random()``
+    call each time costs several times more. Yields the same sequence as
+    successive ``gen.random()`` calls, reading up to a block ahead.
+    """
+
+    __slots__ = ("gen", "random")
+
+    def __init__(self, gen: np.random.Generator, block: int = 1024) -> None:
+        self.gen = gen
+        blocks = iter(lambda: gen.random(block).tolist(), None)
+        # random() -> next uniform; a bound builtin is the cheapest call available
+        self.random = partial(next, chain.from_iterable(blocks))
+
+    def randrange(self, n: int) -> int:
+        return min(int(self.random() * n), n - 1)
+
+
+class Colony:
+    """One ACS/MMAS colony over a ``CSRGraph`` with pheromone in a flat array.
+
+    Ants apply q0 exploitation or roulette selection on tau^alpha * eta^beta,
+    a local update on every step and a best-path global update per
+    iteration, with optional MMAS clamping. Pheromone is indexed by edge id,
+    so it can live in shared memory and be blended between colonies.
+
+    ``params.goal`` adds distance-to-destination to the heuristic
+    (eta = 1/(cost + h(target))) from an exact reverse Dijkstra bound
+    (``"dijkstra"``) or a straight-line bound (``"geo"``); edges into rows
+    that cannot reach the destination are never taken. ``params.bidirectional``
+    sends a forward and a backward ant that join where they meet and
+    ``params.backtracks`` lets an ant step back out of that many dead ends.
+
+    All random draws come from ``rng``, so a colony is replayable from the
+    generator's seed and colonies never share random state.
+    """
+
+    def __init__(self, g: CSRGraph, params: AcoParams, rng: np.random.Generator,
+                 tau: Optional[np.ndarray] = None) -> None:
+        self.g = g
+        self.p = params
+        self.gen = rng
+        self.rng = Uniforms(rng)
+        if tau is None:
+            tau = np.full(g.n_edges, params.tau0, dtype=np.float64)
+        self.tau_np = tau
+        self.tau = item_view(tau)
+        self._eta_plain = ((1.0 / np.maximum(g.cost, 1e-9)) ** params.beta).tolist()
+        self.eta_f = self.eta_r = self._eta_plain
+        self._target: Optional[Tuple[int, int]] = None
+        self.cands = g.candidates(params.candidates) if params.candidates > 0 else None
+        self.best_rows: List[int] = []
+        self.best_edges: List[int] = []
+        self.best_cost = float("inf")
+        self.converged_at = 0
+        self.iterations = 0
+
+    def _goal_eta(self, row: int, deadline: Optional[float] = None) -> List[float]:
+        g = self.g
+        h = g.distances(row, deadline) if self.p.goal == "dijkstra" else None
+        if h is None:
+            # "geo", or no time left for the exact bound
+            h = g.geo_bound(row)
+        with np.errstate(divide="ignore"):
+            eta = (1.0 / np.maximum(g.cost + h[g.indices], 1e-9)) ** self.p.beta
+        return eta.tolist()
+
+    def prepare(self, s: int, d: int, deadline: Optional[float] = None) -> None:
+        """Per-(src, dst) heuristics; a no-op unless ``params.goal`` is set.
+
+        The reverse Dijkstra of ``"dijkstra"`` counts against ``deadline``: if
+        it runs out, the colony uses the straight-line bound instead.
+        """
+        if self._target == (s, d):
+            return
+        self._target = (s, d)
+        if self.p.goal not in (None, "", "none"):
+            self.eta_f = self._goal_eta(d, deadline)
+            # backward ants head for src; the reverse edge has the same cost
+            self.eta_r = self._goal_eta(s, deadline) if self.p.bidirectional else self.eta_f
+
+    def _pick(self, cand: List[Tuple[int, int]], eta: List[float], pher: Optional[List[int]] = None) -> int:
+        """Index into ``cand`` chosen by the ACS rule; ``pher[i]`` is the edge whose tau to read."""
+        tau, rng, alpha = self.tau, self.rng, self.p.alpha
+        if pher is None:
+            if alpha == 1.0:
+                scores = [tau[e] * eta[e] for e, _v in cand]
+            else:
+                scores = [(tau[e] ** alpha) * eta[e] for e, _v in cand]
+        else:
+            scores = [(tau[x] ** alpha) * eta[e] for x, (e, _v) in zip(pher, cand)]
+        if rng.random() < self.p.q0:
+            return max(range(len(cand)), key=scores.__getitem__)
+        ssum = sum(scores)
+        if ssum <= 0:
+            return rng.randrange(len(cand))
+        r = rng.random() * ssum
+        run = 0.0
+        for i, sc in enumerate(scores):
+            run += sc
+            if r <= run:
+                return i
+        return len(cand) - 1
+
+    def _options(self, cur: int, blocked, eta: List[float]) -> List[Tuple[int, int]]:
+        ptr, nbrs, _cost, _rev = self.g.lists()
+        cands = self.cands
+        cand = [(e, v) for e, v in cands[cur] if v not in blocked and eta[e] > 0] if cands is not None else None
+        if not cand:
+            # no candidate list, or every candidate already visited
+            base = ptr[cur]
+            cand = [(base + j, v) for j, v in enumerate(nbrs[cur]) if v not in blocked and eta[base + j] > 0]
+        return cand
+
+    def _local(self, e: int) -> None:
+        xi = self.p.xi
+        self.tau[e] = (1 - xi) * self.tau[e] + xi * self.p.tau0
+
+    def walk(self, s: int, d: int) -> Optional[Tuple[List[int], List[int], float]]:
+        """One ant from row ``s`` to row ``d``: (rows, edge ids, cost), or None at a dead end."""
+        if self.p.bidirectional:
+            return self._walk_bidir(s, d)
+        _ptr, _nbrs, cost, _rev = self.g.lists()
+        eta = self.eta_f
+        backtracks = self.p.backtracks
+        rows, edges = [s], []
+        visited = {s}
+        acc = 0.0
+        cur = s
+        while cur != d:
+            cand = self._options(cur, visited, eta)
+            if not cand:
+                if backtracks > 0 and len(rows) > 1:
+                    # step back; the dead end stays in ``visited`` so it is not retried
+                    backtracks -= 1
+                    rows.pop()
+                    acc -= cost[edges.pop()]
+                    cur = rows[-1]
+                    continue
+                return None
+            e, v = cand[self._pick(cand, eta)]
+            self._local(e)
+            acc += cost[e]
+            rows.append(v)
+            edges.append(e)
+            visited.add(v)
+            cur = v
+        return rows, edges, acc
+
+    def _walk_bidir(self, s: int, d: int) -> Optional[Tuple[List[int], List[int], float]]:
+        """Forward ant from ``s`` and backward ant from ``d`` stepping in turn until one
+        steps onto the other's trail. Backward edges are stored in path direction."""
+        _ptr, _nbrs, cost, rev = self.g.lists()
+        if s == d:
+            return [s], [], 0.0
+        # *_seen also keeps rows an ant backed out of, so they are not retried
+        f_rows, f_edges, f_pos, f_seen = [s], [], {s: 0}, {s}
+        b_rows, b_edges, b_pos, b_seen = [d], [], {d: 0}, {d}
+        backtracks = self.p.backtracks
+        f_alive = b_alive = True
+        rows = edges = None
+        while f_alive or b_alive:
+            if f_alive:
+                cand = self._options(f_rows[-1], f_seen, self.eta_f)
+                if cand:
+                    e, v = cand[self._pick(cand, self.eta_f)]
+                    self._local(e)
+                    if v in b_pos:
+                        j = b_pos[v]
+                        rows = f_rows + b_rows[j::-1]
+                        edges = f_edges + [e] + b_edges[:j][::-1]
+                        break
+                    f_pos[v] = len(f_rows)
+                    f_rows.append(v)
+                    f_edges.append(e)
+                    f_seen.add(v)
+                elif backtracks > 0 and len(f_rows) > 1:
+                    backtracks -= 1
+                    del f_pos[f_rows.pop()]
+                    f_edges.pop()
+                else:
+                    f_alive = False
+            if b_alive:
+                cand = [(e, v) for e, v in self._options(b_rows[-1], b_seen, self.eta_r) if rev[e] >= 0]
+                if cand:
+                    e, v = cand[self._pick(cand, self.eta_r, [rev[x] for x, _v in cand])]
+                    pe = rev[e]
+                    self._local(pe)
+                    if v in f_pos:
+                        i = f_pos[v]
+                        rows = f_rows[: i + 1] + b_rows[::-1]
+                        edges = f_edges[:i] + [pe] + b_edges[::-1]
+                        break
+                    b_pos[v] = len(b_rows)
+                    b_rows.append(v)
+                    b_edges.append(pe)
+                    b_seen.add(v)
+                elif backtracks > 0 and len(b_rows) > 1:
+                    backtracks -= 1
+                    del b_pos[b_rows.pop()]
+                    b_edges.pop()
+                else:
+                    b_alive = False
+        if rows is None:
+            return None
+        acc = 0.0
+        for e in edges:
+            acc += cost[e]
+        return rows, edges, acc
+
+    def iterate(self, s: int, d: int, ants: int, deadline: Optional[float] = None) -> bool:
+        """One iteration of ``ants`` ants plus global update; False if ``deadline`` (monotonic) cut it short."""
+        self.prepare(s, d, deadline)
+        self.iterations += 1
+        done = True
+        for a in range(ants):
+            if deadline is not None and (self.iterations > 1 or a) and time.monotonic() >= deadline:
+                done = False
+                break
+            out = self.walk(s, d)
+            if out is not None and out[2] < self.best_cost:
+                self.best_rows, self.best_edges, self.best_cost = out
+                self.converged_at = self.iterations
+        self.reinforce()
+        return done
+
+    def reinforce(self) -> None:
+        if self.best_edges:
+            _ptr, _nbrs, _cost, rev = self.g.lists()
+            tau, rho = self.tau, self.p.rho
+            delta = 1.0 / max(self.best_cost, 1e-9)
+            for e in self.best_edges:
+                for x in (e, rev[e]):
+                    if x >= 0:
+                        tau[x] = (1 - rho) * tau[x] + rho * delta
+        if self.p.mmas and len(self.tau_np):
+            np.clip(self.tau_np, self.p.tau_min, self.p.tau_max, out=self.tau_np)
+
+    def adopt(self, rows: List[int], cost: float) -> None:
+        """Take another colony's better path as this colony's best (island exchange)."""
+        if not rows or not cost < self.best_cost:
+            return
+        ptr, nbrs, _cost, _rev = self.g.lists()
+        edges = []
+        for u, v in zip(rows, rows[1:]):
+            edges.append(ptr[u] + nbrs[u].index(v))
+        self.best_rows, self.best_edges, self.best_cost = list(rows), edges, cost
@@ -0,0 +1,159 @@
+"""Backup paths disjoint from a route: Suurballe's successive shortest paths on the CSR graph.
+
+``disjoint_paths`` returns up to ``k`` paths that share no link (or, in
+``"node"`` mode, no intermediate node) with each other or with an ``avoid``
+route, with minimum total weight. Each round is a Dijkstra over the residual
+graph with node potentials (Bhandari's form of Suurballe): hops already
+carried by an earlier path may be traversed backwards at negative weight,
+which reroutes that path instead of failing on "trap" topologies where the
+greedy remove-and-retry approach finds nothing. In node mode every row is
+split into an in- and an out-state joined by a unit-capacity arc. The
+potentials start from the straight-line bound to the destination, so the
+first round is an A* and later rounds stay goal-directed.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from ..types import GraphState
+from .csr import CSRGraph
+
+DISJOINT_MODES = ("link", "node")
+
+
+def disjoint_paths(g: CSRGraph, src: int, dst: int, k: int, nodes: bool = False,
+                   weight: Optional[Sequence[float]] = None, avoid: Optional[Sequence[int]] = None,
+                   gs: Optional[GraphState] = None, floor: float = 1.0) -> List[Tuple[List[int], float]]:
+    """Up to ``k`` mutually disjoint (path, cost) pairs from ``src`` to ``dst``, cheapest first.
+
+    Node ids in and out. ``weight`` (per edge id, default ``g.cost``) is what
+    the total is minimised over; the returned costs are always ``g.cost``
+    sums. Links of ``avoid`` (and, with ``nodes``, its intermediate nodes)
+    are never used, nor links that ``gs`` now has disabled. ``floor`` is the
+    smallest weight/cost ratio of any edge (keeps the A* bound admissible).
+    """
+    if k <= 0 or src == dst or src not in g.row_of or dst not in g.row_of:
+        return []
+    ptr, nbrs, cost, rev = g.lists()
+    w = cost if weight is None else weight
+    ids = g.ids.tolist()
+    s, d = g.row_of[src], g.row_of[dst]
+
+    banned: Set[int] = set()
+    banned_rows: Set[int] = set()
+    rows = [g.row_of.get(n) for n in avoid or ()]
+    for u, v in zip(rows, rows[1:]):
+        if u is None or v is None or v not in nbrs[u]:
+            continue
+        e = ptr[u] + nbrs[u].index(v)
+        banned.add(e)
+        if rev[e] >= 0:
+            banned.add(rev[e])
+    if nodes:
+        banned_rows.update(r for r in rows[1:-1] if r is not None)
+    banned_rows.discard(s)
+    banned_rows.discard(d)
+
+    index, links = (gs.edge_index.get, gs.links) if gs is not None else (None, None)
+    # states: rows in link mode; 2*row (in) and 2*row + 1 (out) in node mode
+    start, target = (2 * s + 1, 2 * d) if nodes else (s, d)
+    # -(lower bound to d) is a feasible potential: reduced weights start non-negative
+    h = (g.geo_bound(d) * -floor).tolist()
+    pi = [h[x >> 1] for x in range(2 * len(nbrs))] if nodes else h
+    # edge id -> (from row, to row) of every hop the paths found so far use
+    flow: Dict[int, Tuple[int, int]] = {}
+
+    for rnd in range(k):
+        # node mode: the one flow edge entering each intermediate row
+        inflow = {v: e for e, (_u, v) in flow.items() if v != d} if nodes else {}
+        dist = {start: 0.0}
+        # state -> (previous state, edge id; ~id = cancels flow on that edge; None = split arc)
+        prev: Dict[int, Tuple[int, Optional[int]]] = {}
+        done: Set[int] = set()
+        heap = [(0.0, start)]
+        while heap:
+            du, a = heapq.heappop(heap)
+            if a in done:
+                continue
+            done.add(a)
+            if a == target:
+                break
+            pa = pi[a]
+            # residual arcs that cancel or bypass earlier paths: (state, weight, tag)
+            arcs: List[Tuple[int, float, Optional[int]]] = []
+            u = a >> 1 if nodes else a
+            if nodes and not a & 1:
+                # in-state: pass through the row, or undo the flow hop that entered it
+                e = inflow.get(u)
+                if e is None:
+                    arcs.append((a | 1, 0.0, None))
+                else:
+                    arcs.append((2 * flow[e][0] + 1, -w[e], ~e))
+            else:
+                if nodes and u in inflow:
+                    arcs.append((a - 1, 0.0, None))
+                e = ptr[u]
+                uid = ids[u]
+                for v in nbrs[u]:
+                    if e in banned or v in banned_rows or v == s:
+                        e += 1
+                        continue
+                    r = rev[e]
+                    if flow and not nodes and r >= 0 and r in flow:
+                        arcs.append((v, -w[r], ~r))
+                    elif not flow or e not in flow:
+                        b = 2 * v if nodes else v
+                        nd = du + w[e] + pa - pi[b]
+                        if nd < du:
+                            nd = du
+                        if b not in done and nd < dist.get(b, math.inf):
+                            if index is not None:
+                                idx = index((uid, ids[v]))
+                                if idx is None or not links[idx].enabled:
+                                    e += 1
+                                    continue
+                            dist[b] = nd
+                            prev[b] = (a, e)
+                            heapq.heappush(heap, (nd, b))
+                    e += 1
+            for b, c, tag in arcs:
+                if b in done:
+                    continue
+                nd = du + max(c + pa - pi[b], 0.0)
+                if nd < dist.get(b, math.inf):
+                    dist[b] = nd
+                    prev[b] = (a, tag)
+                    heapq.heappush(heap, (nd, b))
+        if target not in done:
+            break
+        if rnd + 1 < k:
+            top = dist[target]
+            # reduced costs stay non-negative: unsettled states move by the target's distance
+            pi = [p + min(dist.get(x, top), top) for x, p in enumerate(pi)]
+        b = target
+        while b != start:
+            a, tag = prev[b]
+            if tag is not None:
+                if tag >= 0:
+                    flow[tag] = ((a >> 1 if nodes else a), (b >> 1 if nodes else b))
+                else:
+                    del flow[~tag]
+            b = a
+
+    # decompose the flow into paths
+    out_edges: Dict[int, List[int]] = {}
+    for e, (u, _v) in flow.items():
+        out_edges.setdefault(u, []).append(e)
+    paths: List[Tuple[List[int], float]] = []
+    while out_edges.get(s):
+        path, acc, u = [s], 0.0, s
+        while u != d:
+            e = out_edges[u].pop()
+            acc += cost[e]
+            u = flow[e][1]
+            path.append(u)
+        paths.append((g.path_ids(path), acc))
+    paths.sort(key=lambda pc: pc[1])
+    return paths
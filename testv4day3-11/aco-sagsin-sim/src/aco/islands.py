@@ -0,0 +1,257 @@
+"""Island-model ACO: colonies in worker processes exchanging best paths and pheromone.
+
+Each island is a ``Colony`` with its own seed and (optionally) its own
+alpha/beta/q0. Pheromone for all islands lives in one shared-memory block;
+every ``exchange_every`` iterations the islands meet at a barrier, adopt the
+best path found by any island and blend their pheromone toward the islands'
+mean. Island 0 decides when to stop (iteration budget, deadline or
+stagnation of the global best) so all islands leave the loop together.
+"""
+from __future__ import annotations
+
+import math
+import multiprocessing as mp
+import time
+from dataclasses import replace
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import AcoParams, load_config
+from ..types import GraphState
+from .csr import CSRGraph, graph_for
+from .jit import active_backend, make_colony
+from .objective import compute_edge_costs
+from .solver import SolveResult, new_seed
+
+# per-island (alpha factor, beta factor, q0 offset), cycled; island 0 runs the configured values
+ISLAND_VARIANTS: Tuple[Tuple[float, float, float], ...] = (
+    (1.0, 1.0, 0.0),
+    (1.0, 0.67, 0.0),
+    (1.0, 1.33, 0.3),
+    (0.5, 1.0, 0.1),
+)
+
+STOP_DONE, STOP_DEADLINE, STOP_STAGNATION = 1, 2, 3
+
+
+def island_params(cfg: AcoParams, k: int, vary: bool = True) -> AcoParams:
+    if not vary:
+        return cfg
+    fa, fb, dq = ISLAND_VARIANTS[k % len(ISLAND_VARIANTS)]
+    return replace(cfg, alpha=cfg.alpha * fa, beta=cfg.beta * fb, q0=min(0.95, cfg.q0 + dq))
+
+
+def _layout(k: int, e: int, n: int) -> Tuple[Dict[str, Tuple[int, Tuple[int, ...], str]], int]:
+    """Offsets of the shared arrays for ``k`` islands, ``e`` edges and paths of up to ``n`` rows."""
+    out, off = {}, 0
+    for name, shape, dt in (
+        ("tau", (k, e), "f8"),
+        ("best_cost", (k,), "f8"),
+        ("best_len", (k,), "i8"),
+        ("best_path", (k, max(n, 1)), "i8"),
+        ("conv", (k,), "i8"),
+        ("iters", (k,), "i8"),
+        ("ctrl", (1,), "i8"),
+    ):
+        out[name] = (off, shape, dt)
+        off += int(np.prod(shape)) * 8
+    return out, off
+
+
+def _views(buf, layout) -> Dict[str, np.ndarray]:
+    return {name: np.ndarray(shape, dtype=dt, buffer=buf, offset=off) for name, (off, shape, dt) in layout.items()}
+
+
+def _island_main(k: int, shm_name: str, dims: Tuple[int, int, int], *args) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    v = _views(shm.buf, _layout(*dims)[0])
+    try:
+        _island_loop(k, v, dims[0], *args)
+    except BrokenBarrierError:
+        pass
+    finally:
+        # every view into the mapping must be gone before it can be closed
+        v.clear()
+        shm.close()
+
+
+def _island_loop(k: int, v: Dict[str, np.ndarray], n_islands: int, g: CSRGraph, src: int, dst: int,
+                 params: AcoParams, ants: int, iters: int, seed: np.random.SeedSequence, every: int,
+                 blend: float, stagnation: int, deadline: Optional[float], barrier) -> None:
+    tau = v["tau"][k]
+    tau[:] = params.tau0
+    col = make_colony(g, params, np.random.default_rng(seed), tau=tau)
+    g_best, g_at, it = math.inf, 0, 0
+    while True:
+        cut = False
+        for _ in range(min(every, iters - it)):
+            it += 1
+            if not col.iterate(src, dst, ants, deadline):
+                cut = True
+                break
+        n = len(col.best_rows)
+        v["best_cost"][k] = col.best_cost
+        v["best_len"][k] = n
+        v["best_path"][k, :n] = col.best_rows
+        v["conv"][k] = col.converged_at
+        v["iters"][k] = it
+        barrier.wait()
+
+        w = int(np.argmin(v["best_cost"]))
+        gc = float(v["best_cost"][w])
+        if gc < g_best:
+            g_best, g_at = gc, it
+        if k == 0:
+            stop = 0
+            if cut or (deadline is not None and time.monotonic() >= deadline):
+                stop = STOP_DEADLINE
+            elif stagnation and g_at and it - g_at >= stagnation:
+                stop = STOP_STAGNATION
+            elif it >= iters:
+                stop = STOP_DONE
+            v["ctrl"][0] = stop
+        mean = v["tau"].mean(axis=0) if blend > 0 and n_islands > 1 else None
+        col.adopt(v["best_path"][w, : int(v["best_len"][w])].tolist(), gc)
+        barrier.wait()
+
+        if v["ctrl"][0]:
+            return
+        if mean is not None:
+            tau *= 1.0 - blend
+            tau += blend * mean
+
+
+def _context():
+    methods = mp.get_all_start_methods()
+    # forkserver children are forked from a clean server, not from the
+    # (multi-threaded) controller, and start much faster than spawn
+    return mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class IslandACO:
+    """Drop-in alternative to ``ACO`` running ``islands`` colonies in parallel.
+
+    ``ants`` is split across islands by default, so total work per iteration
+    matches a single colony of ``cfg.ants`` ants. ``islands=1`` runs one
+    array-based colony in-process, drawing exactly like ``ACO.run`` with the
+    same seed. Island streams are spawned from the run's seed, so a seeded
+    run is replayable for a fixed island count.
+    """
+
+    def __init__(self, gs: GraphState, weights_override: tuple[float, float, float, float] | None = None,
+                 islands: Optional[int] = None, exchange_every: Optional[int] = None,
+                 blend: Optional[float] = None, ants_per_island: Optional[int] = None,
+                 vary_params: bool = True, rng: Optional[np.random.Generator] = None):
+        self.gs = gs
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.cfg = load_config().aco
+        self.costs = compute_edge_costs(gs, weights_override)
+        weights = tuple(weights_override) if weights_override else tuple(self.cfg.weights)
+        self.graph = graph_for(gs, self.costs, weights)
+        self.islands = max(1, islands or self.cfg.islands)
+        self.exchange_every = max(1, exchange_every or self.cfg.exchange_every)
+        self.blend = self.cfg.island_blend if blend is None else blend
+        self.ants_per_island = ants_per_island
+        self.vary_params = vary_params
+
+    def solve(self, src: int, dst: int, seed: Optional[int] = None) -> Tuple[List[int], float]:
+        res = self.run(src, dst, seed=seed)
+        return res.path, res.cost
+
+    def run(self, src: int, dst: int, deadline_ms: Optional[float] = None,
+            stagnation: Optional[int] = None, seed: Optional[int] = None) -> SolveResult:
+        t0 = time.perf_counter()
+        g = self.graph
+        seed = new_seed(self.rng) if seed is None else int(seed)
+        if src not in g.row_of or dst not in g.row_of:
+            return SolveResult(seed=seed, backend=active_backend(self.cfg))
+        if deadline_ms is None:
+            deadline_ms = self.cfg.deadline_ms
+        if stagnation is None:
+            stagnation = self.cfg.stagnation_iters
+        deadline = time.monotonic() + deadline_ms / 1e3 if deadline_ms and deadline_ms > 0 else None
+        k = self.islands
+        ants = self.ants_per_island or max(1, math.ceil(self.cfg.ants / k))
+        s, d = g.row_of[src], g.row_of[dst]
+
+        if k == 1:
+            res = self._run_single(s, d, ants, seed, stagnation, deadline)
+        else:
+            res = self._run_islands(s, d, ants, seed, stagnation, deadline)
+        res.seed = seed
+        res.backend = active_backend(self.cfg)
+        res.elapsed_ms = (time.perf_counter() - t0) * 1e3
+        return res
+
+    def _run_single(self, s: int, d: int, ants: int, seed: int, stagnation: int,
+                    deadline: Optional[float]) -> SolveResult:
+        col = make_colony(self.graph, self.cfg, np.random.default_rng(seed))
+        res = SolveResult()
+        for it in range(1, self.cfg.iters + 1):
+            res.iterations = it
+            if not col.iterate(s, d, ants, deadline):
+                res.truncated = True
+                break
+            if stagnation and col.converged_at and it - col.converged_at >= stagnation:
+                res.stagnated = True
+                break
+        if col.best_rows:
+            res.path, res.cost = self.graph.path_ids(col.best_rows), col.best_cost
+        res.converged_at = col.converged_at
+        return res
+
+    def _run_islands(self, s: int, d: int, ants: int, seed: int, stagnation: int,
+                     deadline: Optional[float]) -> SolveResult:
+        g, k = self.graph, self.islands
+        dims = (k, g.n_edges, len(g.ids))
+        layout, size = _layout(*dims)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        v = _views(shm.buf, layout)
+        try:
+            v["best_cost"][:] = math.inf
+            v["ctrl"][0] = 0
+            ctx = _context()
+            barrier = ctx.Barrier(k)
+            streams = np.random.SeedSequence(seed).spawn(k)
+            procs = [
+                ctx.Process(
+                    target=_island_main,
+                    args=(i, shm.name, dims, g, s, d, island_params(self.cfg, i, self.vary_params), ants,
+                          self.cfg.iters, streams[i], self.exchange_every, self.blend,
+                          stagnation, deadline, barrier),
+                    daemon=True,
+                )
+                for i in range(k)
+            ]
+            for p in procs:
+                p.start()
+            while any(p.is_alive() for p in procs):
+                if any(p.exitcode not in (None, 0) for p in procs):
+                    # a crashed island would leave the others waiting at the barrier
+                    barrier.abort()
+                    break
+                procs[0].join(0.02)
+            for p in procs:
+                p.join(5)
+                if p.is_alive():
+                    p.terminate()
+            if any(p.exitcode != 0 for p in procs):
+                raise RuntimeError("island worker failed")
+
+            res = SolveResult(iterations=int(v["iters"].max()))
+            w = int(np.argmin(v["best_cost"]))
+            if math.isfinite(v["best_cost"][w]):
+                rows = v["best_path"][w, : int(v["best_len"][w])].tolist()
+                res.path, res.cost = g.path_ids(rows), float(v["best_cost"][w])
+                res.converged_at = int(v["conv"][w])
+            stop = int(v["ctrl"][0])
+            res.truncated = stop == STOP_DEADLINE
+            res.stagnated = stop == STOP_STAGNATION
+            return res
+        finally:
+            v.clear()
+            shm.close()
+            shm.unlink()
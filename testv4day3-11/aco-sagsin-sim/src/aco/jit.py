@@ -0,0 +1,240 @@
+"""Optional Numba backend: the ant walk and pheromone updates compiled over CSR arrays.
+
+``JitColony`` is a ``Colony`` whose forward walk (with local update) and
+global update run as ``@njit`` kernels on the ``CSRGraph`` arrays. The
+kernels draw from their own xorshift64* stream, seeded once from the
+colony's ``rng``, so a fixed seed gives bitwise-identical paths and
+pheromone on every run. Selection, update and backtracking follow
+``Colony`` step for step; only the random stream differs.
+
+Without Numba nothing here is compiled and ``make_colony`` returns a plain
+``Colony``. Bidirectional walks always run in Python.
+"""
+from __future__ import annotations
+
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..config import AcoParams
+from .csr import Colony, CSRGraph
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    numba = None  # type: ignore
+    NUMBA_AVAILABLE = False
+
+BACKENDS = ("python", "numba")
+
+_MASK = (1 << 64) - 1
+_MUL = np.uint64(0x2545F4914F6CDD1D)
+
+
+def _njit(fn):
+    # nogil: concurrent /route requests can walk in parallel threads
+    return numba.njit(cache=True, nogil=True)(fn) if NUMBA_AVAILABLE else fn
+
+
+def rng_state(seed: int) -> np.ndarray:
+    """xorshift64* state for ``seed`` (splitmix64-scrambled, never zero)."""
+    z = (seed + 0x9E3779B97F4A7C15) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    z ^= z >> 31
+    return np.array([z or 1], dtype=np.uint64)
+
+
+@_njit
+def _random(state):
+    x = state[0]
+    x ^= x >> np.uint64(12)
+    x ^= x << np.uint64(25)
+    x ^= x >> np.uint64(27)
+    state[0] = x
+    return float((x * _MUL) >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+
+
+@_njit
+def _walk(indptr, indices, cost, tau, eta, cptr, cedge, s, d, alpha, q0, xi, tau0, backtracks,
+          mark, stamp, rows, edges, opts, scores, state):
+    """One forward ant; fills ``rows``/``edges`` and returns (rows used, cost), (0, inf) at a dead end.
+
+    ``mark[r] == stamp`` means row ``r`` was visited by this ant. ``cptr``/``cedge``
+    are the candidate lists in CSR form (empty = full neighbourhood).
+    """
+    mark[s] = stamp
+    rows[0] = s
+    n = 1
+    acc = 0.0
+    cur = s
+    while cur != d:
+        k = 0
+        if len(cptr):
+            for i in range(cptr[cur], cptr[cur + 1]):
+                e = cedge[i]
+                if mark[indices[e]] != stamp and eta[e] > 0:
+                    opts[k] = e
+                    k += 1
+        if k == 0:
+            for e in range(indptr[cur], indptr[cur + 1]):
+                if mark[indices[e]] != stamp and eta[e] > 0:
+                    opts[k] = e
+                    k += 1
+        if k == 0:
+            if backtracks > 0 and n > 1:
+                # step back; the dead end stays marked so it is not retried
+                backtracks -= 1
+                n -= 1
+                acc -= cost[edges[n - 1]]
+                cur = rows[n - 1]
+                continue
+            return 0, np.inf
+
+        ssum = 0.0
+        for i in range(k):
+            e = opts[i]
+            if alpha == 1.0:
+                sc = tau[e] * eta[e]
+            else:
+                sc = (tau[e] ** alpha) * eta[e]
+            scores[i] = sc
+            ssum += sc
+        pick = k - 1
+        if _random(state) < q0:
+            pick = 0
+            for i in range(1, k):
+                if scores[i] > scores[pick]:
+                    pick = i
+        elif ssum <= 0:
+            pick = min(int(_random(state) * k), k - 1)
+        else:
+            r = _random(state) * ssum
+            run = 0.0
+            for i in range(k):
+                run += scores[i]
+                if r <= run:
+                    pick = i
+                    break
+
+        e = opts[pick]
+        tau[e] = (1 - xi) * tau[e] + xi * tau0
+        v = indices[e]
+        acc += cost[e]
+        edges[n - 1] = e
+        rows[n] = v
+        n += 1
+        mark[v] = stamp
+        cur = v
+    return n, acc
+
+
+@_njit
+def _reinforce(tau, rev, best, delta, rho, mmas, tau_min, tau_max):
+    """Global update on the best path's edges (both directions), then the optional MMAS clamp."""
+    for i in range(len(best)):
+        e = best[i]
+        tau[e] = (1 - rho) * tau[e] + rho * delta
+        x = rev[e]
+        if x >= 0:
+            tau[x] = (1 - rho) * tau[x] + rho * delta
+    if mmas:
+        for e in range(len(tau)):
+            if tau[e] < tau_min:
+                tau[e] = tau_min
+            elif tau[e] > tau_max:
+                tau[e] = tau_max
+
+
+def candidate_arrays(g: CSRGraph, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """``g.candidates(k)`` as (indptr, edge ids); empty arrays when ``k`` is 0."""
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    lists = g.candidates(k)
+    ptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    ptr[1:] = np.cumsum([len(c) for c in lists])
+    edges = np.fromiter((e for c in lists for e, _v in c), dtype=np.int64, count=int(ptr[-1]))
+    return ptr, edges
+
+
+class JitColony(Colony):
+    """``Colony`` with the forward walk and global update compiled by Numba."""
+
+    def __init__(self, g: CSRGraph, params: AcoParams, rng: np.random.Generator,
+                 tau: Optional[np.ndarray] = None) -> None:
+        super().__init__(g, params, rng, tau)
+        n = max(len(g.ids), 1)
+        deg = int(np.diff(g.indptr).max()) if len(g.ids) else 0
+        self._rows = np.empty(n, dtype=np.int64)
+        self._edges = np.empty(n, dtype=np.int64)
+        self._opts = np.empty(max(deg, 1), dtype=np.int64)
+        self._scores = np.empty(max(deg, 1), dtype=np.float64)
+        self._mark = np.zeros(n, dtype=np.int64)
+        self._stamp = 0
+        self._cptr, self._cedge = candidate_arrays(g, params.candidates)
+        self._eta: Optional[np.ndarray] = None
+        self.state = rng_state(int(rng.integers(2**63)))
+
+    def prepare(self, s: int, d: int, deadline: Optional[float] = None) -> None:
+        if self._target == (s, d) and self._eta is not None:
+            return
+        super().prepare(s, d, deadline)
+        self._eta = np.asarray(self.eta_f, dtype=np.float64)
+
+    def walk(self, s: int, d: int) -> Optional[Tuple[List[int], List[int], float]]:
+        if self.p.bidirectional:
+            return super().walk(s, d)
+        g, p = self.g, self.p
+        self._stamp += 1
+        n, acc = _walk(g.indptr, g.indices, g.cost, self.tau_np, self._eta, self._cptr, self._cedge,
+                       s, d, float(p.alpha), float(p.q0), float(p.xi), float(p.tau0), int(p.backtracks),
+                       self._mark, self._stamp, self._rows, self._edges, self._opts, self._scores,
+                       self.state)
+        if n == 0:
+            return None
+        return self._rows[:n].tolist(), self._edges[: n - 1].tolist(), acc
+
+    def reinforce(self) -> None:
+        p = self.p
+        best = np.asarray(self.best_edges, dtype=np.int64)
+        delta = 1.0 / max(self.best_cost, 1e-9) if len(best) else 0.0
+        _reinforce(self.tau_np, self.g.rev, best, delta, float(p.rho), bool(p.mmas),
+                   float(p.tau_min), float(p.tau_max))
+
+
+def use_jit(params: AcoParams) -> bool:
+    """True when ``params.backend`` asks for Numba and it is importable."""
+    return NUMBA_AVAILABLE and params.backend == "numba"
+
+
+def active_backend(params: AcoParams) -> str:
+    """The backend ``make_colony`` runs for ``params``: "numba" or "python"."""
+    return "numba" if use_jit(params) else "python"
+
+
+def make_colony(g: CSRGraph, params: AcoParams, rng: np.random.Generator,
+                tau: Optional[np.ndarray] = None) -> Colony:
+    """``JitColony`` when the Numba backend is selected and available, else ``Colony``."""
+    cls = JitColony if use_jit(params) else Colony
+    return cls(g, params, rng, tau=tau)
+
+
+_WARM = threading.Lock()
+
+
+def warmup() -> None:
+    """Compile (or load from the on-disk cache) every kernel on a two-row graph."""
+    if not NUMBA_AVAILABLE:
+        return
+    with _WARM:
+        one = np.ones(2, dtype=np.float64)
+        i64 = np.zeros(2, dtype=np.int64)
+        empty = np.zeros(0, dtype=np.int64)
+        _walk(np.array([0, 1, 2], dtype=np.int64), np.array([1, 0], dtype=np.int32), one, one.copy(), one,
+              empty, empty, 0, 1, 1.0, 0.5, 0.1, 1.0, 0, i64.copy(), 1, i64.copy(), i64.copy(),
+              i64.copy(), one.copy(), rng_state(0))
+        _reinforce(one.copy(), np.array([1, 0], dtype=np.int64), np.zeros(1, dtype=np.int64), 1.0, 0.1,
+                   True, 0.01, 2.0)
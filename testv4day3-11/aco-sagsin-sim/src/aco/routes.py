@@ -0,0 +1,265 @@
+"""Cache of solved routes with an edge -> routes index and local repair.
+
+When links go down only the cached routes that cross them are touched. A
+broken route is reconnected from the nearest upstream node that can reach
+its surviving suffix: a Dijkstra over the CSR view the route was solved on,
+skipping links that are now disabled and weighting each edge by its cost
+discounted by the pheromone the solve left on it, that stops at the suffix
+node with the cheapest detour plus remaining route. A route that cannot be
+reconnected is dropped and the next request solves it from scratch.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..types import GraphState
+from .csr import CSRGraph, item_view
+from .solver import SolveResult
+
+Key = Hashable
+
+
+def link_key(u: int, v: int) -> Tuple[int, int]:
+    """Undirected link id used by the index."""
+    return (u, v) if u <= v else (v, u)
+
+
+def _enabled(gs: GraphState, u: int, v: int) -> bool:
+    idx = gs.edge_index.get((u, v))
+    return idx is not None and gs.links[idx].enabled
+
+
+def pheromone_weight(g: CSRGraph, tau: Optional[np.ndarray], tau0: float,
+                     k: float) -> Optional[Tuple[np.ndarray, float]]:
+    """(``cost * (tau0 / tau) ** k`` per edge, smallest weight/cost ratio); None = plain costs."""
+    if tau is None or not k or len(tau) != g.n_edges or not len(tau):
+        return None
+    ratio = (tau0 / np.maximum(tau, 1e-12)) ** k
+    return g.cost * ratio, min(1.0, float(ratio.min()))
+
+
+@dataclass
+class CachedRoute:
+    path: List[int]
+    cost: float
+    # the CSR view and pheromone of the solve; repairs search this graph
+    graph: CSRGraph
+    tau: Optional[np.ndarray] = None
+    repairs: int = 0
+    # (repair weights, their smallest weight/cost ratio), built on the first repair
+    weight: Optional[Tuple[np.ndarray, float]] = field(default=None, repr=False)
+    # the solve that found the route (seed, iterations, ...); repairs keep it
+    solve: Optional[SolveResult] = field(default=None, repr=False)
+
+
+@dataclass
+class RepairReport:
+    affected: int = 0
+    repaired: int = 0
+    dropped: int = 0
+    ms: float = 0.0
+    # per repaired route: (key, old cost, new cost)
+    changes: List[Tuple[Key, float, float]] = field(default_factory=list)
+
+
+class RouteCache:
+    """LRU of solved routes keyed by e.g. (src, dst, weights), indexed by the links they use.
+
+    ``pheromone`` is the exponent of the pheromone discount in repairs:
+    an edge weighs ``cost * (tau0 / tau) ** pheromone`` (0 = plain costs).
+    Thread-safe; callers still hold the graph lock while passing ``gs``.
+    """
+
+    def __init__(self, capacity: int = 256, pheromone: float = 0.5, tau0: float = 1.0) -> None:
+        self.capacity = capacity
+        self.pheromone = pheromone
+        self.tau0 = tau0
+        self._routes: "OrderedDict[Key, CachedRoute]" = OrderedDict()
+        self._by_link: Dict[Tuple[int, int], Set[Key]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def get(self, key: Key, gs: Optional[GraphState] = None) -> Optional[CachedRoute]:
+        """The cached route; with ``gs``, a route over a disabled link is dropped instead."""
+        with self._lock:
+            hit = self._routes.get(key)
+            if hit is None:
+                return None
+            if gs is not None and not all(_enabled(gs, u, v) for u, v in zip(hit.path, hit.path[1:])):
+                self._drop(key)
+                return None
+            self._routes.move_to_end(key)
+            return hit
+
+    def put(self, key: Key, path: List[int], cost: float, graph: CSRGraph,
+            tau: Optional[np.ndarray] = None, solve: Optional[SolveResult] = None) -> None:
+        """Cache a solved route; a solve cut short by its deadline is not kept."""
+        if self.capacity <= 0 or len(path) < 2 or not math.isfinite(cost):
+            return
+        if solve is not None and solve.truncated:
+            return
+        with self._lock:
+            self._drop(key)
+            self._add(key, CachedRoute(list(path), float(cost), graph,
+                                       None if tau is None else tau.copy(), solve=solve))
+            while len(self._routes) > self.capacity:
+                self._drop(next(iter(self._routes)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._by_link.clear()
+
+    def routes_using(self, u: int, v: int) -> Set[Key]:
+        with self._lock:
+            return set(self._by_link.get(link_key(u, v), ()))
+
+    def drop_nodes(self, ids: Iterable[int]) -> int:
+        """Forget routes through any of ``ids`` (nodes that moved, joined or left)."""
+        ids = set(ids)
+        with self._lock:
+            gone = [k for k, r in self._routes.items() if ids.intersection(r.path)]
+            for k in gone:
+                self._drop(k)
+        return len(gone)
+
+    def links_down(self, gs: GraphState, links: Iterable[Tuple[int, int]]) -> RepairReport:
+        """Repair or drop every cached route crossing one of ``links`` that is now disabled."""
+        t0 = time.perf_counter()
+        rep = RepairReport()
+        with self._lock:
+            keys: Set[Key] = set()
+            for u, v in links:
+                if not _enabled(gs, u, v):
+                    keys.update(self._by_link.get(link_key(u, v), ()))
+            rep.affected = len(keys)
+            for key in keys:
+                route = self._routes[key]
+                fixed = self._repair(gs, route)
+                self._drop(key)
+                if fixed is None:
+                    rep.dropped += 1
+                    continue
+                path, cost = fixed
+                self._add(key, replace(route, path=path, cost=cost, repairs=route.repairs + 1))
+                rep.repaired += 1
+                rep.changes.append((key, route.cost, cost))
+        rep.ms = (time.perf_counter() - t0) * 1e3
+        return rep
+
+    def _add(self, key: Key, route: CachedRoute) -> None:
+        self._routes[key] = route
+        for u, v in zip(route.path, route.path[1:]):
+            self._by_link.setdefault(link_key(u, v), set()).add(key)
+
+    def _drop(self, key: Key) -> None:
+        route = self._routes.pop(key, None)
+        if route is None:
+            return
+        for u, v in zip(route.path, route.path[1:]):
+            keys = self._by_link.get(link_key(u, v))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_link[link_key(u, v)]
+
+    def _repair(self, gs: GraphState, route: CachedRoute) -> Optional[Tuple[List[int], float]]:
+        """The route with every broken hop bypassed, or None if some hop cannot be."""
+        g = route.graph
+        if any(n not in g.row_of for n in route.path):
+            return None
+        rows = [g.row_of[n] for n in route.path]
+        ptr, nbrs, cost, _rev = g.lists()
+        ids = g.ids.tolist()
+        weight, floor = self._weight_fn(route)
+        # straight-line bound on the weighted cost to the destination (A* guide and cut-off)
+        h = (g.geo_bound(rows[-1]) * floor).tolist()
+        # each pass fixes the first broken hop; a detour never uses a broken link
+        for _ in range(len(rows)):
+            edges = [ptr[u] + nbrs[u].index(v) for u, v in zip(rows, rows[1:])]
+            i = next((j for j in range(len(edges)) if not _enabled(gs, ids[rows[j]], ids[rows[j + 1]])), None)
+            if i is None:
+                return g.path_ids(rows), float(sum(cost[e] for e in edges))
+            # weighted cost from each row after the break to the destination along the route
+            rest: Dict[int, float] = {rows[-1]: 0.0}
+            for j in range(len(edges) - 1, i, -1):
+                rest[rows[j]] = rest[rows[j + 1]] + weight[edges[j]]
+            for up in range(i, -1, -1):
+                detour = self._detour(gs, g, ids, weight, h, rows[up], set(rows[:up]), rest)
+                if detour is not None:
+                    j = rows.index(detour[-1])
+                    rows = rows[:up] + detour + rows[j + 1:]
+                    break
+            else:
+                return None
+        return None
+
+    def _weight_fn(self, route: CachedRoute) -> Tuple[Sequence[float], float]:
+        """(per-edge repair weights, smallest weight/cost ratio): costs discounted by pheromone.
+
+        Built once per cached route and kept across its repairs.
+        """
+        g = route.graph
+        if route.weight is None:
+            route.weight = pheromone_weight(g, route.tau, self.tau0, self.pheromone)
+            if route.weight is None:
+                return g.lists()[2], 1.0
+        return item_view(route.weight[0]), route.weight[1]
+
+    @staticmethod
+    def _detour(gs: GraphState, g: CSRGraph, ids: List[int], weight: Sequence[float], h: List[float],
+                start: int, blocked: Set[int], rest: Dict[int, float]) -> Optional[List[int]]:
+        """Enabled rows from ``start`` to the ``rest`` row minimising detour + ``rest`` cost.
+
+        A* on ``h`` (a lower bound to the destination); rows in ``blocked``
+        (the kept prefix) are never entered.
+        """
+        ptr, nbrs, _cost, _rev = g.lists()
+        index, links = gs.edge_index.get, gs.links
+        dist = {start: 0.0}
+        prev: Dict[int, int] = {}
+        done = set()
+        heap = [(h[start], start)]
+        best, best_row = math.inf, None
+        while heap:
+            f, u = heapq.heappop(heap)
+            if f >= best:
+                break
+            if u in done:
+                continue
+            done.add(u)
+            d = dist[u]
+            r = rest.get(u)
+            if r is not None:
+                if d + r < best:
+                    best, best_row = d + r, u
+                continue
+            e = ptr[u]
+            uid = ids[u]
+            for v in nbrs[u]:
+                nd = d + weight[e]
+                e += 1
+                if v in done or v in blocked or nd >= dist.get(v, math.inf):
+                    continue
+                idx = index((uid, ids[v]))
+                if idx is None or not links[idx].enabled:
+                    continue
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(heap, (nd + h[v], v))
+        if best_row is None:
+            return None
+        out = [best_row]
+        while out[-1] != start:
+            out.append(prev[out[-1]])
+        return out[::-1]
@@ -1,102 +1,114 @@
 from __future__ import annotations
 
-import math
-import random
-from typing import Dict, List, Tuple
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
 
 from ..config import load_config
 from ..types import GraphState
+from .csr import graph_for
+from .jit import active_backend, make_colony
 from .objective import compute_edge_costs
 
 
+@dataclass
+class SolveResult:
+    path: List[int] = field(default_factory=list)
+    cost: float = float("inf")
+    # iterations started; the last one is partial when truncated
+    iterations: int = 0
+    # 1-based iteration that last improved the best cost (0 = no path found)
+    converged_at: int = 0
+    # cut short by the deadline
+    truncated: bool = False
+    # stopped early because the best cost stopped improving
+    stagnated: bool = False
+    elapsed_ms: float = 0.0
+    # seed of the run's generator; passing it back as ``seed`` replays the search
+    seed: Optional[int] = None
+    # ant walk that ran ("python" | "numba"); a seed only replays on the same backend
+    backend: str = "python"
+
+
+def new_seed(rng: Optional[np.random.Generator] = None) -> int:
+    """A fresh 63-bit seed drawn from ``rng`` (OS entropy when None)."""
+    return int((rng if rng is not None else np.random.default_rng()).integers(2**63))
+
+
 class ACO:
-    def __init__(self, gs: GraphState, weights_override: tuple[float, float, float, float] | None = None):
+    """Single-colony ACS/MMAS path search between two nodes.
+
+    The colony itself (``csr.Colony``) walks an edge-array view of the graph
+    that is cached per graph version; each solver keeps its own pheromone.
+    Every run draws from its own ``np.random.Generator`` seeded with ``seed``;
+    unseeded runs take a seed from ``rng`` (OS entropy by default), so a
+    seeded ``rng`` makes a whole series of solves replayable.
+    """
+
+    def __init__(self, gs: GraphState, weights_override: tuple[float, float, float, float] | None = None,
+                 rng: Optional[np.random.Generator] = None):
         self.gs = gs
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.cfg = load_config().aco
         self.costs = compute_edge_costs(gs, weights_override)
-        self.tau: Dict[Tuple[int, int], float] = {}
-        for (u, v), c in self.costs.items():
-            self.tau[(u, v)] = self.cfg.tau0
-
-    def _eta(self, u: int, v: int) -> float:
-        # heuristic desirability = 1/cost
-        return 1.0 / max(self.costs[(u, v)], 1e-9)
-
-    def _neighbors(self, u: int) -> List[int]:
-        return [v for v in self.gs.adj.get(u, []) if (u, v) in self.costs and self._edge_enabled(u, v)]
-
-    def _edge_enabled(self, u: int, v: int) -> bool:
-        idx = self.gs.edge_index.get((u, v))
-        return idx is not None and self.gs.links[idx].enabled
-
-    def solve(self, src: int, dst: int) -> Tuple[List[int], float]:
-        best_path: List[int] = []
-        best_cost = float("inf")
-        ants, iters = self.cfg.ants, self.cfg.iters
-        alpha, beta = self.cfg.alpha, self.cfg.beta
-        rho, xi, q0 = self.cfg.rho, self.cfg.xi, self.cfg.q0
-        mmas = self.cfg.mmas
-        tau_min, tau_max = self.cfg.tau_min, self.cfg.tau_max
-
-        for _ in range(iters):
-            for _a in range(ants):
-                path = [src]
-                visited = {src}
-                cost_acc = 0.0
-                cur = src
-                while cur != dst:
-                    nbrs = [v for v in self._neighbors(cur) if v not in visited]
-                    if not nbrs:
-                        # dead end
-                        cost_acc = float("inf")
-                        path = []
-                        break
-                    # select next
-                    if random.random() < q0:
-                        # exploitation
-                        v = max(
-                            nbrs,
-                            key=lambda x: (self.tau[(cur, x)] ** alpha) * (self._eta(cur, x) ** beta),
-                        )
-                    else:
-                        # probabilistic selection
-                        scores = [
-                            (self.tau[(cur, v)] ** alpha) * (self._eta(cur, v) ** beta) for v in nbrs
-                        ]
-                        ssum = sum(scores)
-                        if ssum <= 0:
-                            v = random.choice(nbrs)
-                        else:
-                            r = random.random()
-                            acc = 0.0
-                            v = nbrs[-1]
-                            for vv, sc in zip(nbrs, scores):
-                                acc += sc / ssum
-                                if r <= acc:
-                                    v = vv
-                                    break
-                    # local update
-                    self.tau[(cur, v)] = (1 - xi) * self.tau[(cur, v)] + xi * self.cfg.tau0
-                    # accumulate cost
-                    cost_acc += self.costs[(cur, v)]
-                    path.append(v)
-                    visited.add(v)
-                    cur = v
-
-                if path and cost_acc < best_cost:
-                    best_cost = cost_acc
-                    best_path = path[:]
-
-            # global update (reinforcement on best path)
-            if best_path:
-                delta = 1.0 / max(best_cost, 1e-9)
-                for i in range(len(best_path) - 1):
-                    u, v = best_path[i], best_path[i + 1]
-                    self.tau[(u, v)] = (1 - rho) * self.tau[(u, v)] + rho * delta
-                    self.tau[(v, u)] = (1 - rho) * self.tau[(v, u)] + rho * delta
-
-            if mmas:
-                for k in list(self.tau.keys()):
-                    self.tau[k] = min(max(self.tau[k], tau_min), tau_max)
-
-        return best_path, best_cost
+        weights = tuple(weights_override) if weights_override else tuple(self.cfg.weights)
+        self.graph = graph_for(gs, self.costs, weights)
+        self.tau = np.full(self.graph.n_edges, self.cfg.tau0, dtype=np.float64)
+
+    def solve(self, src: int, dst: int,
+              on_iteration: Optional[Callable[[int, float], None]] = None,
+              seed: Optional[int] = None) -> Tuple[List[int], float]:
+        """Best path found from ``src`` to ``dst`` and its cost (([], inf) if none).
+
+        ``on_iteration(i, best_cost)`` is called after each iteration's global
+        update, e.g. to record anytime curves.
+        """
+        res = self.run(src, dst, on_iteration=on_iteration, seed=seed)
+        return res.path, res.cost
+
+    def run(self, src: int, dst: int, deadline_ms: Optional[float] = None,
+            stagnation: Optional[int] = None,
+            on_iteration: Optional[Callable[[int, float], None]] = None,
+            seed: Optional[int] = None) -> SolveResult:
+        """Anytime search that stops at the iteration budget, a deadline or stagnation.
+
+        ``deadline_ms`` bounds wall-clock time and is checked before every ant
+        (the first ant always runs). ``stagnation`` stops the search after that
+        many consecutive iterations without improvement. Both default to
+        ``cfg.deadline_ms`` / ``cfg.stagnation_iters``; 0 disables them.
+        A fresh solver given the same ``seed`` and configuration returns the
+        same result (pheromone carries over between runs of one solver).
+        """
+        t0 = time.perf_counter()
+        if deadline_ms is None:
+            deadline_ms = self.cfg.deadline_ms
+        if stagnation is None:
+            stagnation = self.cfg.stagnation_iters
+        deadline = time.monotonic() + deadline_ms / 1e3 if deadline_ms and deadline_ms > 0 else None
+
+        res = SolveResult(seed=new_seed(self.rng) if seed is None else int(seed),
+                          backend=active_backend(self.cfg))
+        g = self.graph
+        if src not in g.row_of or dst not in g.row_of:
+            return res
+        s, d = g.row_of[src], g.row_of[dst]
+        col = make_colony(g, self.cfg, np.random.default_rng(res.seed), tau=self.tau)
+        for it in range(self.cfg.iters):
+            res.iterations = it + 1
+            if not col.iterate(s, d, self.cfg.ants, deadline):
+                res.truncated = True
+            if on_iteration is not None:
+                on_iteration(it, col.best_cost)
+            if res.truncated:
+                break
+            if stagnation and col.converged_at and it + 1 - col.converged_at >= stagnation:
+                res.stagnated = True
+                break
+
+        if col.best_rows:
+            res.path, res.cost = g.path_ids(col.best_rows), col.best_cost
+        res.converged_at = col.converged_at
+        res.elapsed_ms = (time.perf_counter() - t0) * 1e3
+        return res
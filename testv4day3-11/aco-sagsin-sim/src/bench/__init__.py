@@ -0,0 +1 @@
+"""Offline micro-benchmarks. Run modules with ``python -m src.bench.<name>``."""
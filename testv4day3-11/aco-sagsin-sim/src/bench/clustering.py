@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import List
+
+import numpy as np
+from sklearn.cluster import DBSCAN
+
+from ..data.clustering import EARTH_RADIUS_KM, dbscan_cluster
+from ..types import Node
+
+
+def legacy_dbscan_cluster(nodes: List[Node], radius_km: float) -> List[Node]:
+    """The pre-vectorization implementation, kept here as the benchmark baseline."""
+    arr = np.array([[n.lat, n.lon, n.alt_m] for n in nodes], dtype=float)
+    if len(arr) == 0:
+        return []
+    latlon = np.radians(arr[:, :2])
+    eps = radius_km / EARTH_RADIUS_KM
+    labels = DBSCAN(eps=eps, min_samples=1, metric="haversine").fit(latlon).labels_
+    out: List[Node] = []
+    for lbl in np.unique(labels):
+        idxs = np.where(labels == lbl)[0]
+        group = arr[idxs]
+        lat = float(np.mean(group[:, 0]))
+        lon = float(np.mean(group[:, 1]))
+        alt = float(np.mean(group[:, 2]))
+        lon = ((lon + 180) % 360) - 180
+        kind = nodes[idxs[0]].kind
+        name = getattr(nodes[idxs[0]], "name", "") or f"{kind}-cluster-{int(lbl)}"
+        out.append(Node(id=-1, kind=kind, lat=lat, lon=lon, alt_m=alt, name=name))
+    return out
+
+
+def synthetic_records(n: int, seed: int = 0) -> List[Node]:
+    """CelesTrak/OpenSky-like mix: 40% sat, 50% air, 10% ground, with dense hot spots."""
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice(["sat", "air", "ground"], size=n, p=[0.4, 0.5, 0.1])
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    # airports/hubs: a third of the aircraft near a few hundred centres
+    hubs = rng.uniform([-60, -180], [60, 180], size=(300, 2))
+    air = np.nonzero(kinds == "air")[0]
+    near = air[: len(air) // 3]
+    pick = hubs[rng.integers(0, len(hubs), len(near))]
+    lat[near] = pick[:, 0] + rng.normal(0, 0.2, len(near))
+    lon[near] = pick[:, 1] + rng.normal(0, 0.2, len(near))
+    alt = np.where(kinds == "sat", 550e3, np.where(kinds == "air", 10e3, 0.0))
+    return [Node(id=-1, kind=str(k), lat=float(a), lon=float(o), alt_m=float(h)) for k, a, o, h in zip(kinds, lat, lon, alt)]
+
+
+def _time(fn, *args) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, len(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="clustering: legacy DBSCAN vs per-kind BallTree components")
+    ap.add_argument("--sizes", default="5000,20000,100000,200000")
+    ap.add_argument("--radius-km", type=float, default=20.0)
+    ap.add_argument("--legacy-max", type=int, default=20000, help="skip the O(n x clusters) baseline above this")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    results = []
+    for n in (int(x) for x in args.sizes.split(",")):
+        nodes = synthetic_records(n, args.seed)
+        row: dict = {"n": n, "radius_km": args.radius_km}
+        row["new_s"], row["new_clusters"] = _time(dbscan_cluster, nodes, args.radius_km)
+        if n <= args.legacy_max:
+            row["legacy_s"], row["legacy_clusters"] = _time(legacy_dbscan_cluster, nodes, args.radius_km)
+        results.append(row)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
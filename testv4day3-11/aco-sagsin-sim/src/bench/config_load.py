@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from .. import config as config_mod
+from ..aco.solver import ACO
+from ..net.graph import build_graph
+from ..types import Node
+
+
+def _time_per_call(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def _calls_per_route() -> int:
+    """Count load_config() calls made while building a toy graph and solving one route."""
+    calls = 0
+    orig = config_mod.load_config
+
+    def counting(path: str = "config.yaml"):
+        nonlocal calls
+        calls += 1
+        return orig(path)
+
+    from ..aco import solver as solver_mod
+    from ..net import graph as graph_mod
+
+    # objective.compute_edge_costs imports load_config lazily from the module, so
+    # patching config_mod covers it
+    patched = [(config_mod, "load_config"), (solver_mod, "load_config"), (graph_mod, "load_config")]
+    saved = [(m, a, getattr(m, a)) for m, a in patched]
+    try:
+        for m, a in patched:
+            setattr(m, a, counting)
+        nodes = [Node(id=i, kind="ground", lat=0.0, lon=0.2 * i, alt_m=0.0) for i in range(3)]
+        gs = build_graph(nodes)
+        ACO(gs).solve(0, 2)
+    finally:
+        for m, a, v in saved:
+            setattr(m, a, v)
+    return calls
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="load_config() cold vs memoized cost")
+    ap.add_argument("--n", type=int, default=200)
+    args = ap.parse_args()
+
+    config_mod.invalidate_config()
+    cold_us = _time_per_call(lambda: config_mod._read_config("config.yaml"), args.n)
+    config_mod.load_config()
+    warm_us = _time_per_call(config_mod.load_config, args.n)
+    calls = _calls_per_route()
+    print(
+        json.dumps(
+            {
+                "cold_us": round(cold_us, 2),
+                "cached_us": round(warm_us, 2),
+                "calls_per_route": calls,
+                "route_overhead_before_us": round(cold_us * calls, 2),
+                "route_overhead_after_us": round(warm_us * calls, 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
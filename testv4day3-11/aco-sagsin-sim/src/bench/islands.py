@@ -0,0 +1,110 @@
+"""Island-model ACO scaling: wall time and optimality gap vs. number of islands."""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence
+
+from ..aco.islands import IslandACO
+from ..aco.objective import compute_edge_costs
+from ..aco.solver import ACO
+from ..config import load_config
+from ..net.graph import build_graph
+from .quality import _pct, reachable_pairs
+from .routing import _git_commit
+from .topology import synthetic_nodes
+
+
+def _summary(name: str, gaps: List[float], wall_ms: List[float], n: int) -> Dict:
+    found = [g for g in gaps if math.isfinite(g)]
+    return {
+        "solver": name,
+        "success_rate": round(len(found) / max(n, 1), 4),
+        "gap_mean": round(sum(found) / len(found), 4) if found else None,
+        "gap_p50": _pct(found, 50),
+        "wall_ms_p50": _pct(wall_ms, 50),
+        "wall_ms_mean": round(sum(wall_ms) / max(len(wall_ms), 1), 2),
+    }
+
+
+def bench_islands(n: int, seed: int, pairs: int, islands: Sequence[int], ants: Optional[int] = None,
+                  iters: Optional[int] = None, stagnation: Optional[int] = None) -> Dict:
+    """Baseline ``ACO`` and ``IslandACO`` with each island count on the same reachable pairs.
+
+    Total ants per iteration are held equal (split across islands), so a
+    speedup is parallelism rather than a smaller search.
+    """
+    nodes = synthetic_nodes(n, seed)
+    gs = build_graph(nodes)
+    chosen = reachable_pairs(gs, nodes, pairs, seed, compute_edge_costs(gs))
+    rows = []
+
+    gaps, wall = [], []
+    for p, (s, d, _path, opt) in enumerate(chosen):
+        aco = ACO(gs)
+        aco.cfg = replace(aco.cfg, ants=ants or aco.cfg.ants, iters=iters or aco.cfg.iters)
+        res = aco.run(s, d, stagnation=stagnation, seed=seed * 1_000_003 + p)
+        wall.append(res.elapsed_ms)
+        gaps.append(res.cost / opt - 1.0 if res.path and opt > 0 else math.inf)
+    rows.append(_summary("aco", gaps, wall, len(chosen)))
+
+    for k in islands:
+        solver = IslandACO(gs, islands=k)
+        solver.cfg = replace(solver.cfg, ants=ants or solver.cfg.ants, iters=iters or solver.cfg.iters)
+        gaps, wall = [], []
+        for p, (s, d, _path, opt) in enumerate(chosen):
+            res = solver.run(s, d, stagnation=stagnation, seed=seed * 1_000_003 + p)
+            wall.append(res.elapsed_ms)
+            gaps.append(res.cost / opt - 1.0 if res.path and opt > 0 else math.inf)
+        rows.append(dict(_summary(f"islands={k}", gaps, wall, len(chosen)), islands=k))
+        print(f"[islands] n={n} k={k} done", file=sys.stderr, flush=True)
+
+    base = next((r for r in rows if r.get("islands") == 1), None)
+    for r in rows:
+        if base and r.get("islands") and r["wall_ms_p50"]:
+            r["speedup_vs_1"] = round(base["wall_ms_p50"] / r["wall_ms_p50"], 2)
+    return {"nodes": n, "links": len(gs.links), "pairs": len(chosen), "solvers": rows}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Island-model ACO wall time and quality vs. island count")
+    ap.add_argument("--sizes", default="1000,2000")
+    ap.add_argument("--islands", default="1,2,4", help="comma-separated island counts")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--pairs", type=int, default=5)
+    ap.add_argument("--ants", type=int, help="total ants per iteration (split across islands)")
+    ap.add_argument("--iters", type=int)
+    ap.add_argument("--stagnation", type=int, help="override aco.stagnation_iters")
+    ap.add_argument("--out", help="also write the JSON report to this path")
+    args = ap.parse_args()
+
+    cfg = load_config()
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "aco": {"ants": args.ants or cfg.aco.ants, "iters": args.iters or cfg.aco.iters},
+            "exchange_every": cfg.aco.exchange_every,
+            "island_blend": cfg.aco.island_blend,
+        },
+        "results": [],
+    }
+    ks = [int(k) for k in args.islands.split(",") if k.strip()]
+    for n in (int(s) for s in args.sizes.split(",") if s.strip()):
+        report["results"].append(bench_islands(n, args.seed, args.pairs, ks, args.ants, args.iters, args.stagnation))
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
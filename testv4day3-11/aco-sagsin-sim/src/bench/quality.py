@@ -0,0 +1,264 @@
+"""ACO solution quality vs. time against the exact Dijkstra optimum."""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..aco import jit
+from ..aco.objective import compute_edge_costs
+from ..aco.solver import ACO
+from ..config import load_config
+from ..net.graph import build_graph
+from ..net.shortest import shortest_path
+from ..types import GraphState, Node
+from .routing import _git_commit
+from .topology import route_pairs, synthetic_nodes
+
+# a cheap setting, the config.yaml values and the original defaults
+DEFAULT_VARIANTS = "8x10,18x35,30x60"
+DEFAULT_NODES = 300
+
+# ant construction presets for --modes (AcoParams overrides)
+_PLAIN = {"goal": "none", "bidirectional": False, "backtracks": 0}
+MODES: Dict[str, Dict] = {
+    "plain": _PLAIN,
+    "goal": dict(_PLAIN, goal="dijkstra"),
+    "geo": dict(_PLAIN, goal="geo"),
+    "bidir": dict(_PLAIN, bidirectional=True),
+    "goal+bidir": dict(_PLAIN, goal="dijkstra", bidirectional=True),
+    "backtrack": dict(_PLAIN, backtracks=8),
+}
+
+
+def parse_variants(spec: str) -> List[Tuple[int, int]]:
+    """``"18x35,30x60"`` -> [(ants, iters), ...]."""
+    out = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        a, _, i = part.strip().lower().partition("x")
+        out.append((int(a), int(i)))
+    return out
+
+
+def _pct(xs: Sequence[float], q: float) -> Optional[float]:
+    return round(float(np.percentile(xs, q)), 4) if len(xs) else None
+
+
+def reachable_pairs(gs: GraphState, nodes, k: int, seed: int,
+                    costs: Dict[Tuple[int, int], float]) -> List[Tuple[int, int, List[int], float]]:
+    """Up to ``k`` seeded surface pairs that have a path, with their optimal (path, cost)."""
+    out = []
+    seen = set()
+    for s, d in route_pairs(nodes, 20 * k, seed):
+        if (s, d) in seen:
+            continue
+        seen.add((s, d))
+        path, cost = shortest_path(gs, s, d, costs)
+        if path:
+            out.append((s, d, path, cost))
+            if len(out) == k:
+                break
+    return out
+
+
+def run_variant(gs: GraphState, pairs, ants: int, iters: int, seed: int,
+                stagnation: Optional[int] = None, deadline_ms: Optional[float] = None,
+                candidates: Optional[int] = None, mode: Optional[str] = None,
+                backend: Optional[str] = None) -> Dict:
+    """Solve every pair with a fresh colony; gap, fallback rate, latency and the anytime curve.
+
+    ``stagnation``/``deadline_ms`` are passed to ``ACO.run``; ``candidates``,
+    ``mode`` (a ``MODES`` key) and ``backend`` override the configured colony.
+    """
+    gaps: List[float] = []
+    lat_ms: List[float] = []
+    ran: List[int] = []
+    exact = truncated = 0
+    # curve_gap[p][i]: gap of pair p's best-so-far after iteration i (inf while not found)
+    curve_gap = np.full((len(pairs), iters), np.inf)
+    curve_ms = np.zeros((len(pairs), iters))
+    for p, (s, d, _opt_path, opt) in enumerate(pairs):
+        aco = ACO(gs)
+        aco.cfg = replace(aco.cfg, ants=ants, iters=iters)
+        if candidates is not None:
+            aco.cfg = replace(aco.cfg, candidates=candidates)
+        if mode is not None:
+            aco.cfg = replace(aco.cfg, **MODES[mode])
+        if backend is not None:
+            aco.cfg = replace(aco.cfg, backend=backend)
+        t0 = time.perf_counter()
+
+        def record(i: int, best: float) -> None:
+            curve_ms[p, i] = (time.perf_counter() - t0) * 1e3
+            curve_gap[p, i] = best / opt - 1.0 if opt > 0 else 0.0
+
+        res = aco.run(s, d, deadline_ms=deadline_ms, stagnation=stagnation, on_iteration=record,
+                      seed=seed * 1_000_003 + p)
+        lat_ms.append((time.perf_counter() - t0) * 1e3)
+        path, cost = res.path, res.cost
+        ran.append(res.iterations)
+        truncated += res.truncated
+        # a stopped run keeps its final best for the remaining iterations
+        curve_gap[p, res.iterations:] = curve_gap[p, res.iterations - 1] if res.iterations else np.inf
+        curve_ms[p, res.iterations:] = lat_ms[-1]
+        if path and math.isfinite(cost):
+            g = cost / opt - 1.0 if opt > 0 else 0.0
+            gaps.append(g)
+            exact += g <= 1e-9
+
+    n = len(pairs)
+    found = len(gaps)
+    curve = []
+    for i in range(iters):
+        col = curve_gap[:, i]
+        ok = col[np.isfinite(col)]
+        curve.append({
+            "iter": i + 1,
+            "ms_p50": _pct(curve_ms[:, i], 50),
+            "found": round(len(ok) / max(n, 1), 4),
+            "gap_p50": _pct(ok, 50),
+            "gap_mean": round(float(ok.mean()), 4) if len(ok) else None,
+        })
+    return {
+        "variant": f"{ants}x{iters}" + (f"/c{candidates}" if candidates else "") + (f"/{mode}" if mode else "")
+        + (f"/{backend}" if backend else ""),
+        "ants": ants,
+        "iters": iters,
+        "candidates": candidates,
+        "mode": mode,
+        "backend": backend,
+        "pairs": n,
+        "success_rate": round(found / max(n, 1), 4),
+        # /route falls back to BFS when the colony returns no path
+        "bfs_fallback_rate": round(1 - found / max(n, 1), 4),
+        "optimal_rate": round(exact / max(n, 1), 4),
+        "truncated_rate": round(truncated / max(n, 1), 4),
+        "iterations_p50": _pct(ran, 50),
+        "gap_mean": round(float(np.mean(gaps)), 4) if gaps else None,
+        "gap_p50": _pct(gaps, 50),
+        "gap_p90": _pct(gaps, 90),
+        "gap_max": round(max(gaps), 4) if gaps else None,
+        "latency_ms_p50": _pct(lat_ms, 50),
+        "latency_ms_p90": _pct(lat_ms, 90),
+        "latency_ms_p99": _pct(lat_ms, 99),
+        "anytime": curve,
+    }
+
+
+def bench_quality(n: int, seed: int, pairs: int, variants: Sequence[Tuple[int, int]],
+                  nodes=None, stagnation: Optional[int] = None,
+                  deadline_ms: Optional[float] = None,
+                  candidates: Sequence[Optional[int]] = (None,),
+                  modes: Sequence[Optional[str]] = (None,),
+                  backends: Sequence[Optional[str]] = (None,)) -> Dict:
+    nodes = nodes if nodes is not None else synthetic_nodes(n, seed)
+    gs = build_graph(nodes)
+    costs = compute_edge_costs(gs)
+    t0 = time.perf_counter()
+    chosen = reachable_pairs(gs, nodes, pairs, seed, costs)
+    dijkstra_ms = (time.perf_counter() - t0) * 1e3 / max(len(chosen), 1)
+    rows = [
+        run_variant(gs, chosen, a, i, seed, stagnation, deadline_ms, c, m, b)
+        for a, i in variants
+        for c in candidates
+        for m in modes
+        for b in backends
+    ]
+    # per-solve speedup of each backend over the Python walk with otherwise equal settings
+    base = {(r["ants"], r["iters"], r["candidates"], r["mode"]): r for r in rows if r["backend"] == "python"}
+    for r in rows:
+        ref = base.get((r["ants"], r["iters"], r["candidates"], r["mode"]))
+        if ref is not None and r["latency_ms_p50"]:
+            r["speedup_vs_python"] = round(ref["latency_ms_p50"] / r["latency_ms_p50"], 2)
+    return {
+        "nodes": len(nodes),
+        "links": len(gs.links),
+        "pairs": len(chosen),
+        "optimal_hops_p50": _pct([len(p) - 1 for _s, _d, p, _c in chosen], 50),
+        "dijkstra_ms_per_pair": round(dijkstra_ms, 3),
+        "variants": rows,
+    }
+
+
+def _load_nodes(path: str) -> List[Node]:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return [Node(**r) for r in raw]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="ACO optimality gap, fallback rate and anytime curves vs. Dijkstra")
+    ap.add_argument("--nodes", type=int, default=DEFAULT_NODES, help="synthetic population size")
+    ap.add_argument("--nodes-file", help="JSON list of nodes to use instead of a synthetic population")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--pairs", type=int, default=20, help="reachable src/dst pairs per variant")
+    ap.add_argument("--variants", default=DEFAULT_VARIANTS, help="comma-separated ANTSxITERS")
+    ap.add_argument("--stagnation", type=int, help="override aco.stagnation_iters (0 = run every iteration)")
+    ap.add_argument("--deadline-ms", type=float, help="per-solve wall-clock budget (0 = unbounded)")
+    ap.add_argument("--candidates", help="comma-separated candidate-list sizes to compare, 0 = full neighbourhood")
+    ap.add_argument("--backends", help=f"comma-separated ant walk backends: {', '.join(jit.BACKENDS)}")
+    ap.add_argument("--modes", help=f"comma-separated ant construction presets: {', '.join(MODES)}")
+    ap.add_argument("--out", help="also write the JSON report to this path")
+    args = ap.parse_args()
+
+    cfg = load_config()
+    nodes = _load_nodes(args.nodes_file) if args.nodes_file else None
+    t0 = time.perf_counter()
+    cands = [int(c) for c in args.candidates.split(",") if c.strip()] if args.candidates else [None]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()] if args.modes else [None]
+    unknown = [m for m in modes if m is not None and m not in MODES]
+    if unknown:
+        ap.error(f"unknown modes: {', '.join(unknown)}")
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()] if args.backends else [None]
+    unknown = [b for b in backends if b is not None and b not in jit.BACKENDS]
+    if unknown:
+        ap.error(f"unknown backends: {', '.join(unknown)}")
+    # compile (or load) the Numba kernels up front so the first solve is not charged for it
+    t_jit = time.perf_counter()
+    jit.warmup()
+    jit_ms = (time.perf_counter() - t_jit) * 1e3
+    result = bench_quality(args.nodes, args.seed, args.pairs, parse_variants(args.variants), nodes,
+                           args.stagnation, args.deadline_ms, cands, modes, backends)
+    print(f"[quality] done in {time.perf_counter() - t0:.1f}s", file=sys.stderr, flush=True)
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "configured": {
+                "ants": cfg.aco.ants,
+                "iters": cfg.aco.iters,
+                "stagnation_iters": cfg.aco.stagnation_iters,
+                "deadline_ms": cfg.aco.deadline_ms,
+                "candidates": cfg.aco.candidates,
+                "goal": cfg.aco.goal,
+                "bidirectional": cfg.aco.bidirectional,
+                "backtracks": cfg.aco.backtracks,
+                "backend": cfg.aco.backend,
+            },
+            "numba": jit.NUMBA_AVAILABLE,
+            "jit_warmup_ms": round(jit_ms, 1),
+            "stagnation": args.stagnation,
+            "deadline_ms": args.deadline_ms,
+            "weights": list(cfg.aco.weights),
+        },
+        "result": result,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Local repair of cached routes after link flips vs. re-solving them from scratch.
+
+Also reports how often a disjoint backup path, computed with each route,
+survives the flips that break the route (local failover without the controller).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..aco.csr import item_view
+from ..aco.disjoint import disjoint_paths
+from ..aco.objective import compute_edge_costs
+from ..aco.routes import RouteCache, pheromone_weight
+from ..aco.solver import ACO
+from ..config import load_config
+from ..net.graph import build_graph
+from ..net.shortest import shortest_path
+from ..net.updater import update_epoch
+from .quality import _pct, reachable_pairs
+from .routing import _git_commit
+from .topology import synthetic_nodes
+
+
+def _alive(gs, path: List[int]) -> bool:
+    return all(gs.links[gs.edge_index[(u, v)]].enabled for u, v in zip(path, path[1:]))
+
+
+def bench_repair(n: int, seed: int, pairs: int, epochs: int, pheromone: float,
+                 ants: Optional[int] = None, iters: Optional[int] = None,
+                 backups: int = 1, disjoint: str = "link") -> Dict:
+    """Cache ``pairs`` solved routes, then flip links for ``epochs`` ticks.
+
+    Each route hit by a flip is repaired, and also re-solved by a fresh colony
+    for comparison. Gaps are against the exact optimum on the flipped graph.
+    ``backups`` disjoint paths are computed with each solve; a broken route
+    counts as failed over when one of them is still intact.
+    """
+    nodes = synthetic_nodes(n, seed)
+    gs = build_graph(nodes)
+    costs = compute_edge_costs(gs)
+    chosen = reachable_pairs(gs, nodes, pairs, seed, costs)
+    cfg = load_config().aco
+    cache = RouteCache(capacity=max(pairs, 1), pheromone=pheromone, tau0=cfg.tau0)
+
+    def solver() -> ACO:
+        aco = ACO(gs)
+        aco.cfg = replace(aco.cfg, ants=ants or aco.cfg.ants, iters=iters or aco.cfg.iters)
+        return aco
+
+    solve_ms: List[float] = []
+    backup_ms: List[float] = []
+    spare: Dict = {}
+    for p, (s, d, _path, _opt) in enumerate(chosen):
+        aco = solver()
+        res = aco.run(s, d, seed=seed * 1_000_003 + p)
+        solve_ms.append(res.elapsed_ms)
+        cache.put((s, d), res.path, res.cost, aco.graph, aco.tau)
+        if backups and res.path:
+            t0 = time.perf_counter()
+            w = pheromone_weight(aco.graph, aco.tau, cfg.tau0, pheromone)
+            spare[(s, d)] = [b for b, _c in disjoint_paths(
+                aco.graph, s, d, backups, nodes=disjoint == "node", weight=None if w is None else item_view(w[0]),
+                avoid=res.path, gs=gs, floor=1.0 if w is None else w[1])]
+            backup_ms.append((time.perf_counter() - t0) * 1e3)
+
+    rng = np.random.default_rng(seed)
+    repair_ms: List[float] = []
+    resolve_ms: List[float] = []
+    repair_gap: List[float] = []
+    resolve_gap: List[float] = []
+    with_backup = sum(1 for b in spare.values() if b)
+    affected = dropped = lost = first_breaks = failed_over = 0
+    for e in range(epochs):
+        update_epoch(gs, rng)
+        # each route's backups cover its first break only
+        broken = [k for k in spare if not _alive(gs, cache.get(k).path)]
+        first_breaks += len(broken)
+        failed_over += sum(any(_alive(gs, b) for b in spare.pop(k)) for k in broken)
+        rep = cache.links_down(gs, gs.last_flips)
+        affected += rep.affected
+        dropped += rep.dropped
+        if rep.affected:
+            repair_ms.append(rep.ms / rep.affected)
+        for (s, d), _old, new in rep.changes:
+            _p, opt = shortest_path(gs, s, d, costs)
+            aco = solver()
+            res = aco.run(s, d, seed=seed * 7_919 + e)
+            resolve_ms.append(res.elapsed_ms)
+            if opt > 0 and math.isfinite(opt):
+                repair_gap.append(new / opt - 1.0)
+                if res.path:
+                    resolve_gap.append(res.cost / opt - 1.0)
+                else:
+                    lost += 1
+        print(f"[repair] n={n} epoch {e + 1}/{epochs}: {rep.affected} affected", file=sys.stderr, flush=True)
+
+    out = {
+        "nodes": n,
+        "links": len(gs.links),
+        "routes": len(chosen),
+        "epochs": epochs,
+        "affected": affected,
+        "repaired": affected - dropped,
+        "dropped": dropped,
+        "initial_solve_ms_p50": _pct(solve_ms, 50),
+        "repair_ms_per_route_p50": _pct(repair_ms, 50),
+        "repair_ms_per_route_max": round(max(repair_ms), 3) if repair_ms else None,
+        "resolve_ms_p50": _pct(resolve_ms, 50),
+        "repair_gap_mean": round(float(np.mean(repair_gap)), 4) if repair_gap else None,
+        "repair_gap_p90": _pct(repair_gap, 90),
+        "resolve_gap_mean": round(float(np.mean(resolve_gap)), 4) if resolve_gap else None,
+        # re-solves that found no path where the repair did
+        "resolve_failed": lost,
+        "backups": backups,
+        "backup_ms_p50": _pct(backup_ms, 50),
+        "routes_with_backup": with_backup,
+        "first_breaks": first_breaks,
+        # first breaks of a route where one of its backups was still intact
+        "failover_ok": failed_over,
+    }
+    if out["repair_ms_per_route_p50"] and out["resolve_ms_p50"]:
+        out["speedup_vs_resolve"] = round(out["resolve_ms_p50"] / out["repair_ms_per_route_p50"], 1)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Cached-route repair after link flips vs. full re-solve")
+    ap.add_argument("--sizes", default="300,1000")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--pairs", type=int, default=20, help="cached routes")
+    ap.add_argument("--epochs", type=int, default=5, help="update_epoch ticks (5%% of links flip each)")
+    ap.add_argument("--pheromone", type=float, help="override aco.repair_pheromone")
+    ap.add_argument("--backups", type=int, default=1, help="disjoint backup paths per route")
+    ap.add_argument("--disjoint", choices=("link", "node"), default="link")
+    ap.add_argument("--ants", type=int)
+    ap.add_argument("--iters", type=int)
+    ap.add_argument("--out", help="also write the JSON report to this path")
+    args = ap.parse_args()
+
+    cfg = load_config()
+    pheromone = cfg.aco.repair_pheromone if args.pheromone is None else args.pheromone
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "aco": {"ants": args.ants or cfg.aco.ants, "iters": args.iters or cfg.aco.iters,
+                    "backend": cfg.aco.backend, "goal": cfg.aco.goal},
+            "repair_pheromone": pheromone,
+        },
+        "results": [
+            bench_repair(int(n), args.seed, args.pairs, args.epochs, pheromone, args.ants, args.iters,
+                         args.backups, args.disjoint)
+            for n in args.sizes.split(",") if n.strip()
+        ],
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..aco.objective import compute_edge_costs
+from ..aco.solver import ACO
+from ..config import load_config
+from ..net.graph import build_graph
+from ..types import GraphState
+from .topology import route_pairs, synthetic_nodes
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 50_000)
+# ACO solves are skipped above this many nodes unless --max-solve-nodes is raised
+MAX_SOLVE_NODES = 1_000
+# keys compared by --compare (lower is better)
+TIMING_KEYS = ("build_graph_s", "edge_costs_s", "solve_ms_p50", "solve_ms_max", "batch_ms_per_route", "peak_mb")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 / (1024 * 1024) if sys.platform == "darwin" else 1 / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _reachable(gs: GraphState, src: int, dst: int) -> bool:
+    seen = {src}
+    dq = deque([src])
+    while dq:
+        u = dq.popleft()
+        if u == dst:
+            return True
+        for v in gs.adj.get(u, []):
+            idx = gs.edge_index.get((u, v))
+            if v not in seen and idx is not None and gs.links[idx].enabled:
+                seen.add(v)
+                dq.append(v)
+    return False
+
+
+def _solver(gs: GraphState, ants: Optional[int], iters: Optional[int], seed: int) -> ACO:
+    # a seeded generator per solver makes every run's seed, and so the whole stage, replayable
+    aco = ACO(gs, rng=np.random.default_rng(seed))
+    if ants or iters:
+        aco.cfg = replace(aco.cfg, ants=ants or aco.cfg.ants, iters=iters or aco.cfg.iters)
+    return aco
+
+
+def _best_of(fn, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def bench_size(n: int, seed: int, pairs: int, repeat: int, trace_memory: bool,
+               max_solve_nodes: int = MAX_SOLVE_NODES, ants: Optional[int] = None,
+               iters: Optional[int] = None) -> Dict:
+    nodes = synthetic_nodes(n, seed)
+    if trace_memory:
+        tracemalloc.start()
+    build_s, gs = _best_of(lambda: build_graph(nodes), repeat if n < 10_000 else 1)
+    costs_s, _ = _best_of(lambda: compute_edge_costs(gs), repeat)
+
+    out: Dict = {
+        "nodes": n,
+        "links": len(gs.links),
+        "mean_degree": round(2 * len(gs.links) / max(n, 1), 2),
+        "build_graph_s": round(build_s, 4),
+        "edge_costs_s": round(costs_s, 4),
+    }
+    route = route_pairs(nodes, pairs, seed)
+    out["routes"] = len(route)
+    out["routes_reachable"] = sum(_reachable(gs, s, d) for s, d in route)
+    if n > max_solve_nodes:
+        out["solve_skipped"] = True
+    else:
+        solve_ms: List[float] = []
+        found = 0
+        for s, d in route:
+            aco = _solver(gs, ants, iters, seed)
+            t0 = time.perf_counter()
+            path, _cost = aco.solve(s, d)
+            solve_ms.append((time.perf_counter() - t0) * 1e3)
+            found += bool(path)
+
+        # batch: one solver instance (costs and pheromone shared) answering every pair
+        aco = _solver(gs, ants, iters, seed)
+        t0 = time.perf_counter()
+        for s, d in route:
+            aco.solve(s, d)
+        batch_ms = (time.perf_counter() - t0) * 1e3
+        out.update({
+            "routes_found": found,
+            "solve_ms_p50": round(statistics.median(solve_ms), 2) if solve_ms else None,
+            "solve_ms_max": round(max(solve_ms), 2) if solve_ms else None,
+            "batch_ms_per_route": round(batch_ms / max(len(route), 1), 2),
+        })
+
+    if trace_memory:
+        out["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+        tracemalloc.stop()
+    else:
+        out["peak_mb"] = round(_peak_rss_mb(), 1)
+    out["peak_kind"] = "tracemalloc" if trace_memory else "rss"
+    return out
+
+
+def compare(current: Dict, baseline: Dict) -> List[Dict]:
+    """Per-size ratios current/baseline for the timing keys (>1 means slower)."""
+    base = {r["nodes"]: r for r in baseline.get("results", [])}
+    out = []
+    for r in current.get("results", []):
+        b = base.get(r["nodes"])
+        if not b:
+            continue
+        row = {"nodes": r["nodes"]}
+        for k in TIMING_KEYS:
+            if r.get(k) is not None and b.get(k):
+                row[k] = round(r[k] / b[k], 3)
+        out.append(row)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Graph build / edge cost / ACO routing scaling on synthetic topologies")
+    ap.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--pairs", type=int, default=5, help="routes solved per size")
+    ap.add_argument("--repeat", type=int, default=3, help="best-of repeats for the cheaper stages")
+    ap.add_argument("--max-solve-nodes", type=int, default=MAX_SOLVE_NODES,
+                    help="skip ACO solves for larger sizes (build and cost stages still run)")
+    ap.add_argument("--ants", type=int, help="override aco.ants for the solve stages")
+    ap.add_argument("--iters", type=int, help="override aco.iters for the solve stages")
+    ap.add_argument("--tracemalloc", action="store_true", help="report Python heap peak instead of process RSS")
+    ap.add_argument("--out", help="also write the JSON report to this path")
+    ap.add_argument("--compare", help="baseline JSON report to compute ratios against")
+    args = ap.parse_args()
+
+    cfg = load_config()
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "aco": {"ants": args.ants or cfg.aco.ants, "iters": args.iters or cfg.aco.iters},
+            "max_range_km": cfg.max_range_km,
+            "elevation_min_deg": cfg.elevation_min_deg,
+        },
+        "results": [],
+    }
+    for n in (int(s) for s in args.sizes.split(",") if s.strip()):
+        t0 = time.perf_counter()
+        report["results"].append(bench_size(
+            n, args.seed, args.pairs, args.repeat, args.tracemalloc, args.max_solve_nodes, args.ants, args.iters
+        ))
+        # progress on stderr keeps stdout pure JSON
+        print(f"[bench] {n} nodes done in {time.perf_counter() - t0:.1f}s", file=sys.stderr, flush=True)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["compare"] = compare(report, json.load(f))
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
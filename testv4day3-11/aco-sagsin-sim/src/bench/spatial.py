@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from ..net.geometry import Geometry
+from ..net.spatial import SpatialIndex
+
+
+def synthetic_geometry(n: int, seed: int = 0) -> Geometry:
+    """``n`` nodes spread uniformly over +-80 deg latitude, kinds drawn evenly."""
+    rng = np.random.default_rng(seed)
+    kinds = np.array(["sat", "air", "ground", "sea"])[rng.integers(0, 4, n)]
+    return Geometry(np.arange(n), rng.uniform(-80, 80, n), rng.uniform(-180, 180, n), np.zeros(n),
+                    kinds.tolist())
+
+
+def _per_query_us(fn: Callable[[int], object], queries: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(queries):
+        fn(i)
+    return (time.perf_counter() - t0) / queries * 1e6
+
+
+def _brute_nearest(geo: Geometry, lat: float, lon: float, k: int) -> np.ndarray:
+    q = Geometry(np.array([0]), np.array([lat]), np.array([lon]), np.zeros(1))
+    chord = np.linalg.norm(geo.unit - q.unit[0], axis=1)
+    return np.argsort(chord)[:k]
+
+
+def bench_size(n: int, queries: int, k: int, radius_km: float, seed: int) -> Dict[str, float]:
+    geo = synthetic_geometry(n, seed)
+    t0 = time.perf_counter()
+    idx = SpatialIndex(geo)
+    idx.nearest(0.0, 0.0, k=k)  # trees are built lazily
+    build_ms = (time.perf_counter() - t0) * 1e3
+    return {
+        "nodes": n,
+        "build_ms": round(build_ms, 2),
+        "nearest_us": round(_per_query_us(lambda i: idx.nearest(i % 60, i % 360 - 180, k=k), queries), 1),
+        "within_us": round(_per_query_us(lambda i: idx.within(i % 60, i % 360 - 180, radius_km), queries), 1),
+        "within_sat_us": round(
+            _per_query_us(lambda i: idx.within(i % 60, i % 360 - 180, radius_km, kind="sat"), queries), 1
+        ),
+        "bbox_us": round(_per_query_us(lambda i: idx.bbox(i % 60 - 5, i % 60 + 5, i % 350 - 175, i % 350 - 165),
+                                       queries), 1),
+        "brute_nearest_us": round(_per_query_us(lambda i: _brute_nearest(geo, i % 60, i % 360 - 180, k), queries),
+                                  1),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="KD-tree node queries vs. a brute-force scan")
+    ap.add_argument("--sizes", default="1000,10000,50000")
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--radius-km", type=float, default=800.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rows: List[Dict[str, float]] = [
+        bench_size(int(n), args.queries, args.k, args.radius_km, args.seed) for n in args.sizes.split(",")
+    ]
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Seeded synthetic SAGSIN populations for offline benchmarks."""
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+from ..types import Node
+
+# (lat, lon) of ground hubs; ground stations cluster around them and air
+# corridors connect them
+HUBS: List[Tuple[float, float]] = [
+    (21.0, 105.8), (10.8, 106.7), (35.7, 139.7), (37.6, 127.0), (31.2, 121.5),
+    (22.3, 114.2), (1.35, 103.8), (13.8, 100.5), (28.6, 77.2), (19.1, 72.9),
+    (25.2, 55.3), (41.0, 29.0), (51.5, -0.1), (48.9, 2.35), (52.5, 13.4),
+    (40.7, -74.0), (34.1, -118.2), (19.4, -99.1), (-23.5, -46.6), (-33.9, 151.2),
+]
+
+# share of the non-satellite population per kind
+SURFACE_MIX = {"ground": 0.5, "air": 0.35, "sea": 0.15}
+MAX_SATS = 1200
+
+
+def _norm_lon(lon: np.ndarray) -> np.ndarray:
+    return ((lon + 180.0) % 360.0) - 180.0
+
+
+def walker_shell(n: int, inc_deg: float, alt_m: float, phase: float, rng: np.random.Generator) -> np.ndarray:
+    """Sub-satellite (lat, lon, alt_m) of an ``n``-satellite Walker-delta-like shell at a random epoch."""
+    if n <= 0:
+        return np.empty((0, 3))
+    planes = max(1, int(round(np.sqrt(n))))
+    per = int(np.ceil(n / planes))
+    p, s = np.divmod(np.arange(n), per)
+    raan = 360.0 * p / planes
+    u = 360.0 * s / per + phase * 360.0 * p / max(n, 1) + rng.uniform(0, 360)
+    inc, u_r = np.radians(inc_deg), np.radians(u)
+    lat = np.degrees(np.arcsin(np.sin(inc) * np.sin(u_r)))
+    lon = _norm_lon(raan + np.degrees(np.arctan2(np.cos(inc) * np.sin(u_r), np.cos(u_r))))
+    return np.column_stack((lat, lon, np.full(n, alt_m)))
+
+
+def _great_circle_points(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Points at fractions ``t`` along the great circles from ``a`` to ``b`` (rows of lat/lon deg)."""
+    def unit(ll):
+        la, lo = np.radians(ll[:, 0]), np.radians(ll[:, 1])
+        return np.column_stack((np.cos(la) * np.cos(lo), np.cos(la) * np.sin(lo), np.sin(la)))
+
+    ua, ub = unit(a), unit(b)
+    omega = np.arccos(np.clip(np.einsum("ij,ij->i", ua, ub), -1.0, 1.0))
+    so = np.where(omega > 1e-9, np.sin(omega), 1.0)
+    wa = np.where(omega > 1e-9, np.sin((1 - t) * omega) / so, 1 - t)
+    wb = np.where(omega > 1e-9, np.sin(t * omega) / so, t)
+    p = ua * wa[:, None] + ub * wb[:, None]
+    p /= np.linalg.norm(p, axis=1)[:, None]
+    return np.degrees(np.arcsin(p[:, 2])), np.degrees(np.arctan2(p[:, 1], p[:, 0]))
+
+
+def synthetic_nodes(n: int, seed: int = 0) -> List[Node]:
+    """A reproducible population of ``n`` nodes: satellite shells plus ground/air/sea.
+
+    Satellites grow sub-linearly (30% of n, capped at ``MAX_SATS``) the way
+    real constellations do; ground stations cluster around ``HUBS``, aircraft
+    fly the great-circle corridors between hubs at cruise altitude, and sea
+    nodes are scattered over low/mid latitudes. Ids are 0..n-1 in
+    sat, ground, air, sea order.
+    """
+    rng = np.random.default_rng(seed)
+    n_sat = min(int(0.3 * n), MAX_SATS)
+    rest = n - n_sat
+    n_ground = int(round(rest * SURFACE_MIX["ground"]))
+    n_air = int(round(rest * SURFACE_MIX["air"]))
+    n_sea = rest - n_ground - n_air
+
+    n_polar = n_sat // 4
+    sats = np.vstack((
+        walker_shell(n_sat - n_polar, 53.0, 550_000.0, 1.0, rng),
+        walker_shell(n_polar, 97.6, 1_200_000.0, 0.5, rng),
+    ))
+
+    hubs = np.asarray(HUBS)
+    h = rng.integers(0, len(hubs), n_ground)
+    ground = np.column_stack((
+        np.clip(hubs[h, 0] + rng.normal(0, 4.0, n_ground), -85, 85),
+        _norm_lon(hubs[h, 1] + rng.normal(0, 5.0, n_ground)),
+        np.zeros(n_ground),
+    ))
+
+    a = rng.integers(0, len(hubs), n_air)
+    b = (a + rng.integers(1, len(hubs), n_air)) % len(hubs)
+    lat, lon = _great_circle_points(hubs[a], hubs[b], rng.uniform(0, 1, n_air))
+    air = np.column_stack((lat, _norm_lon(lon), rng.uniform(9_000, 12_000, n_air)))
+
+    sea = np.column_stack((rng.uniform(-55, 55, n_sea), rng.uniform(-180, 180, n_sea), np.zeros(n_sea)))
+
+    out: List[Node] = []
+    for kind, block in (("sat", sats), ("ground", ground), ("air", air), ("sea", sea)):
+        for lat_, lon_, alt_ in block.tolist():
+            i = len(out)
+            out.append(Node(id=i, kind=kind, lat=lat_, lon=lon_, alt_m=alt_, name=f"{kind}-{i}"))
+    return out
+
+
+def route_pairs(nodes: List[Node], k: int, seed: int = 0) -> List[Tuple[int, int]]:
+    """``k`` seeded (src, dst) pairs between surface nodes (ground/sea), src != dst."""
+    rng = np.random.default_rng(seed + 1)
+    surface = [x.id for x in nodes if x.kind in ("ground", "sea")] or [x.id for x in nodes]
+    if len(surface) < 2:
+        return []
+    out: List[Tuple[int, int]] = []
+    while len(out) < k:
+        s, d = rng.choice(surface, 2, replace=False).tolist()
+        out.append((int(s), int(d)))
+    return out
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import yaml
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 
 
 def _to_bool(val: str | bool | None, default: bool) -> bool:
@@ -16,6 +17,12 @@ def _to_bool(val: str | bool | None, default: bool) -> bool:
     return str(val).lower() in {"1", "true", "yes", "on"}
 
 
+def _opt_int(val: str | int | None) -> Optional[int]:
+    if val is None or str(val).strip().lower() in {"", "none", "null"}:
+        return None
+    return int(val)
+
+
 @dataclass
 class AcoParams:
     ants: int
@@ -30,6 +37,34 @@ class AcoParams:
     tau_min: float
     tau_max: float
     weights: list[float]
+    # early termination: iterations without improvement (0 = run all iters)
+    stagnation_iters: int = 0
+    # default wall-clock budget per solve in ms (0 = unbounded)
+    deadline_ms: float = 0.0
+    # island model (src/aco/islands.py): colonies run in parallel processes, used by
+    # /route once the graph has at least island_min_nodes nodes (1 = single colony)
+    islands: int = 1
+    exchange_every: int = 5
+    island_blend: float = 0.25
+    island_min_nodes: int = 1000
+    # ants only score the k cheapest neighbours until all are visited (0 = full neighbourhood)
+    candidates: int = 0
+    # goal direction: "none", "dijkstra" (exact reverse shortest-path bound) or "geo" (straight line)
+    goal: str = "none"
+    # forward and backward ants that join where they meet
+    bidirectional: bool = False
+    # dead ends an ant may step back out of before it is discarded
+    backtracks: int = 0
+    # ant walk and pheromone updates: "python" or "numba" (src/aco/jit.py; Python if not installed)
+    backend: str = "python"
+    # solved routes kept for reuse and repaired locally when their links go down (0 = no cache)
+    route_cache: int = 256
+    # pheromone discount exponent for repair detours (0 = plain edge costs)
+    repair_pheromone: float = 0.5
+    # backup paths sent with each packet for node-local failover (0 = none), and whether
+    # they must avoid the route's links or also its intermediate nodes: "link" | "node"
+    backup_paths: int = 0
+    disjoint: str = "link"
 
 
 @dataclass
@@ -71,10 +106,69 @@ class Config:
     mongo_cache_collection: str = "cache"
     mongo_nodes_collection: str = "nodes"
     mongo_connect_timeout_sec: float = 5.0
+    # seed for the simulator (link flips) and synthesized nodes; None = fresh entropy per run
+    seed: Optional[int] = None
+    # poll OpenSky each epoch and track live aircraft (needs enable_air); off = seeded snapshot only
+    live_aircraft: bool = False
+
+
+# Process-wide memo of parsed configs keyed by path. Each entry remembers the
+# (mtime_ns, size) stamps of config.yaml and .env it was built from so edits on
+# disk are picked up without re-parsing on every call.
+_CACHE_LOCK = threading.Lock()
+_CACHE: Dict[str, Tuple[Tuple[Any, ...], Config]] = {}
+_DOTENV_PATH: Optional[str] = None
+
+
+def _stamp(path: Optional[str]) -> Tuple[int, int] | None:
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _dotenv_path() -> str:
+    global _DOTENV_PATH
+    if _DOTENV_PATH is None:
+        _DOTENV_PATH = find_dotenv()
+    return _DOTENV_PATH
 
 
 def load_config(path: str = "config.yaml") -> Config:
-    load_dotenv(override=True)
+    """Return the process-wide config, re-reading it only when the files change.
+
+    The returned object is shared between callers; treat it as read-only.
+    Environment overrides set after the first load are not seen until
+    ``invalidate_config()`` (or ``reload_config()``) is called.
+    """
+    key = (_stamp(path), _stamp(_dotenv_path()))
+    with _CACHE_LOCK:
+        hit = _CACHE.get(path)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+    config = _read_config(path)
+    with _CACHE_LOCK:
+        _CACHE[path] = (key, config)
+    return config
+
+
+def invalidate_config() -> None:
+    global _DOTENV_PATH
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _DOTENV_PATH = None
+
+
+def reload_config(path: str = "config.yaml") -> Config:
+    invalidate_config()
+    return load_config(path)
+
+
+def _read_config(path: str) -> Config:
+    load_dotenv(_dotenv_path() or None, override=True)
     with open(path, "r", encoding="utf-8") as f:
         y: Dict[str, Any] = yaml.safe_load(f)
 
@@ -114,6 +208,21 @@ def load_config(path: str = "config.yaml") -> Config:
             weights=[float(x) for x in os.getenv("WEIGHTS", None).split(",")]
             if os.getenv("WEIGHTS")
             else aco.get("weights", [0.5, 0.2, 0.2, 0.1]),
+            stagnation_iters=int(os.getenv("STAGNATION_ITERS", aco.get("stagnation_iters", 0))),
+            deadline_ms=float(os.getenv("ACO_DEADLINE_MS", aco.get("deadline_ms", 0))),
+            islands=int(os.getenv("ACO_ISLANDS", aco.get("islands", 1))),
+            exchange_every=int(os.getenv("ACO_EXCHANGE_EVERY", aco.get("exchange_every", 5))),
+            island_blend=float(os.getenv("ACO_ISLAND_BLEND", aco.get("island_blend", 0.25))),
+            island_min_nodes=int(os.getenv("ACO_ISLAND_MIN_NODES", aco.get("island_min_nodes", 1000))),
+            candidates=int(os.getenv("ACO_CANDIDATES", aco.get("candidates", 0))),
+            goal=str(os.getenv("ACO_GOAL", aco.get("goal", "none"))).lower(),
+            bidirectional=_to_bool(os.getenv("ACO_BIDIRECTIONAL"), aco.get("bidirectional", False)),
+            backtracks=int(os.getenv("ACO_BACKTRACKS", aco.get("backtracks", 0))),
+            backend=str(os.getenv("ACO_BACKEND", aco.get("backend", "python"))).lower(),
+            route_cache=int(os.getenv("ROUTE_CACHE", aco.get("route_cache", 256))),
+            repair_pheromone=float(os.getenv("ACO_REPAIR_PHEROMONE", aco.get("repair_pheromone", 0.5))),
+            backup_paths=int(os.getenv("ACO_BACKUP_PATHS", aco.get("backup_paths", 0))),
+            disjoint=str(os.getenv("ACO_DISJOINT", aco.get("disjoint", "link"))).lower(),
         ),
         link_model=LinkModelParams(
             freq_hz=float(os.getenv("FREQ_HZ", lm.get("freq_hz", 2.4e9))),
@@ -133,6 +242,8 @@ def load_config(path: str = "config.yaml") -> Config:
         mongo_cache_collection=os.getenv("MONGO_CACHE_COLLECTION", y.get("mongo_cache_collection", "cache")),
         mongo_nodes_collection=os.getenv("MONGO_NODES_COLLECTION", y.get("mongo_nodes_collection", "nodes")),
         mongo_connect_timeout_sec=float(os.getenv("MONGO_CONNECT_TIMEOUT_SEC", y.get("mongo_connect_timeout_sec", 5.0))),
+        seed=_opt_int(os.getenv("SEED", y.get("seed"))),
+        live_aircraft=_to_bool(os.getenv("LIVE_AIRCRAFT"), y.get("live_aircraft", False)),
     continent=(os.getenv("CONTINENT") or sel.get("continent")),
     node_limit=int(os.getenv("NODE_LIMIT", sel.get("node_limit", 0) or 0)),
     type_mix=sel.get("type_mix"),
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Collection, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..net.geometry import ecef_m
+from ..types import Node
+from .bounding import latlon_in_bbox
+from .selection import continent_bbox
+
+
+@dataclass
+class AircraftDelta:
+    """Node ids touched by one ``AircraftStore.apply`` call."""
+
+    added: List[int] = field(default_factory=list)
+    moved: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.moved or self.removed)
+
+
+def _norm_lon(lon: float) -> float:
+    return ((lon + 180) % 360) - 180
+
+
+def select_states(states: Iterable[list], cfg, tracked: Collection[str] = (),
+                  cap: Optional[int] = None) -> List[list]:
+    """State vectors the seeding rules keep: inside ``cfg.bbox`` and the continent box, at most ``cap``.
+
+    Aircraft in ``tracked`` are kept first, so the live set does not churn
+    between polls once the cap is reached.
+    """
+    boxes = [cfg.bbox]
+    if getattr(cfg, "continent", None):
+        boxes.append(continent_bbox(cfg.continent, cfg.bbox))
+    known: List[list] = []
+    new: List[list] = []
+    for st in states:
+        try:
+            lat, lon = float(st[6]), _norm_lon(float(st[5]))
+        except (IndexError, TypeError, ValueError):
+            continue
+        if all(latlon_in_bbox(lat, lon, b) for b in boxes):
+            (known if st[0] in tracked else new).append(st)
+    out = known + new
+    return out if cap is None else out[:cap]
+
+
+class AircraftStore:
+    """Live aircraft keyed by icao24, held in compact per-slot arrays.
+
+    Each aircraft owns a slot for as long as it is reported; its node id is
+    ``id_base + slot`` so it stays stable across polls. ``apply`` folds in one
+    OpenSky ``states`` snapshot and reports only what changed: new aircraft,
+    aircraft that moved more than ``min_move_m``, and aircraft not seen for
+    ``timeout_s``. Freed slots are reused on later polls.
+    """
+
+    def __init__(self, id_base: int = 0, timeout_s: float = 60.0, min_move_m: float = 100.0,
+                 capacity: int = 1024) -> None:
+        self.id_base = int(id_base)
+        self.timeout_s = float(timeout_s)
+        self.min_move_m = float(min_move_m)
+        self.slot: Dict[str, int] = {}
+        self.icao: List[Optional[str]] = []
+        self.callsign: List[str] = []
+        self.lat = np.zeros(capacity)
+        self.lon = np.zeros(capacity)
+        self.alt_m = np.zeros(capacity)
+        self.last_seen = np.zeros(capacity)
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.slot)
+
+    def _grow(self, need: int) -> None:
+        cap = len(self.lat)
+        if need <= cap:
+            return
+        new_cap = max(need, cap * 2)
+        for name in ("lat", "lon", "alt_m", "last_seen"):
+            arr = getattr(self, name)
+            grown = np.zeros(new_cap)
+            grown[:cap] = arr
+            setattr(self, name, grown)
+
+    def _take_slot(self, icao: str) -> int:
+        if self._free:
+            s = self._free.pop()
+            self.icao[s] = icao
+        else:
+            s = len(self.icao)
+            self._grow(s + 1)
+            self.icao.append(icao)
+            self.callsign.append("")
+        self.slot[icao] = s
+        return s
+
+    def node_id(self, icao: str) -> int:
+        return self.id_base + self.slot[icao]
+
+    def owns(self, node_id: int) -> bool:
+        s = int(node_id) - self.id_base
+        return 0 <= s < len(self.icao) and self.icao[s] is not None
+
+    def apply(self, states: Iterable[list], now: Optional[float] = None) -> AircraftDelta:
+        """Merge an OpenSky ``states`` list (state vectors) and return the delta."""
+        now = time.time() if now is None else float(now)
+        delta = AircraftDelta()
+        seen_slots: List[int] = []
+        lat_in: List[float] = []
+        lon_in: List[float] = []
+        alt_in: List[float] = []
+        fresh: List[bool] = []
+        for st in states:
+            try:
+                icao = st[0]
+                lat, lon = st[6], st[5]
+                if not icao or lat is None or lon is None:
+                    continue
+                alt = st[13] if len(st) > 13 and st[13] is not None else (st[7] if len(st) > 7 else None)
+                alt_m = float(alt) if alt is not None else 10000.0
+                lat, lon = float(lat), _norm_lon(float(lon))
+            except (IndexError, TypeError, ValueError):
+                continue
+            s = self.slot.get(icao)
+            if s is None:
+                s = self._take_slot(icao)
+                fresh.append(True)
+            else:
+                fresh.append(False)
+            self.callsign[s] = (st[1] or "").strip() if len(st) > 1 else ""
+            seen_slots.append(s)
+            lat_in.append(lat)
+            lon_in.append(lon)
+            alt_in.append(alt_m)
+
+        if seen_slots:
+            rows = np.asarray(seen_slots, dtype=np.intp)
+            new_lat, new_lon, new_alt = np.asarray(lat_in), np.asarray(lon_in), np.asarray(alt_in)
+            is_new = np.asarray(fresh, dtype=bool)
+            # displacement against the stored position, one vectorized pass
+            moved = np.linalg.norm(
+                ecef_m(new_lat, new_lon, new_alt) - ecef_m(self.lat[rows], self.lon[rows], self.alt_m[rows]),
+                axis=1,
+            ) > self.min_move_m
+            update = is_new | moved
+            self.lat[rows[update]] = new_lat[update]
+            self.lon[rows[update]] = new_lon[update]
+            self.alt_m[rows[update]] = new_alt[update]
+            self.last_seen[rows] = now
+            for s, a, m in zip(seen_slots, is_new.tolist(), moved.tolist()):
+                if a:
+                    delta.added.append(self.id_base + s)
+                elif m:
+                    delta.moved.append(self.id_base + s)
+
+        # expire after adding so a freed slot is never reused within one poll
+        live = np.fromiter(self.slot.values(), dtype=np.intp, count=len(self.slot))
+        expired = live[now - self.last_seen[live] > self.timeout_s]
+        for s in expired.tolist():
+            icao = self.icao[s]
+            del self.slot[icao]  # type: ignore[arg-type]
+            self.icao[s] = None
+            self._free.append(s)
+            delta.removed.append(self.id_base + s)
+        return delta
+
+    def node(self, node_id: int) -> Node:
+        s = int(node_id) - self.id_base
+        return Node(
+            id=int(node_id),
+            kind="air",
+            lat=float(self.lat[s]),
+            lon=float(self.lon[s]),
+            alt_m=float(self.alt_m[s]),
+            name=self.callsign[s] or str(self.icao[s]),
+        )
+
+    def nodes(self) -> List[Node]:
+        return [self.node(self.id_base + s) for s in sorted(self.slot.values())]
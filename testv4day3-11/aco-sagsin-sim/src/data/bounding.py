@@ -5,11 +5,12 @@ from typing import Iterable
 from ..types import Node
 
 
+def latlon_in_bbox(lat: float, lon: float, bbox: dict[str, float]) -> bool:
+    return bbox["min_lat"] <= lat <= bbox["max_lat"] and bbox["min_lon"] <= lon <= bbox["max_lon"]
+
+
 def in_bbox(n: Node, bbox: dict[str, float]) -> bool:
-    return (
-        bbox["min_lat"] <= n.lat <= bbox["max_lat"]
-        and bbox["min_lon"] <= n.lon <= bbox["max_lon"]
-    )
+    return latlon_in_bbox(n.lat, n.lon, bbox)
 
 
 def filter_bbox(nodes: Iterable[Node], bbox: dict[str, float]) -> list[Node]:
@@ -1,21 +1,165 @@
 from __future__ import annotations
 
+import gzip
 import json
 import os
+import tempfile
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Mapping, Optional, Tuple
 import logging
 
 from ..config import load_config
 
+try:
+    import zstandard as _zstd
+
+    ZSTD_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    _zstd = None  # type: ignore
+    ZSTD_AVAILABLE = False
+
 CACHE_DIR = Path("data/cache")
+MEM_ENTRIES = int(os.getenv("CACHE_MEM_ENTRIES", "32"))
+
+# Tiers, checked in order:
+#   1. in-process LRU of decoded payloads
+#   2. compressed payload file ``<name>.json.zst|.json.gz`` with a tiny sidecar
+#      ``<name>.meta.json`` ({"ts", "codec", ...}); expiry is decided from the
+#      sidecar alone, so stale payloads are never decompressed or parsed
+#   3. MongoDB (when enable_db), written in the background
+# The sidecar also keeps the upstream HTTP validators (ETag / Last-Modified),
+# so a 304 Not Modified only needs to bump ``ts`` (see ``touch_cache``).
+
+
+class _LRU:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._d: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            hit = self._d.get(name)
+            if hit is not None:
+                self._d.move_to_end(name)
+            return hit
+
+    def put(self, name: str, ts: float, payload: Any) -> None:
+        with self._lock:
+            self._d[name] = (ts, payload)
+            self._d.move_to_end(name)
+            while len(self._d) > self.maxsize:
+                self._d.popitem(last=False)
+
+    def pop(self, name: str) -> None:
+        with self._lock:
+            self._d.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._d.clear()
+
+
+_MEM = _LRU(MEM_ENTRIES)
+_DB_EXEC: Optional[ThreadPoolExecutor] = None
+_DB_LOCK = threading.Lock()
+_PENDING: list[Future] = []
+
+
+def _codec() -> str:
+    return "zstd" if ZSTD_AVAILABLE else "gzip"
+
+
+def _payload_path(name: str, codec: str) -> Path:
+    return CACHE_DIR / f"{name}.json.{'zst' if codec == 'zstd' else 'gz'}"
+
+
+def _meta_path(name: str) -> Path:
+    return CACHE_DIR / f"{name}.meta.json"
+
+
+def _compress(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd" and _zstd is not None:
+        return _zstd.ZstdCompressor(level=3).compress(raw)
+    return gzip.compress(raw, compresslevel=5)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if _zstd is None:
+            raise RuntimeError("zstandard not installed")
+        return _zstd.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _read_meta(name: str) -> Optional[dict]:
+    p = _meta_path(name)
+    try:
+        with open(p, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _load_file(name: str, ttl: float) -> Optional[Tuple[float, Any]]:
+    meta = _read_meta(name)
+    if meta is not None:
+        ts = float(meta.get("ts", 0))
+        if time.time() - ts > ttl:
+            return None
+        codec = meta.get("codec", "gzip")
+        with open(_payload_path(name, codec), "rb") as f:
+            return ts, json.loads(_decompress(f.read(), codec))
+    # pre-tiered format: one JSON file holding {"_meta": {"ts"}, "payload"}
+    legacy = CACHE_DIR / f"{name}.json"
+    if not legacy.exists():
+        return None
+    with open(legacy, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    ts = float(data.get("_meta", {}).get("ts", 0))
+    if time.time() - ts > ttl:
+        return None
+    return ts, data.get("payload")
 
 
 def load_cache(name: str) -> Any | None:
     cfg = load_config()
     log = logging.getLogger(__name__)
-    # Try MongoDB first when enabled
+    ttl = cfg.cache_ttl_sec
+
+    hit = _MEM.get(name)
+    if hit is not None:
+        if time.time() - hit[0] <= ttl:
+            return hit[1]
+        _MEM.pop(name)
+
+    try:
+        got = _load_file(name, ttl)
+        if got is not None:
+            log.info("cache hit (file): %s", name)
+            _MEM.put(name, got[0], got[1])
+            return got[1]
+    except Exception:
+        log.warning("cache file unreadable, ignoring: %s", name)
+
     if getattr(cfg, "enable_db", False):
         try:
             from .db import read_cache as _db_read
@@ -23,42 +167,131 @@ def load_cache(name: str) -> Any | None:
             db_payload = _db_read(name)
             if db_payload is not None:
                 log.info("cache hit (mongo): %s", name)
+                _MEM.put(name, time.time(), db_payload)
                 return db_payload
         except Exception:
-            log.warning("cache db error, falling back to file: %s", name)
+            log.warning("cache db error: %s", name)
+    return None
 
-    p = CACHE_DIR / f"{name}.json"
-    if not p.exists():
-        return None
+
+def load_stale_cache(name: str) -> Any | None:
+    """File-tier payload of ``name`` whatever its age; None if there is none.
+
+    Fallback for a refresh that failed part-way, so the previous complete
+    copy is served instead of a truncated one.
+    """
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        meta = data.get("_meta", {})
-        ts = meta.get("ts", 0)
-        ttl = load_config().cache_ttl_sec
-        if time.time() - ts > ttl:
-            return None
-        log.info("cache hit (file): %s", name)
-        return data.get("payload")
+        got = _load_file(name, float("inf"))
     except Exception:
         return None
+    return None if got is None else got[1]
+
+
+def _db_write(name: str, payload: Any) -> None:
+    log = logging.getLogger(__name__)
+    try:
+        from .db import write_cache as _db_write_cache
+
+        if _db_write_cache(name, payload):
+            log.info("cache write (mongo): %s", name)
+        else:
+            log.warning("cache write failed (mongo): %s", name)
+    except Exception:
+        log.warning("cache write failed (mongo): %s", name)
+
 
+def _submit_db_write(name: str, payload: Any) -> None:
+    global _DB_EXEC
+    with _DB_LOCK:
+        if _DB_EXEC is None:
+            _DB_EXEC = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-db")
+        _PENDING[:] = [f for f in _PENDING if not f.done()]
+        _PENDING.append(_DB_EXEC.submit(_db_write, name, payload))
 
-def save_cache(name: str, payload: Any) -> None:
+
+def flush_cache_writes(timeout: Optional[float] = None) -> None:
+    """Wait for queued background DB writes (e.g. before a short-lived process exits)."""
+    with _DB_LOCK:
+        pending = list(_PENDING)
+    for f in pending:
+        try:
+            f.result(timeout=timeout)
+        except Exception:
+            pass
+
+
+def cache_validators(name: str) -> Dict[str, str]:
+    """HTTP validators stored with ``name``, fresh or not; empty if no payload is on disk."""
+    meta = _read_meta(name)
+    if not meta or not _payload_path(name, meta.get("codec", "gzip")).exists():
+        return {}
+    return dict(meta.get("validators") or {})
+
+
+def conditional_headers(name: str) -> Dict[str, str]:
+    v = cache_validators(name)
+    hdrs: Dict[str, str] = {}
+    if v.get("etag"):
+        hdrs["If-None-Match"] = v["etag"]
+    if v.get("last_modified"):
+        hdrs["If-Modified-Since"] = v["last_modified"]
+    return hdrs
+
+
+def validators_of(headers: Mapping[str, str]) -> Dict[str, str]:
+    v: Dict[str, str] = {}
+    etag = headers.get("etag") or headers.get("ETag")
+    lm = headers.get("last-modified") or headers.get("Last-Modified")
+    if etag:
+        v["etag"] = etag
+    if lm:
+        v["last_modified"] = lm
+    return v
+
+
+def touch_cache(name: str, validators: Optional[Mapping[str, str]] = None) -> bool:
+    """Renew the TTL of the on-disk entry without rewriting its payload.
+
+    Used after a 304; returns False when there is no payload to renew, in which
+    case the caller must fall back to a full fetch.
+    """
+    meta = _read_meta(name)
+    if not meta or not _payload_path(name, meta.get("codec", "gzip")).exists():
+        return False
+    meta["ts"] = time.time()
+    if validators:
+        meta["validators"] = {**(meta.get("validators") or {}), **validators}
+    _atomic_write(_meta_path(name), json.dumps(meta).encode("utf-8"))
+    _MEM.pop(name)
+    return True
+
+
+def save_cache(name: str, payload: Any, validators: Optional[Mapping[str, str]] = None) -> None:
+    ts = time.time()
+    _MEM.put(name, ts, payload)
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    p = CACHE_DIR / f"{name}.json"
-    with open(p, "w", encoding="utf-8") as f:
-        json.dump({"_meta": {"ts": time.time()}, "payload": payload}, f)
-    # Attempt DB write when enabled; ignore failures
+    codec = _codec()
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    # payload first, then the sidecar that makes it visible
+    _atomic_write(_payload_path(name, codec), _compress(raw, codec))
+    meta: Dict[str, Any] = {"ts": ts, "codec": codec, "raw_bytes": len(raw)}
+    if validators:
+        meta["validators"] = dict(validators)
+    _atomic_write(_meta_path(name), json.dumps(meta).encode("utf-8"))
+    legacy = CACHE_DIR / f"{name}.json"
+    if legacy.exists():
+        try:
+            legacy.unlink()
+        except OSError:
+            pass
+    # DB tier is best-effort and must not block the caller
     try:
         cfg = load_config()
         if getattr(cfg, "enable_db", False):
-            from .db import write_cache as _db_write
-
-            ok = _db_write(name, payload)
-            if ok:
-                logging.getLogger(__name__).info("cache write (mongo): %s", name)
-            else:
-                logging.getLogger(__name__).warning("cache write failed (mongo): %s", name)
+            _submit_db_write(name, payload)
     except Exception:
         pass
+
+
+def clear_memory_cache() -> None:
+    _MEM.clear()
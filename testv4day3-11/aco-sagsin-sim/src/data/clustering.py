@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, List, Sequence
 
 import numpy as np
-from sklearn.cluster import DBSCAN
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from sklearn.neighbors import BallTree
 
 from ..types import Node
 
@@ -15,44 +17,92 @@ def _to_rad(coords: np.ndarray) -> np.ndarray:
     return np.radians(coords)
 
 
+def _unit_vectors(latlon_rad: np.ndarray) -> np.ndarray:
+    lat, lon = latlon_rad[:, 0], latlon_rad[:, 1]
+    cos_lat = np.cos(lat)
+    return np.stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=1)
+
+
+def _radius_components(latlon_rad: np.ndarray, eps: float) -> np.ndarray:
+    """Labels of the connected components of the ``haversine <= eps`` graph.
+
+    With ``min_samples=1`` this is exactly what DBSCAN computes, but built from
+    a single BallTree radius query instead of a per-point expansion. The tree
+    is built on unit vectors with the equivalent chord radius ``2 sin(eps/2)``,
+    which is much cheaper to query than the haversine metric.
+    """
+    n = len(latlon_rad)
+    if n == 1:
+        return np.zeros(1, dtype=np.intp)
+    pts = _unit_vectors(latlon_rad)
+    tree = BallTree(pts)
+    nbrs = tree.query_radius(pts, r=2.0 * np.sin(min(eps, np.pi) / 2.0), return_distance=False)
+    counts = np.fromiter((len(x) for x in nbrs), dtype=np.intp, count=n)
+    indptr = np.concatenate(([0], np.cumsum(counts)))
+    indices = np.concatenate(nbrs) if n else np.empty(0, dtype=np.intp)
+    graph = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def _group_means(labels: np.ndarray, arr: np.ndarray, n_groups: int) -> np.ndarray:
+    counts = np.bincount(labels, minlength=n_groups).astype(float)
+    return np.stack([np.bincount(labels, weights=arr[:, c], minlength=n_groups) / counts for c in range(arr.shape[1])],
+                    axis=1)
+
+
+def _emit(nodes: Sequence[Node], arr: np.ndarray, kinds: np.ndarray, labels: np.ndarray,
+          name_fmt: str) -> List[Node]:
+    """Centroid nodes per label, ordered by each cluster's first member."""
+    uniq, first, inv = np.unique(labels, return_index=True, return_inverse=True)
+    means = _group_means(inv.ravel(), arr, len(uniq))
+    out: List[Node] = []
+    rows = means.tolist()
+    first_l = first.tolist()
+    for k, g in enumerate(np.argsort(first, kind="stable").tolist()):
+        lead = first_l[g]
+        kind = str(kinds[lead])
+        lat, lon, alt = rows[g]
+        # normalize lon to [-180,180]
+        lon = ((lon + 180) % 360) - 180
+        base_name = getattr(nodes[lead], "name", "")
+        name = base_name or name_fmt.format(kind=kind, label=k)
+        out.append(Node(id=-1, kind=kind, lat=lat, lon=lon, alt_m=alt, name=name))
+    return out
+
+
 def dbscan_cluster(nodes: Iterable[Node], radius_km: float) -> list[Node]:
-    arr = np.array([[n.lat, n.lon, n.alt_m] for n in nodes], dtype=float)
-    if len(arr) == 0:
+    """Merge nodes of the same kind that are chained within ``radius_km``.
+
+    Clusters never mix kinds; each centroid keeps its kind and the name of
+    its first member.
+    """
+    nodes = list(nodes)
+    if not nodes:
         return []
+    arr = np.array([[n.lat, n.lon, n.alt_m] for n in nodes], dtype=float)
+    kinds = np.array([n.kind for n in nodes])
     # Haversine expects [lat,lon] in radians; we ignore altitude for clustering
     latlon = _to_rad(arr[:, :2])
     eps = radius_km / EARTH_RADIUS_KM
-    clustering = DBSCAN(eps=eps, min_samples=1, metric="haversine").fit(latlon)
-    labels = clustering.labels_
-    out: list[Node] = []
-    for lbl in np.unique(labels):
-        idxs = np.where(labels == lbl)[0]
-        group = arr[idxs]
-        lat = float(np.mean(group[:, 0]))
-        lon = float(np.mean(group[:, 1]))
-        alt = float(np.mean(group[:, 2]))
-        # normalize lon to [-180,180]
-        lon = ((lon + 180) % 360) - 180
-        kind = nodes[idxs[0]].kind
-        # try to synthesize a name from first member
-        base_name = getattr(nodes[idxs[0]], "name", "")
-        name = base_name or f"{kind}-cluster-{int(lbl)}"
-        out.append(Node(id=-1, kind=kind, lat=lat, lon=lon, alt_m=alt, name=name))
-    return out
+    labels = np.empty(len(nodes), dtype=np.int64)
+    offset = 0
+    for kind in np.unique(kinds):
+        idx = np.nonzero(kinds == kind)[0]
+        lbl = _radius_components(latlon[idx], eps)
+        labels[idx] = lbl + offset
+        offset += int(lbl.max()) + 1
+    return _emit(nodes, arr, kinds, labels, "{kind}-cluster-{label}")
 
 
 def grid_cluster(nodes: Iterable[Node], grid_deg: float = 0.1) -> list[Node]:
-    buckets: dict[tuple[int, int, str], list[Node]] = {}
-    for n in nodes:
-        key = (int(n.lat / grid_deg), int(n.lon / grid_deg), n.kind)
-        buckets.setdefault(key, []).append(n)
-    out: list[Node] = []
-    for (_, _, kind), group in buckets.items():
-        lat = float(np.mean([g.lat for g in group]))
-        lon = float(np.mean([g.lon for g in group]))
-        alt = float(np.mean([g.alt_m for g in group]))
-        lon = ((lon + 180) % 360) - 180
-        base_name = getattr(group[0], "name", "") if group else ""
-        name = base_name or f"{kind}-grid"
-        out.append(Node(id=-1, kind=kind, lat=lat, lon=lon, alt_m=alt, name=name))
-    return out
+    nodes = list(nodes)
+    if not nodes:
+        return []
+    arr = np.array([[n.lat, n.lon, n.alt_m] for n in nodes], dtype=float)
+    kinds = np.array([n.kind for n in nodes])
+    _, kind_code = np.unique(kinds, return_inverse=True)
+    # int() truncation toward zero, as in the original bucket key
+    keys = np.stack((np.trunc(arr[:, 0] / grid_deg), np.trunc(arr[:, 1] / grid_deg), kind_code.ravel()), axis=1)
+    _, labels = np.unique(keys, axis=0, return_inverse=True)
+    return _emit(nodes, arr, kinds, labels.ravel(), "{kind}-grid")
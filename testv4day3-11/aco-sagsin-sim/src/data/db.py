@@ -1,17 +1,50 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Optional, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from ..config import load_config
 
 try:
-    from pymongo import MongoClient
+    from pymongo import ASCENDING, GEOSPHERE, MongoClient, UpdateOne
     PYMONGO_AVAILABLE = True
 except Exception:  # pragma: no cover - optional dependency
     MongoClient = None  # type: ignore
+    UpdateOne = None  # type: ignore
+    ASCENDING, GEOSPHERE = 1, "2dsphere"
     PYMONGO_AVAILABLE = False
 
+# Nodes are stored one document per node: {_id: node id, kind, lat, lon, alt_m,
+# name, loc: GeoJSON Point, gen: write generation}. Upserts go out in batches.
+NODE_BATCH = 1000
+# Legacy layout kept the whole list in a single {_id: "nodes", payload: [...]} document
+_LEGACY_NODES_ID = "nodes"
+
+
+def _node_doc(n: Dict[str, Any], gen: float) -> Dict[str, Any]:
+    lat = float(n["lat"])
+    lon = float(n["lon"])
+    return {
+        "kind": n["kind"],
+        "lat": lat,
+        "lon": lon,
+        "alt_m": float(n.get("alt_m") or 0.0),
+        "name": n.get("name") or "",
+        "loc": {"type": "Point", "coordinates": [lon, lat]},
+        "gen": gen,
+    }
+
+
+def _node_record(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": int(doc["_id"]),
+        "kind": doc["kind"],
+        "lat": doc["lat"],
+        "lon": doc["lon"],
+        "alt_m": doc.get("alt_m", 0.0),
+        "name": doc.get("name", ""),
+    }
+
 
 class _MongoStore:
     def __init__(self) -> None:
@@ -20,6 +53,7 @@ class _MongoStore:
         self._cache_coll = None
         self._nodes_coll = None
         self._ready = False
+        self._indexed = False
 
     def connect(self) -> bool:
         if not PYMONGO_AVAILABLE:
@@ -81,23 +115,57 @@ class _MongoStore:
             return False
 
     # Nodes dataset --------------------------------------------------
-    def write_nodes(self, nodes: List[dict]) -> bool:
+    def _ensure_node_indexes(self) -> None:
+        if self._indexed:
+            return
+        self._nodes_coll.create_index([("loc", GEOSPHERE)], name="loc_2dsphere")
+        self._nodes_coll.create_index([("kind", ASCENDING)], name="kind")
+        self._indexed = True
+
+    def write_nodes(self, nodes: Iterable[Dict[str, Any]]) -> bool:
+        """Upsert one document per node in unordered batches, then drop ids no longer present."""
         if not self.is_ready():
             return False
         try:
-            self._nodes_coll.replace_one({"_id": "nodes"}, {"_id": "nodes", "payload": nodes, "ts": time.time()}, upsert=True)
+            self._ensure_node_indexes()
+            gen = time.time()
+            batch: List[Any] = []
+            for n in nodes:
+                batch.append(UpdateOne({"_id": int(n["id"])}, {"$set": _node_doc(n, gen)}, upsert=True))
+                if len(batch) >= NODE_BATCH:
+                    self._nodes_coll.bulk_write(batch, ordered=False)
+                    batch = []
+            if batch:
+                self._nodes_coll.bulk_write(batch, ordered=False)
+            # stale nodes from earlier writes (and the legacy single document)
+            self._nodes_coll.delete_many({"gen": {"$ne": gen}})
             return True
         except Exception:
             return False
 
+    def iter_nodes(self, kinds: Optional[Iterable[str]] = None, batch_size: int = NODE_BATCH) -> Iterator[Dict[str, Any]]:
+        """Stream node records ordered by id straight off the cursor."""
+        if not self.is_ready():
+            return
+        query: Dict[str, Any] = {"kind": {"$exists": True}}
+        if kinds is not None:
+            query["kind"] = {"$in": list(kinds)}
+        projection = {"loc": False, "gen": False}
+        cursor = self._nodes_coll.find(query, projection).sort("_id", ASCENDING).batch_size(batch_size)
+        got = False
+        for doc in cursor:
+            got = True
+            yield _node_record(doc)
+        if not got and kinds is None:
+            legacy = self._nodes_coll.find_one({"_id": _LEGACY_NODES_ID})
+            if legacy:
+                yield from legacy.get("payload") or []
+
     def read_nodes(self) -> Optional[List[dict]]:
         if not self.is_ready():
             return None
         try:
-            doc = self._nodes_coll.find_one({"_id": "nodes"})
-            if not doc:
-                return None
-            return doc.get("payload")
+            return list(self.iter_nodes()) or None
         except Exception:
             return None
 
@@ -117,9 +185,13 @@ def write_cache(name: str, payload: Any) -> bool:
     return _store.write_cache(name, payload)
 
 
-def write_nodes(nodes: List[dict]) -> bool:
+def write_nodes(nodes: Iterable[dict]) -> bool:
     return _store.write_nodes(nodes)
 
 
 def read_nodes() -> Optional[List[dict]]:
     return _store.read_nodes()
+
+
+def iter_nodes(kinds: Optional[Iterable[str]] = None) -> Iterator[dict]:
+    return _store.iter_nodes(kinds)
@@ -6,7 +6,7 @@ from typing import List
 
 from ..config import load_config
 from ..types import Node
-from .cache import load_cache, save_cache
+from .cache import conditional_headers, load_cache, save_cache, touch_cache, validators_of
 
 API = "https://www.ndbc.noaa.gov/data/stations/station_table.txt"
 
@@ -15,6 +15,24 @@ def _norm_lon(lon: float) -> float:
     return ((lon + 180) % 360) - 180
 
 
+def parse_line(line: str) -> Node | None:
+    # Skip header lines starting with "#"
+    if not line or line.startswith("#"):
+        return None
+    parts = line.split("\t")
+    if len(parts) < 7:
+        return None
+    try:
+        lat = float(parts[6])
+        lon = float(parts[7])
+    except Exception:
+        return None
+    station_id = parts[0] if len(parts) > 0 else ""
+    station_name = parts[1] if len(parts) > 1 else ""
+    nm = station_name or station_id
+    return Node(id=-1, kind="sea", lat=lat, lon=_norm_lon(lon), alt_m=0.0, name=nm)
+
+
 def fetch() -> List[Node]:
     cfg = load_config()
     cached = load_cache("ndbc")
@@ -26,32 +44,24 @@ def fetch() -> List[Node]:
         return nodes
 
     timeout = httpx.Timeout(cfg.http_timeout_sec)
+    validators: dict = {}
     for attempt in range(cfg.http_retries):
         try:
             with httpx.Client(timeout=timeout) as client:
-                resp = client.get(API)
+                resp = client.get(API, headers=conditional_headers("ndbc"))
+                if resp.status_code == 304 and touch_cache("ndbc", validators_of(resp.headers)):
+                    return [Node(**n) for n in load_cache("ndbc") or []]
                 resp.raise_for_status()
+                validators = validators_of(resp.headers)
                 text = resp.text.splitlines()
-                # Skip header lines starting with "#"
                 for line in text:
-                    if not line or line.startswith("#"):
-                        continue
-                    parts = line.split("\t")
-                    if len(parts) < 7:
-                        continue
-                    try:
-                        lat = float(parts[6])
-                        lon = float(parts[7])
-                    except Exception:
-                        continue
-                    station_id = parts[0] if len(parts) > 0 else ""
-                    station_name = parts[1] if len(parts) > 1 else ""
-                    nm = station_name or station_id
-                    nodes.append(Node(id=-1, kind="sea", lat=lat, lon=_norm_lon(lon), alt_m=0.0, name=nm))
+                    node = parse_line(line)
+                    if node is not None:
+                        nodes.append(node)
                 break
         except Exception:
             if attempt + 1 == cfg.http_retries:
                 break
             time.sleep(cfg.backoff_factor * (2**attempt))
-    save_cache("ndbc", [n.__dict__ for n in nodes])
+    save_cache("ndbc", [n.__dict__ for n in nodes], validators)
     return nodes
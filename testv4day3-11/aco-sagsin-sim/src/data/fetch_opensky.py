@@ -2,19 +2,47 @@ from __future__ import annotations
 
 import httpx
 import time
-from typing import List
+from typing import List, Mapping, Optional
 
 from ..config import load_config
 from ..types import Node
-from .cache import load_cache, save_cache
+from .cache import conditional_headers, load_cache, save_cache, touch_cache, validators_of
 
 API = "https://opensky-network.org/api/states/all"
 
 
+class RateLimited(Exception):
+    """OpenSky answered 429; ``retry_after`` is the wait it asked for in seconds (None if unsaid)."""
+
+    def __init__(self, retry_after: Optional[float]) -> None:
+        super().__init__(f"rate limited (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    for name in ("X-Rate-Limit-Retry-After-Seconds", "Retry-After"):
+        try:
+            return float(headers[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
 def _norm_lon(lon: float) -> float:
     return ((lon + 180) % 360) - 180
 
 
+def parse_record(st: list) -> Node | None:
+    lat = st[6]
+    lon = st[5]
+    alt = st[13] if len(st) > 13 else None
+    if lat is None or lon is None:
+        return None
+    alt_m = float(alt) if alt is not None else 10000.0
+    callsign = (st[1] or "").strip() if isinstance(st, list) and len(st) > 1 else ""
+    return Node(id=-1, kind="air", lat=float(lat), lon=_norm_lon(float(lon)), alt_m=alt_m, name=callsign)
+
+
 def fetch() -> List[Node]:
     cfg = load_config()
     cached = load_cache("opensky")
@@ -26,28 +54,48 @@ def fetch() -> List[Node]:
         return nodes
 
     timeout = httpx.Timeout(cfg.http_timeout_sec)
+    validators: dict = {}
     for attempt in range(cfg.http_retries):
         try:
             with httpx.Client(timeout=timeout) as client:
-                resp = client.get(API)
+                resp = client.get(API, headers=conditional_headers("opensky"))
+                if resp.status_code == 304 and touch_cache("opensky", validators_of(resp.headers)):
+                    return [Node(**n) for n in load_cache("opensky") or []]
                 resp.raise_for_status()
+                validators = validators_of(resp.headers)
                 data = resp.json()
                 states = data.get("states", [])
                 for st in states:
-                    lat = st[6]
-                    lon = st[5]
-                    alt = st[13] if len(st) > 13 else None
-                    if lat is None or lon is None:
-                        continue
-                    alt_m = float(alt) if alt is not None else 10000.0
-                    callsign = (st[1] or "").strip() if isinstance(st, list) and len(st) > 1 else ""
-                    nodes.append(
-                        Node(id=-1, kind="air", lat=float(lat), lon=_norm_lon(float(lon)), alt_m=alt_m, name=callsign)
-                    )
+                    node = parse_record(st)
+                    if node is not None:
+                        nodes.append(node)
                 break
         except Exception:
             if attempt + 1 == cfg.http_retries:
                 break
             time.sleep(cfg.backoff_factor * (2**attempt))
-    save_cache("opensky", [n.__dict__ for n in nodes])
+    save_cache("opensky", [n.__dict__ for n in nodes], validators)
     return nodes
+
+
+def fetch_states() -> List[list]:
+    """Raw state vectors for live tracking; never cached since positions go stale in seconds.
+
+    Raises ``RateLimited`` on a 429 so the poller can back off; other
+    failures return an empty list.
+    """
+    cfg = load_config()
+    if cfg.offline or not cfg.enable_air:
+        return []
+    try:
+        with httpx.Client(timeout=httpx.Timeout(cfg.http_timeout_sec)) as client:
+            resp = client.get(API)
+    except httpx.HTTPError:
+        return []
+    if resp.status_code == 429:
+        raise RateLimited(_retry_after(resp.headers))
+    try:
+        resp.raise_for_status()
+        return resp.json().get("states") or []
+    except Exception:
+        return []
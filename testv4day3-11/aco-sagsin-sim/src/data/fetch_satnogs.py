@@ -6,7 +6,7 @@ from typing import List
 
 from ..config import load_config
 from ..types import Node
-from .cache import load_cache, save_cache
+from .cache import conditional_headers, load_cache, save_cache, touch_cache, validators_of
 
 
 API = "https://network.satnogs.org/api/stations/"
@@ -16,6 +16,19 @@ def _norm_lon(lon: float) -> float:
     return ((lon + 180) % 360) - 180
 
 
+def parse_record(st: dict) -> Node | None:
+    lat = st.get("lat")
+    # API uses 'lng' (not 'lon'); keep fallback to 'lon' just in case
+    lon = st.get("lng") if "lng" in st else st.get("lon")
+    # Some payloads use 'altitude' instead of 'elevation'
+    alt = st.get("elevation") if st.get("elevation") is not None else st.get("altitude", 0)
+    alt = alt or 0
+    if lat is None or lon is None:
+        return None
+    nm = st.get("name") or st.get("station_id") or ""
+    return Node(id=-1, kind="ground", lat=float(lat), lon=_norm_lon(float(lon)), alt_m=float(alt), name=str(nm) if nm else "")
+
+
 def fetch() -> List[Node]:
     cfg = load_config()
     cached = load_cache("satnogs")
@@ -27,28 +40,25 @@ def fetch() -> List[Node]:
         return nodes
 
     timeout = httpx.Timeout(cfg.http_timeout_sec)
+    validators: dict = {}
     # manual retry with backoff
     for attempt in range(cfg.http_retries):
         try:
             with httpx.Client(timeout=timeout) as client:
-                resp = client.get(API)
+                resp = client.get(API, headers=conditional_headers("satnogs"))
+                if resp.status_code == 304 and touch_cache("satnogs", validators_of(resp.headers)):
+                    return [Node(**n) for n in load_cache("satnogs") or []]
                 resp.raise_for_status()
+                validators = validators_of(resp.headers)
                 data = resp.json()
                 for st in data:
-                    lat = st.get("lat")
-                    # API uses 'lng' (not 'lon'); keep fallback to 'lon' just in case
-                    lon = st.get("lng") if "lng" in st else st.get("lon")
-                    # Some payloads use 'altitude' instead of 'elevation'
-                    alt = st.get("elevation") if st.get("elevation") is not None else st.get("altitude", 0)
-                    alt = alt or 0
-                    if lat is None or lon is None:
-                        continue
-                    nm = st.get("name") or st.get("station_id") or ""
-                    nodes.append(Node(id=-1, kind="ground", lat=float(lat), lon=_norm_lon(float(lon)), alt_m=float(alt), name=str(nm) if nm else ""))
+                    node = parse_record(st)
+                    if node is not None:
+                        nodes.append(node)
                 break
         except Exception:
             if attempt + 1 == cfg.http_retries:
                 break
             time.sleep(cfg.backoff_factor * (2**attempt))
-    save_cache("satnogs", [n.__dict__ for n in nodes])
+    save_cache("satnogs", [n.__dict__ for n in nodes], validators)
     return nodes
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+
+from ..config import Config, load_config
+from ..types import Node
+from . import fetch_celestrak, fetch_ndbc, fetch_opensky, fetch_satnogs
+from .bounding import in_bbox
+from .cache import conditional_headers, load_cache, load_stale_cache, save_cache, touch_cache, validators_of
+from .stream import aiter_json_items
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str  # cache entry name
+    url: str
+    enabled: Callable[[Config], bool]
+    parse: Callable[[Any], Optional[Node]]
+    fmt: str = "json"  # "json" (array, optionally under key) or "lines"
+    key: Optional[str] = None
+
+
+# Canonical order; node ids are assigned in this order regardless of which
+# source finishes first.
+SOURCES: List[Source] = [
+    Source("satnogs", fetch_satnogs.API, lambda c: c.enable_ground, fetch_satnogs.parse_record),
+    Source("celestrak_active", fetch_celestrak.API, lambda c: c.enable_sat, fetch_celestrak.parse_record),
+    Source("opensky", fetch_opensky.API, lambda c: c.enable_air, fetch_opensky.parse_record, key="states"),
+    Source("ndbc", fetch_ndbc.API, lambda c: c.enable_sea, fetch_ndbc.parse_line, fmt="lines"),
+]
+
+
+def _safe_parse(src: Source, raw: Any) -> Optional[Node]:
+    try:
+        return src.parse(raw)
+    except Exception:
+        return None
+
+
+async def _records(resp: httpx.Response, src: Source) -> AsyncIterator[Any]:
+    if src.fmt == "lines":
+        async for line in resp.aiter_lines():
+            yield line
+    else:
+        async for item in aiter_json_items(resp.aiter_text(), src.key):
+            yield item
+
+
+async def stream_source(client: httpx.AsyncClient, src: Source, cfg: Config,
+                        url: Optional[str] = None) -> AsyncIterator[Node]:
+    """Yield a source's nodes as they are parsed off the wire (or from cache).
+
+    A failed attempt is retried with backoff; records already yielded are
+    skipped on the retry, so each node is yielded once. Only a stream read to
+    the end is written to the cache (with the response validators); when
+    every attempt fails, the rest of the previous cache entry, however old,
+    is served instead and the cache is left untouched. An expired entry is
+    revalidated with a conditional GET and a 304 just renews it.
+    """
+    cached = load_cache(src.name)
+    if cached is not None:
+        for n in cached:
+            yield Node(**n)
+        return
+    if cfg.offline:
+        return
+
+    got: List[Node] = []
+    for attempt in range(cfg.http_retries):
+        # nodes parsed by this attempt; the first len(got) were yielded already
+        seen = 0
+        try:
+            async with client.stream("GET", url or src.url, headers=conditional_headers(src.name)) as resp:
+                if resp.status_code == 304 and touch_cache(src.name, validators_of(resp.headers)):
+                    log.info("ingest %s: not modified", src.name)
+                    for n in (load_cache(src.name) or [])[len(got):]:
+                        yield Node(**n)
+                    return
+                resp.raise_for_status()
+                validators = validators_of(resp.headers)
+                async for raw in _records(resp, src):
+                    node = _safe_parse(src, raw)
+                    if node is None:
+                        continue
+                    seen += 1
+                    if seen > len(got):
+                        got.append(node)
+                        yield node
+        except Exception as e:
+            log.warning("ingest %s attempt %d failed after %d records: %s", src.name, attempt + 1, seen, e)
+            if attempt + 1 < cfg.http_retries:
+                await asyncio.sleep(cfg.backoff_factor * (2**attempt))
+            continue
+        save_cache(src.name, [n.__dict__ for n in got], validators)
+        return
+
+    stale = load_stale_cache(src.name)
+    if stale is not None:
+        log.warning("ingest %s: serving the previous cache entry", src.name)
+        for n in stale[len(got):]:
+            yield Node(**n)
+
+
+async def _collect_source(client: httpx.AsyncClient, src: Source, cfg: Config,
+                          url: Optional[str]) -> List[Node]:
+    # bbox filtering happens record by record as nodes stream in; stream_source
+    # still keeps the full list for its cache write
+    return [n async for n in stream_source(client, src, cfg, url) if in_bbox(n, cfg.bbox)]
+
+
+async def ingest(cfg: Optional[Config] = None, urls: Optional[Dict[str, str]] = None,
+                 sources: Optional[List[Source]] = None) -> List[Node]:
+    """Fetch all enabled sources concurrently over one connection pool.
+
+    Returns bbox-filtered nodes concatenated in ``SOURCES`` order. ``urls``
+    maps source names to override URLs (used by tests with a local server).
+    """
+    cfg = cfg or load_config()
+    urls = urls or {}
+    active = [s for s in (sources or SOURCES) if s.enabled(cfg)]
+    limits = httpx.Limits(max_connections=max(4, len(active)), max_keepalive_connections=len(active) or 1)
+    async with httpx.AsyncClient(timeout=httpx.Timeout(cfg.http_timeout_sec), limits=limits) as client:
+        parts = await asyncio.gather(*(_collect_source(client, s, cfg, urls.get(s.name)) for s in active))
+    out: List[Node] = []
+    for s, nodes in zip(active, parts):
+        log.info("ingest %s: %d nodes in bbox", s.name, len(nodes))
+        out.extend(nodes)
+    return out
+
+
+def run(cfg: Optional[Config] = None, urls: Optional[Dict[str, str]] = None) -> List[Node]:
+    return asyncio.run(ingest(cfg, urls))
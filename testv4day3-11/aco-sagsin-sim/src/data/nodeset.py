@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, List
+
+import numpy as np
+
+from ..types import Node
+
+# On-disk columnar node dataset: ``nodes.npy`` holds one fixed-size record per
+# node (memory-mappable, O(1) row access) and ``nodes.names`` is a UTF-8 string
+# table addressed by (name_off, name_len). ``nodes.json`` stays the UI format.
+KINDS = ("sat", "ground", "air", "sea")
+_KIND_CODE = {k: i for i, k in enumerate(KINDS)}
+DTYPE = np.dtype(
+    [
+        ("id", "<i8"),
+        ("kind", "u1"),
+        ("lat", "<f8"),
+        ("lon", "<f8"),
+        ("alt_m", "<f8"),
+        ("name_off", "<u8"),
+        ("name_len", "<u4"),
+    ]
+)
+
+
+def names_path(npy_path: Path) -> Path:
+    return Path(npy_path).with_suffix(".names")
+
+
+def _atomic_write(path: Path, write) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_nodeset(nodes: Iterable[Node], npy_path: Path) -> None:
+    nodes = list(nodes)
+    rec = np.zeros(len(nodes), dtype=DTYPE)
+    blob = bytearray()
+    for i, n in enumerate(nodes):
+        nm = (n.name or "").encode("utf-8")
+        rec[i] = (n.id, _KIND_CODE.get(n.kind, 255), n.lat, n.lon, n.alt_m, len(blob), len(nm))
+        blob += nm
+    npy_path = Path(npy_path)
+    # names first so a reader never sees records pointing past the string table
+    _atomic_write(names_path(npy_path), lambda f: f.write(bytes(blob)))
+    _atomic_write(npy_path, lambda f: np.save(f, rec, allow_pickle=False))
+
+
+class NodeSet:
+    """Memory-mapped view over a columnar node dataset."""
+
+    def __init__(self, npy_path: Path) -> None:
+        self.path = Path(npy_path)
+        self.rec = np.load(self.path, mmap_mode="r", allow_pickle=False)
+        self._names: bytes | mmap.mmap = b""
+        p = names_path(self.path)
+        if p.exists() and p.stat().st_size > 0:
+            with open(p, "rb") as f:
+                self._names = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.rec)
+
+    # zero-copy column views
+    @property
+    def ids(self) -> np.ndarray:
+        return self.rec["id"]
+
+    @property
+    def lat(self) -> np.ndarray:
+        return self.rec["lat"]
+
+    @property
+    def lon(self) -> np.ndarray:
+        return self.rec["lon"]
+
+    @property
+    def alt_m(self) -> np.ndarray:
+        return self.rec["alt_m"]
+
+    def kinds(self) -> List[str]:
+        return [KINDS[c] if c < len(KINDS) else "ground" for c in self.rec["kind"].tolist()]
+
+    def name(self, i: int) -> str:
+        r = self.rec[i]
+        off, ln = int(r["name_off"]), int(r["name_len"])
+        return bytes(self._names[off:off + ln]).decode("utf-8")
+
+    def row(self, i: int) -> dict[str, Any]:
+        r = self.rec[i]
+        code = int(r["kind"])
+        return {
+            "id": int(r["id"]),
+            "kind": KINDS[code] if code < len(KINDS) else "ground",
+            "lat": float(r["lat"]),
+            "lon": float(r["lon"]),
+            "alt_m": float(r["alt_m"]),
+            "name": self.name(i),
+        }
+
+    def nodes(self) -> List[Node]:
+        return [Node(**self.row(i)) for i in range(len(self))]
+
+    def geometry(self):
+        """Geometry whose coordinate arrays are views of the mapped columns."""
+        from ..net.geometry import Geometry
+
+        return Geometry(self.ids, self.lat, self.lon, self.alt_m, kinds=self.kinds())
+
+
+def columnar_path(json_path: Path) -> Path:
+    return Path(json_path).with_suffix(".npy")
+
+
+def has_fresh_columnar(json_path: Path) -> bool:
+    """True when ``nodes.npy`` exists and is at least as new as ``nodes.json``."""
+    npy = columnar_path(json_path)
+    if not npy.exists() or not names_path(npy).exists():
+        return False
+    json_path = Path(json_path)
+    return not json_path.exists() or npy.stat().st_mtime_ns >= json_path.stat().st_mtime_ns
+
+
+def read_json_nodes(json_path: Path) -> List[Node]:
+    with open(json_path, "r", encoding="utf-8") as f:
+        return [Node(**n) for n in json.load(f)]
@@ -4,16 +4,17 @@ import json
 from pathlib import Path
 from typing import List
 
+import numpy as np
+
 from ..config import load_config
-import random
 from ..logging_setup import setup_logging
 from ..types import Node
 from .bounding import filter_bbox
+from .cache import flush_cache_writes
 from .clustering import dbscan_cluster
-from .fetch_celestrak import fetch as fetch_celestrak
-from .fetch_ndbc import fetch as fetch_ndbc
-from .fetch_opensky import fetch as fetch_opensky
-from .fetch_satnogs import fetch as fetch_satnogs
+from .ingest import run as ingest_sources
+from .nodeset import write_nodeset
+from .selection import KINDS, continent_bbox, kind_quotas
 
 GEN_DIR = Path("data/generated")
 
@@ -30,43 +31,22 @@ def _assign_ids(nodes: List[Node]) -> List[Node]:
 def main() -> None:
     setup_logging()
     cfg = load_config()
+    # one generator for synthesis and shuffling, so cfg.seed reproduces the node set
+    rng = np.random.default_rng(cfg.seed)
 
-    nodes: List[Node] = []
-    if cfg.enable_ground:
-        nodes.extend(fetch_satnogs())
-    if cfg.enable_sat:
-        nodes.extend(fetch_celestrak())
-    if cfg.enable_air:
-        nodes.extend(fetch_opensky())
-    if cfg.enable_sea:
-        nodes.extend(fetch_ndbc())
-
-    # bbox filter (pre)
-    nodes = filter_bbox(nodes, cfg.bbox)
+    # concurrent, streaming fetch of all enabled sources; bbox filter (pre) is
+    # applied per record while parsing
+    nodes: List[Node] = ingest_sources(cfg)
 
     # clustering
     if cfg.enable_clustering and nodes:
         nodes = dbscan_cluster(nodes, cfg.cluster_radius_km)
 
     # continent filter & limiting
-    def continent_bbox(name: str) -> dict[str, float]:
-        name = (name or "").lower()
-        # coarse bounding boxes for continents/regions
-        boxes = {
-            "asia": {"min_lat": 1, "max_lat": 81, "min_lon": 26, "max_lon": 180},
-            "europe": {"min_lat": 35, "max_lat": 72, "min_lon": -25, "max_lon": 45},
-            "africa": {"min_lat": -35, "max_lat": 38, "min_lon": -20, "max_lon": 55},
-            "north_america": {"min_lat": 7, "max_lat": 83, "min_lon": -170, "max_lon": -50},
-            "south_america": {"min_lat": -56, "max_lat": 13, "min_lon": -82, "max_lon": -35},
-            "america": {"min_lat": -56, "max_lat": 83, "min_lon": -170, "max_lon": -35},
-            "oceania": {"min_lat": -50, "max_lat": 0, "min_lon": 110, "max_lon": 180},
-        }
-        return boxes.get(name, cfg.bbox)
-
     if getattr(cfg, "continent", None):
         # Apply continent filtering only to surface/air nodes. Satellites orbit globally
         # and shouldn't be removed by landmass lat/lon bounds.
-        bbox_sel = continent_bbox(cfg.continent)
+        bbox_sel = continent_bbox(cfg.continent, cfg.bbox)
         non_sat = [n for n in nodes if n.kind != "sat"]
         sats = [n for n in nodes if n.kind == "sat"]
         non_sat = filter_bbox(non_sat, bbox_sel)
@@ -78,13 +58,8 @@ def main() -> None:
     if limit > 0 and nodes:
         if mix:
             # normalize mix and compute per-kind quotas
-            kinds = ["sat", "air", "ground", "sea"]
-            total = sum(float(mix.get(k, 0.0)) for k in kinds)
-            # avoid division by zero
-            if total <= 0:
-                quotas = {k: 0 for k in kinds}
-            else:
-                quotas = {k: int(round(limit * (float(mix.get(k, 0.0)) / total))) for k in kinds}
+            kinds = list(KINDS)
+            quotas = kind_quotas(limit, mix)
 
             # prepare nodes grouped by kind and shuffle to avoid source-order bias
             # ensure we have enough nodes per kind - synthesize if external sources returned too few
@@ -93,20 +68,20 @@ def main() -> None:
                 out: list[Node] = []
                 bbox = cfg.bbox
                 for i in range(count):
-                    lat = random.uniform(bbox['min_lat'], bbox['max_lat'])
-                    lon = random.uniform(bbox['min_lon'], bbox['max_lon'])
+                    lat = float(rng.uniform(bbox['min_lat'], bbox['max_lat']))
+                    lon = float(rng.uniform(bbox['min_lon'], bbox['max_lon']))
                     if kind == 'sat':
                         alt_m = 550000.0
-                        name = f'SYN-SAT-{random.randint(1000,9999)}'
+                        name = f'SYN-SAT-{rng.integers(1000, 10000)}'
                     elif kind == 'air':
                         alt_m = 10000.0
-                        name = f'SYN-AIR-{random.randint(1000,9999)}'
+                        name = f'SYN-AIR-{rng.integers(1000, 10000)}'
                     elif kind == 'sea':
                         alt_m = 0.0
-                        name = f'SYN-SEA-{random.randint(1000,9999)}'
+                        name = f'SYN-SEA-{rng.integers(1000, 10000)}'
                     else:
                         alt_m = 0.0
-                        name = f'SYN-GND-{random.randint(1000,9999)}'
+                        name = f'SYN-GND-{rng.integers(1000, 10000)}'
                     out.append(Node(id=-1, kind=kind, lat=lat, lon=lon, alt_m=alt_m, name=name))
                 return out
 
@@ -118,10 +93,9 @@ def main() -> None:
                     needed = desired - have
                     by_kind[k].extend(_synthesize(k, needed))
 
-            import random as _rand
             # shuffle groups to avoid source-order bias
             for k in kinds:
-                _rand.shuffle(by_kind[k])
+                rng.shuffle(by_kind[k])
 
             selected: list[Node] = []
             remaining = limit
@@ -138,7 +112,7 @@ def main() -> None:
                 # build pool of all remaining nodes (exclude already selected)
                 picked = {id(n) for n in selected}
                 pool = [n for n in nodes if id(n) not in picked]
-                _rand.shuffle(pool)
+                rng.shuffle(pool)
                 for n in pool:
                     if remaining <= 0:
                         break
@@ -146,7 +120,7 @@ def main() -> None:
                     remaining -= 1
             elif remaining < 0:
                 # too many selected due to rounding up; trim randomly to fit
-                _rand.shuffle(selected)
+                rng.shuffle(selected)
                 selected = selected[:limit]
 
             nodes = selected[:limit]
@@ -164,8 +138,11 @@ def main() -> None:
     nodes = _assign_ids(nodes)
 
     GEN_DIR.mkdir(parents=True, exist_ok=True)
+    # JSON for the UI, columnar (memory-mappable) for the controller and node agents;
+    # the columnar file is written last so it is never older than the JSON
     with open(GEN_DIR / "nodes.json", "w", encoding="utf-8") as f:
         json.dump([n.__dict__ for n in nodes], f)
+    write_nodeset(nodes, GEN_DIR / "nodes.npy")
 
     # Optional: write nodes to MongoDB if enabled; log success/failure
     try:
@@ -174,7 +151,7 @@ def main() -> None:
         cfg2 = _lc()
         if cfg2.enable_db:
             from .db import write_nodes as _write_nodes
-            ok = _write_nodes([n.__dict__ for n in nodes])
+            ok = _write_nodes(n.__dict__ for n in nodes)
             log = logging.getLogger(__name__)
             if ok:
                 log.info("nodes written to MongoDB (%d records)", len(nodes))
@@ -184,6 +161,9 @@ def main() -> None:
         # ignore logging failures in seeding path
         pass
 
+    # background cache writes to MongoDB must land before the seeder exits
+    flush_cache_writes(timeout=30)
+
     # create minimal placeholder links.json for convenience (controller will rebuild anyway)
     with open(GEN_DIR / "links.json", "w", encoding="utf-8") as f:
         json.dump([], f)
@@ -0,0 +1,43 @@
+"""Node selection rules shared by the seeder and the live aircraft poll."""
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional
+
+KINDS = ("sat", "air", "ground", "sea")
+
+# coarse bounding boxes for continents/regions
+CONTINENT_BOXES: Dict[str, Dict[str, float]] = {
+    "asia": {"min_lat": 1, "max_lat": 81, "min_lon": 26, "max_lon": 180},
+    "europe": {"min_lat": 35, "max_lat": 72, "min_lon": -25, "max_lon": 45},
+    "africa": {"min_lat": -35, "max_lat": 38, "min_lon": -20, "max_lon": 55},
+    "north_america": {"min_lat": 7, "max_lat": 83, "min_lon": -170, "max_lon": -50},
+    "south_america": {"min_lat": -56, "max_lat": 13, "min_lon": -82, "max_lon": -35},
+    "america": {"min_lat": -56, "max_lat": 83, "min_lon": -170, "max_lon": -35},
+    "oceania": {"min_lat": -50, "max_lat": 0, "min_lon": 110, "max_lon": 180},
+}
+
+
+def continent_bbox(name: Optional[str], default: Mapping[str, float]) -> Dict[str, float]:
+    """Bounding box of a continent/region name; ``default`` for unknown names."""
+    return dict(CONTINENT_BOXES.get((name or "").lower(), default))
+
+
+def kind_quotas(limit: int, mix: Optional[Mapping[str, float]]) -> Dict[str, int]:
+    """Per-kind node counts for ``node_limit`` split by ``type_mix`` (rounded shares)."""
+    total = sum(float(mix.get(k, 0.0)) for k in KINDS) if mix else 0.0
+    if total <= 0:
+        return {k: 0 for k in KINDS}
+    return {k: int(round(limit * (float(mix.get(k, 0.0)) / total))) for k in KINDS}
+
+
+def kind_cap(cfg, kind: str, others: int = 0) -> Optional[int]:
+    """Most nodes of ``kind`` the selection keeps; None when ``node_limit`` is off.
+
+    With a ``type_mix`` this is the kind's quota. Without one, the kinds share
+    ``node_limit``, so the ``others`` nodes of other kinds count against it.
+    """
+    limit = int(getattr(cfg, "node_limit", 0) or 0)
+    if limit <= 0:
+        return None
+    mix = getattr(cfg, "type_mix", None)
+    return kind_quotas(limit, mix)[kind] if mix else max(0, limit - others)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional
+
+_WS = " \t\r\n,"
+
+
+class JsonArrayItems:
+    """Incremental parser for the elements of a JSON array.
+
+    Text is fed in arbitrary chunks; each call returns the elements that are
+    complete so far, so the full document is never held in memory. With
+    ``key`` set, the array is the value of that key inside the top-level
+    object (e.g. OpenSky's ``{"time": ..., "states": [...]}``).
+    """
+
+    def __init__(self, key: Optional[str] = None) -> None:
+        self._buf = ""
+        self._started = False
+        self._done = False
+        self._dec = json.JSONDecoder()
+        if key is None:
+            self._start = re.compile(r"\s*\[")
+            self._keep = 0
+        else:
+            self._start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+            # keep enough tail to match a key split across chunks
+            self._keep = len(key) + 32
+
+    def feed(self, text: str) -> List[Any]:
+        if self._done:
+            return []
+        self._buf += text
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        if self._done:
+            # whatever follows the closing bracket (e.g. the rest of the object) is not ours
+            return []
+        out = self._drain(final=True)
+        if self._started and not self._done and self._buf.strip():
+            raise ValueError("truncated JSON array")
+        return out
+
+    def _drain(self, final: bool) -> List[Any]:
+        out: List[Any] = []
+        buf = self._buf
+        pos = 0
+        if not self._started:
+            m = self._start.match(buf) if self._keep == 0 else self._start.search(buf)
+            if m is None:
+                if self._keep:
+                    self._buf = buf[-self._keep:]
+                elif buf.strip():
+                    raise ValueError("expected a JSON array")
+                return out
+            pos = m.end()
+            self._started = True
+        n = len(buf)
+        while True:
+            while pos < n and buf[pos] in _WS:
+                pos += 1
+            if pos >= n:
+                break
+            if buf[pos] == "]":
+                self._done = True
+                pos += 1
+                break
+            try:
+                obj, end = self._dec.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("malformed JSON array element")
+                break  # element still incomplete; wait for more text
+            if not final and not isinstance(obj, (dict, list)) and (end >= n or buf[end] not in _WS + "]"):
+                # a bare scalar not yet followed by a delimiter may be cut short ("3." of "3.25")
+                break
+            out.append(obj)
+            pos = end
+        self._buf = buf[pos:]
+        return out
+
+
+async def aiter_json_items(chunks: AsyncIterable[str], key: Optional[str] = None) -> AsyncIterator[Any]:
+    parser = JsonArrayItems(key)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
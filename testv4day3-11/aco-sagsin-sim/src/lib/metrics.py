@@ -2,9 +2,17 @@
 
 Provide path latency (ms) and throughput (Mbps) computations so the
 controller can return the same metrics the frontend computes.
+
+The scalar helpers mirror the formulas one hop at a time; the
+``path_metrics``/``batch_path_metrics`` functions evaluate whole paths in one
+NumPy pass over the per-tick ``Geometry`` cache (id->row index + ECEF array).
 """
 import math
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..net.geometry import Geometry
 
 C_LIGHT_MPS = 299_792_458.0
 EARTH_RADIUS_M = 6_371_000.0
@@ -78,41 +86,110 @@ def propagation_delay_ms(distance_m: float, speed_mps: float = C_LIGHT_MPS) -> f
 def hop_latency_ms(packet_bytes: int, rate_bps: float, distance_m: float, proc_ms: float = 1.0, queue_ms: float = 0.0) -> float:
     return transmission_delay_ms(packet_bytes, rate_bps) + propagation_delay_ms(distance_m) + max(0.0, proc_ms) + max(0.0, queue_ms)
 
-def path_latency_ms_for_state(path: List[int], nodes: List, packet_bytes: int = 1500,
+def link_throughput_bps_array(d_m: np.ndarray,
+                              f_ghz: float = 2.4,
+                              bw_hz: float = 1e6,
+                              pt_dbm: float = 30.0,
+                              gt_dbi: float = 0.0,
+                              gr_dbi: float = 0.0,
+                              nf_db: float = 5.0,
+                              phy_eff: float = 0.8,
+                              mac_eff: float = 0.9,
+                              code_rate: float = 0.9) -> np.ndarray:
+    """Vectorized ``link_throughput_bps_from_budget``."""
+    d_km = np.maximum(1e-6, np.asarray(d_m, dtype=float) / 1000.0)
+    if f_ghz <= 0:
+        fspl = np.zeros_like(d_km)
+    else:
+        fspl = 20.0 * np.log10(d_km) + 20.0 * math.log10(f_ghz) + 92.45
+    pr_dbm = pt_dbm + gt_dbi + gr_dbi - fspl
+    snr_lin = 10.0 ** ((pr_dbm - thermal_noise_dbm(bw_hz, nf_db)) / 10.0)
+    if bw_hz <= 0:
+        c = np.zeros_like(d_km)
+    else:
+        c = bw_hz * np.log2(1.0 + np.maximum(0.0, snr_lin))
+    eff = max(0.0, phy_eff) * max(0.0, mac_eff) * max(0.0, code_rate)
+    return np.maximum(0.0, eff * c)
+
+
+def _hop_arrays(geo: Geometry, u_rows: np.ndarray, v_rows: np.ndarray, packet_bytes: int,
+                link_kw: dict) -> Dict[str, np.ndarray]:
+    d = geo.slant_m(u_rows, v_rows)
+    bps = link_throughput_bps_array(d, **link_kw)
+    rate = np.maximum(1.0, bps)
+    # transmission + propagation + 1 ms processing, as in hop_latency_ms defaults
+    lat_ms = (packet_bytes * 8) / rate * 1000.0 + d / C_LIGHT_MPS * 1000.0 + 1.0
+    return {"distance_m": d, "throughput_bps": bps, "latency_ms": lat_ms}
+
+
+def path_metrics(path: Sequence[int], geo: Geometry, packet_bytes: int = 1500,
+                 with_hops: bool = True, **link_kw) -> dict:
+    """Latency (ms), bottleneck throughput (Mbps) and optional per-hop breakdown for one path."""
+    return batch_path_metrics([path], geo, packet_bytes=packet_bytes, with_hops=with_hops, **link_kw)[0]
+
+
+def batch_path_metrics(paths: Sequence[Sequence[int]], geo: Geometry, packet_bytes: int = 1500,
+                       with_hops: bool = False, **link_kw) -> List[dict]:
+    """Evaluate many paths in a single vectorized pass over all of their hops."""
+    per_path = [geo.hop_rows(p) if p and len(p) >= 2 else (np.empty(0, np.intp), np.empty(0, np.intp)) for p in paths]
+    counts = np.array([len(u) for u, _ in per_path], dtype=np.intp)
+    out: List[dict] = []
+    if counts.sum() == 0:
+        for _ in paths:
+            res: dict = {"latency_ms": 0.0, "throughput_mbps": 0.0}
+            if with_hops:
+                res["hops"] = []
+            out.append(res)
+        return out
+    u_rows = np.concatenate([u for u, _ in per_path])
+    v_rows = np.concatenate([v for _, v in per_path])
+    hops = _hop_arrays(geo, u_rows, v_rows, packet_bytes, link_kw)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    nonempty = counts > 0
+    lat_tot = np.zeros(len(paths))
+    thr_min = np.zeros(len(paths))
+    lat_tot[nonempty] = np.add.reduceat(hops["latency_ms"], starts[nonempty])
+    thr_min[nonempty] = np.minimum.reduceat(hops["throughput_bps"], starts[nonempty])
+    for k in range(len(paths)):
+        res = {"latency_ms": float(lat_tot[k]), "throughput_mbps": float(thr_min[k]) / 1e6}
+        if with_hops:
+            s0, s1 = int(starts[k]), int(starts[k] + counts[k])
+            res["hops"] = [
+                {
+                    "u": int(geo.ids[u_rows[j]]),
+                    "v": int(geo.ids[v_rows[j]]),
+                    "distance_km": float(hops["distance_m"][j]) / 1000.0,
+                    "throughput_mbps": float(hops["throughput_bps"][j]) / 1e6,
+                    "latency_ms": float(hops["latency_ms"][j]),
+                }
+                for j in range(s0, s1)
+            ]
+        out.append(res)
+    return out
+
+
+NodesOrGeometry = Union[List, Geometry]
+
+
+def _as_geometry(nodes: NodesOrGeometry) -> Geometry:
+    return nodes if isinstance(nodes, Geometry) else Geometry.from_nodes(nodes)
+
+
+def path_latency_ms_for_state(path: List[int], nodes: NodesOrGeometry, packet_bytes: int = 1500,
                               f_ghz: float = 2.4, bw_hz: float = 1e6, pt_dbm: float = 30.0,
                               gt_dbi: float = 0.0, gr_dbi: float = 0.0, nf_db: float = 5.0) -> float:
     if not path or len(path) < 2:
         return 0.0
-    total = 0.0
-    for i in range(len(path) - 1):
-        u_id = path[i]
-        v_id = path[i + 1]
-        a = next((n for n in nodes if n.id == u_id), None)
-        b = next((n for n in nodes if n.id == v_id), None)
-        if not a or not b:
-            continue
-        d = slant_range_m(a.lat, a.lon, getattr(a, 'alt_m', None), b.lat, b.lon, getattr(b, 'alt_m', None))
-        link_bps = link_throughput_bps_from_budget(d, f_ghz=f_ghz, bw_hz=bw_hz, pt_dbm=pt_dbm, gt_dbi=gt_dbi, gr_dbi=gr_dbi, nf_db=nf_db)
-        total += hop_latency_ms(packet_bytes, max(1.0, link_bps), d)
-    return total
-
-def path_throughput_mbps_for_state(path: List[int], nodes: List,
+    res = path_metrics(path, _as_geometry(nodes), packet_bytes=packet_bytes, with_hops=False, f_ghz=f_ghz,
+                       bw_hz=bw_hz, pt_dbm=pt_dbm, gt_dbi=gt_dbi, gr_dbi=gr_dbi, nf_db=nf_db)
+    return res["latency_ms"]
+
+
+def path_throughput_mbps_for_state(path: List[int], nodes: NodesOrGeometry,
                                    f_ghz: float = 2.4, bw_hz: float = 1e6, pt_dbm: float = 30.0,
                                    gt_dbi: float = 0.0, gr_dbi: float = 0.0, nf_db: float = 5.0) -> float:
     if not path or len(path) < 2:
         return 0.0
-    per_link = []
-    for i in range(len(path) - 1):
-        u_id = path[i]
-        v_id = path[i + 1]
-        a = next((n for n in nodes if n.id == u_id), None)
-        b = next((n for n in nodes if n.id == v_id), None)
-        if not a or not b:
-            continue
-        d = slant_range_m(a.lat, a.lon, getattr(a, 'alt_m', None), b.lat, b.lon, getattr(b, 'alt_m', None))
-        cap = link_throughput_bps_from_budget(d, f_ghz=f_ghz, bw_hz=bw_hz, pt_dbm=pt_dbm, gt_dbi=gt_dbi, gr_dbi=gr_dbi, nf_db=nf_db)
-        per_link.append(cap)
-    if not per_link:
-        return 0.0
-    path_bps = min(per_link)
-    return path_bps / 1e6
+    res = path_metrics(path, _as_geometry(nodes), with_hops=False, f_ghz=f_ghz, bw_hz=bw_hz,
+                       pt_dbm=pt_dbm, gt_dbi=gt_dbi, gr_dbi=gr_dbi, nf_db=nf_db)
+    return res["throughput_mbps"]
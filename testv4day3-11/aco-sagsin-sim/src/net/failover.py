@@ -0,0 +1,37 @@
+"""Local failover of an in-flight packet onto one of its precomputed backup paths.
+
+Used by the node agents (and the controller's packet simulation) when the
+next hop of a packet is unreachable, so they can reroute without asking the
+controller. Plain Python on node id lists: the agents import nothing heavier.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+def failover(path: Sequence[int], i: int, backups: Sequence[Sequence[int]],
+             down: Iterable[Tuple[int, int]] = ()) -> Optional[Tuple[List[int], int]]:
+    """Reroute a packet held at ``path[i]`` onto a backup; (new path, backup index) or None.
+
+    Picks the backup that meets the hops already travelled closest to
+    ``path[i]`` (ideally ``path[i]`` itself, as link-disjoint backups often
+    do), walks back to that node if needed ("crankback") and continues along
+    the backup from there. Backups whose remaining hops cross a link in
+    ``down`` (either direction) are skipped. The new path keeps ``path[:i+1]``,
+    so the packet's hop index stays valid.
+    """
+    dead = {frozenset(link) for link in down}
+    best: Optional[Tuple[int, List[int], int]] = None
+    for j, backup in enumerate(backups):
+        at = {n: x for x, n in enumerate(backup)}
+        m = next((m for m in range(i, -1, -1) if path[m] in at), None)
+        if m is None or (best is not None and m <= best[0]):
+            continue
+        tail = list(backup[at[path[m]] + 1:])
+        if not tail:
+            continue
+        new = list(path[: i + 1]) + list(path[m:i][::-1]) + tail
+        if any(frozenset((a, b)) in dead for a, b in zip(new[i:], new[i + 1:])):
+            continue
+        best = (m, new, j)
+    return None if best is None else (best[1], best[2])
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from ..types import Node
+
+EARTH_RADIUS_M = 6_371_000.0
+EARTH_RADIUS_KM = EARTH_RADIUS_M / 1000.0
+
+
+def ecef_m(lat_deg: np.ndarray, lon_deg: np.ndarray, alt_m: np.ndarray) -> np.ndarray:
+    """Spherical-earth ECEF coordinates (N, 3) in metres."""
+    lat_r = np.radians(lat_deg)
+    lon_r = np.radians(lon_deg)
+    r = EARTH_RADIUS_M + np.asarray(alt_m, dtype=float)
+    cos_lat = np.cos(lat_r)
+    return np.stack((r * cos_lat * np.cos(lon_r), r * cos_lat * np.sin(lon_r), r * np.sin(lat_r)), axis=-1)
+
+
+def chord_to_surface_km(chord: np.ndarray) -> np.ndarray:
+    """Great-circle distance (km) from the chord length between unit vectors.
+
+    Equivalent to the haversine formula: ``2R * asin(|u1 - u2| / 2)``.
+    """
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0))
+
+
+class Geometry:
+    """Per-tick coordinate cache shared by graph build, metrics and range queries.
+
+    Holds the node ids, an id->row map and (N, 3) arrays of ECEF positions (m)
+    and surface unit vectors. ``update`` refreshes the arrays once per
+    simulation tick; consumers read rows instead of recomputing trigonometry.
+    """
+
+    def __init__(self, ids: np.ndarray, lat: np.ndarray, lon: np.ndarray, alt_m: np.ndarray,
+                 kinds: Sequence[str] | None = None) -> None:
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.row: Dict[int, int] = {int(i): r for r, i in enumerate(self.ids)}
+        self.kinds: List[str] = list(kinds) if kinds is not None else [""] * len(self.ids)
+        self.version = 0
+        self.set_positions(lat, lon, alt_m)
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Node]) -> "Geometry":
+        nodes = list(nodes)
+        n = len(nodes)
+        return cls(
+            np.fromiter((int(x.id) for x in nodes), dtype=np.int64, count=n),
+            np.fromiter((float(x.lat) for x in nodes), dtype=float, count=n),
+            np.fromiter((float(x.lon) for x in nodes), dtype=float, count=n),
+            np.fromiter((float(getattr(x, "alt_m", None) or 0.0) for x in nodes), dtype=float, count=n),
+            kinds=[x.kind for x in nodes],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def set_positions(self, lat: np.ndarray, lon: np.ndarray, alt_m: np.ndarray) -> None:
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.alt_m = np.asarray(alt_m, dtype=float)
+        lat_r = np.radians(self.lat)
+        lon_r = np.radians(self.lon)
+        cos_lat = np.cos(lat_r)
+        self.unit = np.stack((cos_lat * np.cos(lon_r), cos_lat * np.sin(lon_r), np.sin(lat_r)), axis=-1)
+        self.ecef = self.unit * (EARTH_RADIUS_M + self.alt_m)[:, None]
+        self.version += 1
+
+    def update(self, nodes: Sequence[Node]) -> None:
+        """Refresh coordinates for this tick; rebuilds the id map if membership changed."""
+        if len(nodes) != len(self.ids) or any(int(n.id) != int(i) for n, i in zip(nodes, self.ids)):
+            fresh = Geometry.from_nodes(nodes)
+            self.ids, self.row, self.kinds = fresh.ids, fresh.row, fresh.kinds
+            self.set_positions(fresh.lat, fresh.lon, fresh.alt_m)
+            return
+        n = len(nodes)
+        self.set_positions(
+            np.fromiter((float(x.lat) for x in nodes), dtype=float, count=n),
+            np.fromiter((float(x.lon) for x in nodes), dtype=float, count=n),
+            np.fromiter((float(x.alt_m or 0.0) for x in nodes), dtype=float, count=n),
+        )
+
+    def rows(self, ids: Iterable[int]) -> np.ndarray:
+        return np.fromiter((self.row[int(i)] for i in ids), dtype=np.intp)
+
+    def hop_rows(self, path: Sequence[int]) -> tuple[np.ndarray, np.ndarray]:
+        """Row indices (u_rows, v_rows) of the path's hops; hops with unknown endpoints are dropped."""
+        us: List[int] = []
+        vs: List[int] = []
+        row = self.row
+        for i in range(len(path) - 1):
+            a = row.get(int(path[i]))
+            b = row.get(int(path[i + 1]))
+            if a is None or b is None:
+                continue
+            us.append(a)
+            vs.append(b)
+        return np.asarray(us, dtype=np.intp), np.asarray(vs, dtype=np.intp)
+
+    # Distances -------------------------------------------------------
+    def slant_m(self, a_rows: np.ndarray, b_rows: np.ndarray) -> np.ndarray:
+        diff = self.ecef[a_rows] - self.ecef[b_rows]
+        return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+    def surface_km(self, a_rows: np.ndarray, b_rows: np.ndarray) -> np.ndarray:
+        diff = self.unit[a_rows] - self.unit[b_rows]
+        return chord_to_surface_km(np.sqrt(np.einsum("ij,ij->i", diff, diff)))
+
+    def surface_km_block(self, a_rows: np.ndarray, b_rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """Great-circle distance matrix (len(a), len(b)) in km."""
+        ua = self.unit[a_rows]
+        ub = self.unit[b_rows]
+        # |a-b|^2 = 2 - 2 a.b for unit vectors
+        chord2 = np.maximum(0.0, 2.0 - 2.0 * (ua @ ub.T))
+        return chord_to_surface_km(np.sqrt(chord2))
+
+    def nearest(self, from_rows: np.ndarray, to_rows: np.ndarray, exclude_self: bool = True,
+                block: int = 1024) -> tuple[np.ndarray, np.ndarray]:
+        """For each of ``from_rows`` the closest of ``to_rows`` by surface distance.
+
+        Returns (row, km); row is -1 when there is no candidate.
+        """
+        from_rows = np.asarray(from_rows, dtype=np.intp)
+        to_rows = np.asarray(to_rows, dtype=np.intp)
+        best = np.full(len(from_rows), -1, dtype=np.intp)
+        best_km = np.full(len(from_rows), np.inf)
+        if len(to_rows) == 0:
+            return best, best_km
+        for s in range(0, len(from_rows), block):
+            fr = from_rows[s:s + block]
+            dots = self.unit[fr] @ self.unit[to_rows].T
+            if exclude_self:
+                dots[fr[:, None] == to_rows[None, :]] = -np.inf
+            j = np.argmax(dots, axis=1)
+            ok = np.isfinite(dots[np.arange(len(fr)), j])
+            best[s:s + block] = np.where(ok, to_rows[j], -1)
+            chord = np.sqrt(np.maximum(0.0, 2.0 - 2.0 * dots[np.arange(len(fr)), j]))
+            best_km[s:s + block] = np.where(ok, chord_to_surface_km(chord), np.inf)
+        return best, best_km
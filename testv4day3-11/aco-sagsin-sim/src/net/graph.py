@@ -1,19 +1,21 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
 
 from ..config import load_config
 from ..types import GraphState, Node, Link
+from .geometry import Geometry
 from .link_models import (
     capacity_mbps,
-    distance_km,
-    elevation_ok,
     energy_j,
     fspl_db,
     latency_ms,
     reliability,
     snr_linear,
 )
+from .visibility import MASKED_KINDS, SURFACE_KINDS, elevation_floor_deg, link_visibility
 
 
 def _max_range(kind_u: str, kind_v: str, cfg) -> float:
@@ -34,40 +36,90 @@ def _max_range(kind_u: str, kind_v: str, cfg) -> float:
     return float(cfg.max_range_km.get(key, 500))
 
 
-def build_graph(nodes: List[Node]) -> GraphState:
-    cfg = load_config()
-    links: List[Link] = []
+_KINDS = ("sat", "air", "ground", "sea")
+
+# Max pairs evaluated per block when scanning candidate links (rows x nodes)
+_BLOCK_PAIRS = 4_000_000
+
+
+def _range_table(cfg) -> np.ndarray:
+    """Symmetric (kind x kind) max-range matrix in km, indexed like ``_KINDS``."""
+    k = len(_KINDS)
+    tbl = np.empty((k, k), dtype=float)
+    for a in range(k):
+        for b in range(k):
+            tbl[a, b] = _max_range(_KINDS[a], _KINDS[b], cfg)
+    return tbl
+
+
+def _candidate_pairs(geo: Geometry, kind_codes: np.ndarray, range_tbl: np.ndarray,
+                     rows: np.ndarray | None = None):
+    """Yield (i_rows, j_rows, d_km) for pairs within range.
+
+    With ``rows=None`` every i<j pair is scanned in row-major order. Otherwise
+    only pairs touching ``rows`` are scanned; a pair with both ends in ``rows``
+    is yielded once (j > i).
+    """
+    n = len(geo)
+    scan = np.arange(n) if rows is None else np.unique(np.asarray(rows, dtype=np.intp))
+    in_scan = np.zeros(n, dtype=bool)
+    in_scan[scan] = True
+    block = max(1, _BLOCK_PAIRS // max(n, 1))
+    for s in range(0, len(scan), block):
+        rws = scan[s:s + block]
+        d = geo.surface_km_block(rws)
+        limit = range_tbl[kind_codes[rws][:, None], kind_codes[None, :]]
+        mask = d <= limit
+        mask &= ~in_scan[None, :] | (np.arange(n)[None, :] > rws[:, None])
+        ii, jj = np.nonzero(mask)
+        if len(ii):
+            yield rws[ii], jj, d[ii, jj]
+
+
+def _kind_arrays(nodes: List[Node], cfg) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    code = {k: i for i, k in enumerate(_KINDS)}
+    # unknown kinds share the default range through an extra row/column
+    kind_codes = np.array([code.get(n.kind, len(_KINDS)) for n in nodes], dtype=np.intp)
+    tbl = np.pad(_range_table(cfg), ((0, 1), (0, 1)), constant_values=500.0)
+    surface = np.array([n.kind in SURFACE_KINDS for n in nodes], dtype=bool)
+    masked = np.array([n.kind in MASKED_KINDS for n in nodes], dtype=bool)
+    return kind_codes, tbl, surface, masked
 
-    for i, u in enumerate(nodes):
-        for j, v in enumerate(nodes):
-            if j <= i:
-                continue
-            d = distance_km(u, v)
-            if d > _max_range(u.kind, v.kind, cfg):
-                continue
-            if not elevation_ok(u, v, cfg.elevation_min_deg):
-                continue
-
-            lm = cfg.link_model
-            fspl = fspl_db(d, lm.freq_hz)
-            snr = snr_linear(fspl, lm.p_tx_dbm, lm.noise_dbm)
-            cap = capacity_mbps(lm.bw_hz, snr)
-            lat = latency_ms(d, lm.proc_queue_ms)
-            ene = energy_j(lat, lm.p_tx_dbm, u.kind)
-            rel = reliability(d, (u.kind, v.kind))
-
-            links.append(
-                Link(
-                    u=u.id,
-                    v=v.id,
-                    latency_ms=lat,
-                    capacity_mbps=cap,
-                    energy_j=ene,
-                    reliability=rel,
-                    enabled=True,
-                )
+
+def _links_for_pairs(nodes: List[Node], geo: Geometry, surface: np.ndarray, masked: np.ndarray, cfg,
+                     i_rows: np.ndarray, j_rows: np.ndarray, d_km: np.ndarray) -> List[Link]:
+    """Gate a block of in-range pairs by visibility and build their links (u is the lower row)."""
+    lm = cfg.link_model
+    lo, hi = np.minimum(i_rows, j_rows), np.maximum(i_rows, j_rows)
+    # line-of-sight / elevation gate for the whole block of in-range pairs
+    floor = elevation_floor_deg(masked[lo], masked[hi], cfg.elevation_min_deg)
+    visible, _ = link_visibility(geo.ecef[lo], geo.ecef[hi], surface[lo], surface[hi], floor)
+    out: List[Link] = []
+    for i, j, d in zip(lo[visible].tolist(), hi[visible].tolist(), d_km[visible].tolist()):
+        u, v = nodes[i], nodes[j]
+
+        fspl = fspl_db(d, lm.freq_hz)
+        snr = snr_linear(fspl, lm.p_tx_dbm, lm.noise_dbm)
+        cap = capacity_mbps(lm.bw_hz, snr)
+        lat = latency_ms(d, lm.proc_queue_ms)
+        ene = energy_j(lat, lm.p_tx_dbm, u.kind)
+        rel = reliability(d, (u.kind, v.kind))
+
+        out.append(
+            Link(
+                u=u.id,
+                v=v.id,
+                latency_ms=lat,
+                capacity_mbps=cap,
+                energy_j=ene,
+                reliability=rel,
+                enabled=True,
             )
+        )
+    return out
 
+
+def _index(nodes: List[Node], links: List[Link]) -> Tuple[Dict[int, List[int]], Dict[Tuple[int, int], int]]:
     adj: Dict[int, List[int]] = {n.id: [] for n in nodes}
     edge_index: Dict[Tuple[int, int], int] = {}
     for idx, e in enumerate(links):
@@ -75,5 +127,43 @@ def build_graph(nodes: List[Node]) -> GraphState:
         adj[e.v].append(e.u)
         edge_index[(e.u, e.v)] = idx
         edge_index[(e.v, e.u)] = idx
+    return adj, edge_index
+
 
-    return GraphState(nodes=nodes, links=links, adj=adj, edge_index=edge_index)
+def build_graph(nodes: List[Node], geometry: Geometry | None = None) -> GraphState:
+    cfg = load_config()
+    links: List[Link] = []
+    geo = geometry if geometry is not None else Geometry.from_nodes(nodes)
+    kind_codes, tbl, surface, masked = _kind_arrays(nodes, cfg)
+    for i_rows, j_rows, d_km in _candidate_pairs(geo, kind_codes, tbl):
+        links.extend(_links_for_pairs(nodes, geo, surface, masked, cfg, i_rows, j_rows, d_km))
+    adj, edge_index = _index(nodes, links)
+    return GraphState(nodes=nodes, links=links, adj=adj, edge_index=edge_index, geometry=geo)
+
+
+def relink_nodes(gs: GraphState, ids: Iterable[int], removed: Iterable[int] = ()) -> GraphState:
+    """Recompute only the links touching ``ids`` (nodes that moved or joined).
+
+    ``gs.nodes`` must already hold the new positions and membership; links of
+    ``removed`` ids are dropped. Untouched links keep their objects (and their
+    enabled flag). Produces the same link set as a full ``build_graph``.
+    """
+    cfg = load_config()
+    ids = {int(i) for i in ids}
+    drop = ids | {int(i) for i in removed}
+    geo = gs.geometry
+    if geo is None:
+        geo = Geometry.from_nodes(gs.nodes)
+    else:
+        geo.update(gs.nodes)
+    links = [e for e in gs.links if e.u not in drop and e.v not in drop]
+    rows = geo.rows(i for i in ids if i in geo.row)
+    if len(rows):
+        kind_codes, tbl, surface, masked = _kind_arrays(gs.nodes, cfg)
+        for i_rows, j_rows, d_km in _candidate_pairs(geo, kind_codes, tbl, rows):
+            links.extend(_links_for_pairs(gs.nodes, geo, surface, masked, cfg, i_rows, j_rows, d_km))
+    gs.links = links
+    gs.adj, gs.edge_index = _index(gs.nodes, links)
+    gs.geometry = geo
+    gs.touch()
+    return gs
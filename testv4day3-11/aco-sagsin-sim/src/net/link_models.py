@@ -3,6 +3,8 @@ from __future__ import annotations
 import math
 from typing import Tuple
 
+import numpy as np
+
 from ..config import load_config
 from ..types import Node
 
@@ -73,8 +75,17 @@ def reliability(distance_km_val: float, kind_pair: Tuple[str, str]) -> float:
 
 
 def elevation_ok(src: Node, dst: Node, elevation_min_deg: float) -> bool:
-    # Simplified: accept if either is sat and elevation angle above horizon ~ assume ok beyond threshold distance
-    # For now, we allow all sat links; controller can refine later. Keep a basic gate.
-    if src.kind == "sat" or dst.kind == "sat":
-        return True
-    return True
+    """Scalar form of ``visibility.link_visibility`` for a single pair."""
+    from .geometry import ecef_m
+    from .visibility import MASKED_KINDS, SURFACE_KINDS, elevation_floor_deg, link_visibility
+
+    pts = ecef_m(
+        np.array([src.lat, dst.lat], dtype=float),
+        np.array([src.lon, dst.lon], dtype=float),
+        np.array([src.alt_m or 0.0, dst.alt_m or 0.0], dtype=float),
+    )
+    mask, _ = link_visibility(
+        pts[:1], pts[1:], np.array([src.kind in SURFACE_KINDS]), np.array([dst.kind in SURFACE_KINDS]),
+        elevation_floor_deg(src.kind in MASKED_KINDS, dst.kind in MASKED_KINDS, elevation_min_deg),
+    )
+    return bool(mask[0])
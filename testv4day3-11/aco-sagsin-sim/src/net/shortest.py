@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from ..types import GraphState
+
+
+def _enabled(gs: GraphState, u: int, v: int) -> bool:
+    idx = gs.edge_index.get((u, v))
+    return idx is not None and gs.links[idx].enabled
+
+
+def dijkstra(gs: GraphState, src: int, costs: Mapping[Tuple[int, int], float],
+             dst: Optional[int] = None) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """Shortest distances from ``src`` over enabled links weighted by ``costs``.
+
+    ``costs`` is the directed (u, v) -> cost map of ``compute_edge_costs``;
+    edges without a cost are skipped. Stops early once ``dst`` is settled.
+    Returns (dist, prev) for the settled nodes.
+    """
+    dist: Dict[int, float] = {src: 0.0}
+    prev: Dict[int, int] = {}
+    done = set()
+    heap = [(0.0, src)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        if u == dst:
+            break
+        for v in gs.adj.get(u, []):
+            c = costs.get((u, v))
+            if c is None or v in done or not _enabled(gs, u, v):
+                continue
+            nd = d + c
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(heap, (nd, v))
+    return {u: dist[u] for u in done}, prev
+
+
+def shortest_path(gs: GraphState, src: int, dst: int,
+                  costs: Mapping[Tuple[int, int], float]) -> Tuple[List[int], float]:
+    """Exact minimum-cost path (path, cost); ([], inf) when ``dst`` is unreachable."""
+    dist, prev = dijkstra(gs, src, costs, dst)
+    if dst not in dist:
+        return [], float("inf")
+    path = [dst]
+    while path[-1] != src:
+        path.append(prev[path[-1]])
+    path.reverse()
+    return path, dist[dst]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .geometry import EARTH_RADIUS_KM, Geometry, chord_to_surface_km
+
+
+def _unit(lat: float, lon: float) -> np.ndarray:
+    la, lo = np.radians(lat), np.radians(lon)
+    return np.array([np.cos(la) * np.cos(lo), np.cos(la) * np.sin(lo), np.sin(la)])
+
+
+def _chord_for_km(radius_km: float) -> float:
+    """Chord length between unit vectors that are ``radius_km`` apart on the surface."""
+    ang = min(float(radius_km) / EARTH_RADIUS_KM, np.pi)
+    return 2.0 * np.sin(ang / 2.0)
+
+
+class SpatialIndex:
+    """KD-trees over the geometry's surface unit vectors, one for all nodes and one per kind.
+
+    Trees are built lazily and rebuilt only when the geometry's ``version``
+    changes (i.e. once per position update), so queries between ticks reuse
+    them. Distances are great-circle km on the surface, like
+    ``Geometry.surface_km``. Results are (rows, km) sorted by distance.
+    """
+
+    def __init__(self, geo: Geometry) -> None:
+        self.geo = geo
+        self._version = -1
+        self._trees: Dict[Optional[str], Tuple[cKDTree, np.ndarray]] = {}
+
+    def _tree(self, kind: Optional[str]) -> Tuple[cKDTree, np.ndarray]:
+        if self._version != self.geo.version:
+            self._trees.clear()
+            self._version = self.geo.version
+        hit = self._trees.get(kind)
+        if hit is None:
+            if kind is None:
+                rows = np.arange(len(self.geo), dtype=np.intp)
+            else:
+                rows = np.flatnonzero(np.asarray(self.geo.kinds, dtype=object) == kind).astype(np.intp)
+            hit = (cKDTree(self.geo.unit[rows]) if len(rows) else None, rows)  # type: ignore[assignment]
+            self._trees[kind] = hit
+        return hit
+
+    def nearest(self, lat: float, lon: float, k: int = 1, kind: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        tree, rows = self._tree(kind)
+        k = min(int(k), len(rows))
+        if tree is None or k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        chord, idx = tree.query(_unit(lat, lon), k=k)
+        chord, idx = np.atleast_1d(chord), np.atleast_1d(idx)
+        return rows[idx], chord_to_surface_km(chord)
+
+    def within(self, lat: float, lon: float, radius_km: float,
+               kind: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        tree, rows = self._tree(kind)
+        if tree is None:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        q = _unit(lat, lon)
+        idx = np.asarray(tree.query_ball_point(q, r=_chord_for_km(radius_km)), dtype=np.intp)
+        if not len(idx):
+            return idx, np.empty(0)
+        km = chord_to_surface_km(np.linalg.norm(self.geo.unit[rows[idx]] - q, axis=1))
+        order = np.argsort(km, kind="stable")
+        return rows[idx[order]], km[order]
+
+    def bbox(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float,
+             kind: Optional[str] = None) -> np.ndarray:
+        """Rows inside a lat/lon box; ``min_lon > max_lon`` means the box crosses the antimeridian."""
+        _, rows = self._tree(kind)
+        lat = self.geo.lat[rows]
+        lon = self.geo.lon[rows]
+        in_lat = (lat >= min_lat) & (lat <= max_lat)
+        if min_lon <= max_lon:
+            in_lon = (lon >= min_lon) & (lon <= max_lon)
+        else:
+            in_lon = (lon >= min_lon) | (lon <= max_lon)
+        return rows[in_lat & in_lon]
+
+    def nearest_rows(self, from_rows: np.ndarray, kind: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """For each row the closest other node (optionally of ``kind``); row -1 when none."""
+        tree, rows = self._tree(kind)
+        from_rows = np.asarray(from_rows, dtype=np.intp)
+        best = np.full(len(from_rows), -1, dtype=np.intp)
+        best_km = np.full(len(from_rows), np.inf)
+        if tree is None or not len(from_rows):
+            return best, best_km
+        k = min(2, len(rows))
+        chord, idx = tree.query(self.geo.unit[from_rows], k=k)
+        chord, idx = chord.reshape(len(from_rows), k), idx.reshape(len(from_rows), k)
+        cand = rows[idx]
+        # skip the query node itself when it is part of the searched set
+        pick = np.where(cand[:, 0] == from_rows, 1, 0)
+        ok = pick < k
+        pick = np.minimum(pick, k - 1)
+        r = np.arange(len(from_rows))
+        chosen = cand[r, pick]
+        ok &= chosen != from_rows
+        best[ok] = chosen[ok]
+        best_km[ok] = chord_to_surface_km(chord[r, pick][ok])
+        return best, best_km
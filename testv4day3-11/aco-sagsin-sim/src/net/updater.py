@@ -1,31 +1,89 @@
 from __future__ import annotations
 
-import random
-from typing import List
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+import numpy as np
 
 from ..config import load_config
-from ..types import GraphState
-from .graph import build_graph
+from ..types import GraphState, Node
+from .graph import build_graph, relink_nodes
+
+if TYPE_CHECKING:
+    from ..data.aircraft import AircraftDelta, AircraftStore
 
 
-def update_epoch(state: GraphState) -> GraphState:
+def update_epoch(state: GraphState, rng: Optional[np.random.Generator] = None) -> GraphState:
+    """Advance one simulation tick; link flips are drawn from ``rng`` (fresh entropy if None).
+
+    The flipped links are left in ``state.last_flips`` so caches can react to just those.
+    """
     cfg = load_config()
+    rng = rng if rng is not None else np.random.default_rng()
     # For simplicity, jitter link enabled state to simulate dynamics
-    for e in state.links:
-        if random.random() < 0.05:
-            e.enabled = not e.enabled
+    flips = []
+    for i in np.flatnonzero(rng.random(len(state.links)) < 0.05).tolist():
+        e = state.links[i]
+        e.enabled = not e.enabled
+        flips.append((e.u, e.v))
+    state.last_flips = flips
     # Could also move air nodes slightly; omitted for brevity
+    # refresh the shared coordinate cache once per tick
+    if state.geometry is not None:
+        state.geometry.update(state.nodes)
+    state.touch()
     return state
 
 
+def apply_aircraft_delta(state: GraphState, store: "AircraftStore", delta: "AircraftDelta") -> GraphState:
+    """Mirror the live aircraft store into the graph, relinking only changed aircraft.
+
+    Air nodes not owned by the store (the seeded snapshot) are superseded by
+    the live feed and dropped on the first sync; the feed is opt-in
+    (``live_aircraft``) and capped to the air share of ``node_limit``.
+    """
+    drop = set(delta.removed)
+    drop.update(n.id for n in state.nodes if n.kind == "air" and not store.owns(n.id))
+    nodes = [n for n in state.nodes if n.id not in drop]
+    pos = {n.id: i for i, n in enumerate(nodes)}
+    touched = set(delta.added) | set(delta.moved)
+    # owned aircraft missing from the graph (e.g. after a rebuild) are re-added
+    touched.update(store.node_id(icao) for icao in store.slot if store.node_id(icao) not in pos)
+    if not drop and not touched:
+        return state
+    for nid in sorted(touched):
+        fresh = store.node(nid)
+        i = pos.get(nid)
+        if i is None:
+            nodes.append(fresh)
+        else:
+            n = nodes[i]
+            n.lat, n.lon, n.alt_m = fresh.lat, fresh.lon, fresh.alt_m
+    state.nodes = nodes
+    return relink_nodes(state, touched, drop)
+
+
 def rebuild_from_nodes(nodes_json_path: str) -> GraphState:
-    import json
+    from ..data.nodeset import NodeSet, columnar_path, has_fresh_columnar, read_json_nodes
+
+    # prefer the memory-mapped columnar dataset when it is current; its
+    # coordinate columns back the geometry cache without copying
+    if has_fresh_columnar(nodes_json_path):
+        ns = NodeSet(columnar_path(nodes_json_path))
+        return build_graph(ns.nodes(), geometry=ns.geometry())
+    return build_graph(read_json_nodes(nodes_json_path))
 
-    with open(nodes_json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    nodes = []
-    from ..types import Node
 
-    for n in data:
-        nodes.append(Node(**n))
+def rebuild_from_records(records: Iterable[dict]) -> GraphState:
+    """Build the graph from node records as they stream off a DB cursor (no temp file)."""
+    nodes = [
+        Node(
+            id=int(r["id"]),
+            kind=r["kind"],
+            lat=float(r["lat"]),
+            lon=float(r["lon"]),
+            alt_m=float(r.get("alt_m") or 0.0),
+            name=r.get("name") or "",
+        )
+        for r in records
+    ]
     return build_graph(nodes)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .geometry import EARTH_RADIUS_M
+
+# Kinds that sit on the Earth's surface; their links to elevated nodes are gated
+# by the elevation angle seen from the surface end.
+SURFACE_KINDS = frozenset({"ground", "sea"})
+# Kinds whose links from the surface honour ``elevation_min_deg``: the mask is a
+# satellite-terminal constraint. Surface <-> air links only need the aircraft
+# above the horizon, so their configured range stays the effective limit.
+MASKED_KINDS = frozenset({"sat"})
+
+
+def segment_clears_earth(p1: np.ndarray, p2: np.ndarray, radius_m: float = EARTH_RADIUS_M) -> np.ndarray:
+    """True where the straight segment p1->p2 stays outside the sphere.
+
+    ``p1``/``p2`` are (N, 3) ECEF arrays in metres; the check finds the point
+    of the segment closest to the Earth's centre and compares it with ``radius_m``.
+    """
+    p1 = np.atleast_2d(np.asarray(p1, dtype=float))
+    p2 = np.atleast_2d(np.asarray(p2, dtype=float))
+    d = p2 - p1
+    a = np.einsum("ij,ij->i", d, d)
+    b = np.einsum("ij,ij->i", p1, d)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(a > 0, -b / a, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    closest = p1 + t[:, None] * d
+    return np.einsum("ij,ij->i", closest, closest) >= radius_m * radius_m
+
+
+def elevation_deg(observer: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Elevation angle (deg) of ``target`` above the local horizon of ``observer``.
+
+    Both are (N, 3) ECEF arrays; the local vertical is the radial direction
+    (spherical Earth, matching the rest of the geometry helpers).
+    """
+    observer = np.atleast_2d(np.asarray(observer, dtype=float))
+    target = np.atleast_2d(np.asarray(target, dtype=float))
+    los = target - observer
+    up = observer / np.linalg.norm(observer, axis=1, keepdims=True)
+    dist = np.linalg.norm(los, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(dist > 0, np.einsum("ij,ij->i", los, up) / dist, 1.0)
+    return np.degrees(np.arcsin(np.clip(s, -1.0, 1.0)))
+
+
+def elevation_floor_deg(masked_u: np.ndarray, masked_v: np.ndarray, elevation_min_deg: float) -> np.ndarray:
+    """Per-pair minimum elevation: ``elevation_min_deg`` where either end is a masked kind, else 0."""
+    masked = np.asarray(masked_u, dtype=bool) | np.asarray(masked_v, dtype=bool)
+    return np.where(masked, float(elevation_min_deg), 0.0)
+
+
+def link_visibility(ecef_u: np.ndarray, ecef_v: np.ndarray, surface_u: np.ndarray, surface_v: np.ndarray,
+                    elevation_min_deg: float | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Visibility mask and elevation angles for a batch of candidate links.
+
+    - surface <-> elevated: elevation of the elevated end, seen from the surface
+      end, must be at least ``elevation_min_deg`` (a scalar, or one value per
+      pair as from ``elevation_floor_deg``);
+    - elevated <-> elevated: the segment must not pass through the Earth;
+    - surface <-> surface: not gated here (short ranges handle it).
+
+    Returns ``(mask, elev_deg)``; ``elev_deg`` is NaN where no surface end exists.
+    """
+    surface_u = np.asarray(surface_u, dtype=bool)
+    surface_v = np.asarray(surface_v, dtype=bool)
+    n = len(surface_u)
+    mask = np.ones(n, dtype=bool)
+    elev = np.full(n, np.nan)
+
+    floor = np.broadcast_to(np.asarray(elevation_min_deg, dtype=float), (n,))
+    mixed = surface_u ^ surface_v
+    if mixed.any():
+        obs = np.where(surface_u[mixed, None], ecef_u[mixed], ecef_v[mixed])
+        tgt = np.where(surface_u[mixed, None], ecef_v[mixed], ecef_u[mixed])
+        e = elevation_deg(obs, tgt)
+        elev[mixed] = e
+        mask[mixed] = e >= floor[mixed]
+
+    aloft = ~surface_u & ~surface_v
+    if aloft.any():
+        mask[aloft] = segment_clears_earth(ecef_u[aloft], ecef_v[aloft])
+    return mask, elev
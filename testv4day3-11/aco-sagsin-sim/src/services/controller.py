@@ -4,25 +4,39 @@ import json
 import os
 import threading
 import time
+from dataclasses import replace
 from pathlib import Path
 import math
 from typing import Optional
 import uuid
 import queue
 
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 import logging
 
-from ..aco.solver import ACO
-from ..config import Config, load_config
+from ..aco import jit
+from ..aco.csr import item_view
+from ..aco.disjoint import DISJOINT_MODES, disjoint_paths
+from ..aco.islands import IslandACO
+from ..aco.routes import RouteCache, pheromone_weight
+from ..aco.solver import ACO, SolveResult
+from ..config import Config, load_config, reload_config
+from ..data import fetch_opensky
+from ..data.aircraft import AircraftStore, select_states
+from ..data.selection import kind_cap
 from ..logging_setup import setup_logging
+from ..net.failover import failover
+from ..net.geometry import Geometry
 from ..net.graph import build_graph
-from ..net.updater import rebuild_from_nodes, update_epoch
+from ..net.spatial import SpatialIndex
+from ..net.updater import apply_aircraft_delta, rebuild_from_nodes, rebuild_from_records, update_epoch
 from ..types import GraphState, Link, Node
 from ..lib import metrics as metrics_lib
+from . import listing, positions
 
 app = FastAPI(title="ACO SAGSIN Controller")
 
@@ -33,6 +47,8 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    # let browser clients read the pagination / caching headers of /nodes and /links
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
 )
 
 STATE_LOCK = threading.Lock()
@@ -40,6 +56,15 @@ STATE: Optional[GraphState] = None
 CFG: Optional[Config] = None
 NODES_PATH = Path("data/generated/nodes.json")
 SPEED_MULTIPLIER: float = 1.0
+# live aircraft keyed by icao24; created on the first successful OpenSky poll
+AIRCRAFT: Optional[AircraftStore] = None
+# OpenSky 429 backoff: monotonic time of the next allowed poll and the current wait
+_AIR_RETRY_AT: float = 0.0
+_AIR_WAIT_S: float = 0.0
+# drives the simulator's link flips; reseeded from cfg.seed at startup or via /simulate/seed
+SIM_RNG: np.random.Generator = np.random.default_rng()
+# solved routes by (src, dst, weights); repaired in place when links they use go down
+ROUTES = RouteCache()
 
 # In-memory SSE broadcaster for packet progress events
 SUBSCRIBERS: list[queue.Queue[str]] = []
@@ -70,6 +95,83 @@ def _broadcast(evt: dict) -> None:
             pass
 
 
+def _geometry(gs: GraphState) -> Geometry:
+    """Per-tick coordinate cache of the graph; built lazily for states without one."""
+    if gs.geometry is None:
+        gs.geometry = Geometry.from_nodes(gs.nodes)
+    return gs.geometry
+
+
+_SPATIAL: Optional[SpatialIndex] = None
+
+
+def _spatial(gs: GraphState) -> SpatialIndex:
+    """Spatial index over the current geometry; its trees rebuild when positions change."""
+    global _SPATIAL
+    geo = _geometry(gs)
+    if _SPATIAL is None or _SPATIAL.geo is not geo:
+        _SPATIAL = SpatialIndex(geo)
+    return _SPATIAL
+
+
+def _node_out(n: Node) -> dict:
+    d = dict(n.__dict__)
+    if not d.get("name"):
+        d["name"] = f"{n.kind}-{n.id}"
+    return d
+
+
+def _route_solver(gs: GraphState, weights=None):
+    """Single-colony ACO, or the island model on large graphs when ``aco.islands > 1``."""
+    p = load_config().aco
+    if p.islands > 1 and len(gs.nodes) >= p.island_min_nodes:
+        return IslandACO(gs, weights_override=weights)
+    return ACO(gs, weights_override=weights)
+
+
+def _route_cache(cfg: Config) -> RouteCache:
+    return RouteCache(cfg.aco.route_cache, cfg.aco.repair_pheromone, cfg.aco.tau0)
+
+
+def _repair_summary(rep) -> dict:
+    return {"affected": rep.affected, "repaired": rep.repaired, "dropped": rep.dropped,
+            "ms": round(rep.ms, 3)}
+
+
+def _disjoint_args(k_paths: Optional[int], disjoint: Optional[str]) -> tuple[int, str]:
+    """Validated (backups wanted, disjointness mode); None falls back to the aco config."""
+    p = load_config().aco
+    k = p.backup_paths + 1 if k_paths is None else k_paths
+    mode = (disjoint or p.disjoint).lower()
+    if k < 1:
+        raise HTTPException(422, "k_paths must be >= 1")
+    if mode not in DISJOINT_MODES:
+        raise HTTPException(422, f"disjoint must be one of {', '.join(DISJOINT_MODES)}")
+    return k - 1, mode
+
+
+def _backups(gs: GraphState, graph, tau, path: list[int], k: int, mode: str) -> list[tuple[list[int], float]]:
+    """Up to ``k`` paths disjoint from ``path`` and each other, found on the solve's graph.
+
+    Weighted by the solve's pheromone like cached-route repairs; costs are plain.
+    """
+    if k <= 0 or len(path) < 2:
+        return []
+    p = load_config().aco
+    w = pheromone_weight(graph, tau, p.tau0, p.repair_pheromone)
+    return disjoint_paths(graph, path[0], path[-1], k, nodes=mode == "node",
+                          weight=None if w is None else item_view(w[0]), avoid=path, gs=gs,
+                          floor=1.0 if w is None else w[1])
+
+
+def _link_up(u: int, v: int) -> bool:
+    with STATE_LOCK:
+        if STATE is None:
+            return False
+        idx = STATE.edge_index.get((u, v))
+        return idx is not None and STATE.links[idx].enabled
+
+
 def _bfs_path(gs: GraphState, src: int, dst: int) -> list[int]:
     """Unweighted shortest-path fallback using enabled edges only.
     Returns a list of node ids from src to dst if reachable, else [].
@@ -107,6 +209,17 @@ class RouteReq(BaseModel):
     src: int
     dst: int
     objective: Optional[dict] = None
+    # wall-clock budget for the ACO search; the best path so far is returned when it expires
+    deadline_ms: Optional[float] = None
+    # seeds the colony's generator; the response echoes the seed used so a route can be replayed
+    seed: Optional[int] = None
+    # answer from the route cache (possibly a repaired route) when it holds this pair; seeded
+    # requests always solve
+    cached: bool = True
+    # paths to return: the route plus k_paths - 1 backups sharing no link ("link") or no
+    # intermediate node ("node") with it or each other
+    k_paths: int = 1
+    disjoint: Optional[str] = None
 
 
 class ToggleReq(BaseModel):
@@ -121,6 +234,16 @@ class SendPacketReq(BaseModel):
     protocol: str = "UDP"
     message: Optional[str] = None
     path: Optional[list[int]] = None  # optional precomputed path for TCP relay
+    seed: Optional[int] = None
+    # backup paths the node agents fail over to locally; computed when not given
+    # (k_paths - 1 of them, default aco.backup_paths)
+    backups: Optional[list[list[int]]] = None
+    k_paths: Optional[int] = None
+    disjoint: Optional[str] = None
+
+
+class SeedReq(BaseModel):
+    seed: Optional[int] = None  # None = fresh entropy
 
 
 @app.get("/")
@@ -130,12 +253,16 @@ def root():
         "docs": "/docs",
         "endpoints": [
             "/nodes",
+            "/nodes/nearest",
+            "/nodes/within",
+            "/nodes/bbox",
             "/links",
             "/route",
             "/simulate/toggle-link",
             "/simulate/set-epoch",
             "/simulate/send-packet",
             "/events",
+            "/stream/positions",
             "/config/reload",
             "/health",
             "/health/db",
@@ -162,28 +289,36 @@ def health_db():
         return {"enable_db": bool(CFG.enable_db) if CFG else False, "available": False}
 
 
+def _state_from_db() -> Optional[GraphState]:
+    """Graph built from the per-node documents in MongoDB, or None when unavailable/empty."""
+    try:
+        if not CFG or not CFG.enable_db:
+            return None
+        from ..data.db import available as _db_available, iter_nodes as _iter_nodes
+
+        if not _db_available():
+            return None
+        gs = rebuild_from_records(_iter_nodes())
+        return gs if gs.nodes else None
+    except Exception:
+        logging.getLogger(__name__).warning("reading nodes from MongoDB failed", exc_info=True)
+        return None
+
+
 @app.on_event("startup")
 def on_start() -> None:
     setup_logging()
-    global CFG, STATE
+    global CFG, STATE, SIM_RNG, ROUTES, AIRCRAFT
     CFG = load_config()
+    SIM_RNG = np.random.default_rng(CFG.seed)
+    ROUTES = _route_cache(CFG)
+    # the store's id range is taken from the node set it starts on
+    AIRCRAFT = None
     log = logging.getLogger(__name__)
     nodes_source_path = str(NODES_PATH)
-    use_db_nodes = False
     # Attempt DB nodes first when enabled
-    try:
-        if CFG.enable_db:
-            from ..data.db import read_nodes as _read_nodes, available as _db_available
-            if _db_available():
-                db_nodes = _read_nodes()
-                if db_nodes:
-                    # Write to temp file for rebuild convenience
-                    NODES_PATH.parent.mkdir(parents=True, exist_ok=True)
-                    with open(NODES_PATH, "w", encoding="utf-8") as f:
-                        json.dump(db_nodes, f)
-                    use_db_nodes = True
-    except Exception:
-        pass
+    db_state = _state_from_db()
+    use_db_nodes = db_state is not None
     if not use_db_nodes and not NODES_PATH.exists():
         # fallback toy nodes if neither DB nor file nodes are present
         toy = [
@@ -195,16 +330,65 @@ def on_start() -> None:
         with open(NODES_PATH, "w", encoding="utf-8") as f:
             json.dump(toy, f)
     if use_db_nodes:
-        log.info("Loaded nodes from MongoDB (written to %s)", NODES_PATH)
-    elif NODES_PATH.exists():
-        log.info("Loaded nodes from file %s", NODES_PATH)
+        log.info("Loaded %d nodes from MongoDB", len(db_state.nodes))
+        STATE = db_state
     else:
-        log.info("Loaded toy nodes (fallback)")
-    STATE = rebuild_from_nodes(nodes_source_path)
+        if NODES_PATH.exists():
+            log.info("Loaded nodes from file %s", NODES_PATH)
+        else:
+            log.info("Loaded toy nodes (fallback)")
+        STATE = rebuild_from_nodes(nodes_source_path)
 
     # start epoch thread
     th = threading.Thread(target=_epoch_loop, daemon=True)
     th.start()
+    threading.Thread(target=_positions_loop, daemon=True).start()
+    if jit.use_jit(CFG.aco):
+        # compile the ant kernels off the request path
+        threading.Thread(target=jit.warmup, daemon=True).start()
+
+
+def _poll_aircraft() -> None:
+    """Fold one OpenSky snapshot into the graph; only added/moved/expired aircraft are relinked.
+
+    Opt-in via ``live_aircraft``. States go through the seeder's selection
+    (bbox, continent, the air share of ``node_limit``); a 429 pauses polling
+    for the wait OpenSky asks for, else for a doubling interval.
+    """
+    global STATE, AIRCRAFT, _AIR_RETRY_AT, _AIR_WAIT_S
+    if CFG is None or CFG.offline or not CFG.enable_air or not CFG.live_aircraft:
+        return
+    now = time.monotonic()
+    if now < _AIR_RETRY_AT:
+        return
+    try:
+        states = fetch_opensky.fetch_states()  # network I/O outside the state lock
+    except fetch_opensky.RateLimited as e:
+        _AIR_WAIT_S = min(max(2.0 * _AIR_WAIT_S, float(CFG.epoch_sec)), 3600.0)
+        wait = e.retry_after if e.retry_after is not None else _AIR_WAIT_S
+        _AIR_RETRY_AT = now + wait
+        logging.getLogger(__name__).warning("aircraft: OpenSky rate limit, next poll in %.0f s", wait)
+        return
+    _AIR_WAIT_S = 0.0
+    if not states:
+        return
+    with STATE_LOCK:
+        if STATE is None:
+            return
+        if AIRCRAFT is None:
+            base = max((n.id for n in STATE.nodes), default=-1) + 1
+            AIRCRAFT = AircraftStore(id_base=base, timeout_s=max(60.0, 3.0 * CFG.epoch_sec))
+        cap = kind_cap(CFG, "air", others=sum(1 for n in STATE.nodes if n.kind != "air"))
+        delta = AIRCRAFT.apply(select_states(states, CFG, AIRCRAFT.slot, cap))
+        air = {n.id for n in STATE.nodes if n.kind == "air"}
+        STATE = apply_aircraft_delta(STATE, AIRCRAFT, delta)
+        # relinked aircraft may have lost links; routes through them are re-solved on demand
+        gone = air.difference(n.id for n in STATE.nodes)
+        ROUTES.drop_nodes(gone.union(delta.moved, delta.removed))
+    if delta:
+        logging.getLogger(__name__).info(
+            "aircraft: +%d ~%d -%d", len(delta.added), len(delta.moved), len(delta.removed)
+        )
 
 
 def _epoch_loop() -> None:
@@ -213,29 +397,87 @@ def _epoch_loop() -> None:
         time.sleep(CFG.epoch_sec if CFG else 10)
         with STATE_LOCK:
             if STATE is not None:
-                STATE = update_epoch(STATE)
+                STATE = update_epoch(STATE, SIM_RNG)
+                ROUTES.links_down(STATE, STATE.last_flips)
+        try:
+            _poll_aircraft()
+        except Exception:
+            logging.getLogger(__name__).exception("aircraft poll failed")
+
+
+_PAGES = listing.PageCache()
+_FORMAT_PATTERN = "^(json|columns|msgpack)$"
+
+
+def _listing(request: Request, name: str, items: list, to_row, allowed: tuple,
+             fields: Optional[str], cursor: Optional[str], limit: Optional[int], fmt: str) -> Response:
+    """Serve one page of ``items`` for the current graph version (caller holds STATE_LOCK).
+
+    Pages are rendered and compressed once per graph version and query; the
+    ETag is derived from the same key so unchanged polls get a 304.
+    """
+    try:
+        cols = listing.parse_fields(fields, allowed)
+        offset = listing.decode_cursor(cursor, STATE.version) if cursor else 0
+        if fmt == "msgpack" and not listing.MSGPACK_AVAILABLE:
+            raise listing.ListingError(406, "msgpack encoding is not available")
+    except listing.ListingError as e:
+        raise HTTPException(e.status, str(e))
+    key = (name, STATE.version, cols, offset, limit, fmt)
+    etag = listing.etag_for(key)
+    if listing.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    def build() -> listing.Page:
+        end = len(items) if limit is None else min(len(items), offset + limit)
+        rows = [to_row(x) for x in items[offset:end]]
+        nxt = listing.encode_cursor(STATE.version, end) if end < len(items) else None
+        body = listing.render(rows, cols, fmt)
+        return listing.Page(body, listing.MEDIA_TYPES[fmt], etag, len(items), nxt)
+
+    page = _PAGES.get_or_render(key, build)
+    body, encoding = page.encoded(listing.negotiate(request.headers.get("accept-encoding", "")))
+    headers = {"ETag": page.etag, "X-Total-Count": str(page.total), "Vary": "Accept-Encoding"}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=page.media_type, headers=headers)
 
 
 @app.get("/nodes")
-def get_nodes():
+def get_nodes(
+    request: Request,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    format: str = Query("json", pattern=_FORMAT_PATTERN),
+):
     with STATE_LOCK:
         if not STATE:
             return []
-        out = []
-        for n in STATE.nodes:
-            d = dict(n.__dict__)
-            if not d.get("name"):
-                d["name"] = f"{n.kind}-{n.id}"
-            out.append(d)
-        return out
+        return _listing(request, "nodes", STATE.nodes, _node_out, listing.NODE_FIELDS, fields, cursor, limit, format)
 
 
 @app.get("/links")
-def get_links():
+def get_links(
+    request: Request,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    format: str = Query("json", pattern=_FORMAT_PATTERN),
+):
     with STATE_LOCK:
         if not STATE:
             return []
-        return [l.__dict__ for l in STATE.links]
+        return _listing(request, "links", STATE.links, lambda l: l.__dict__, listing.LINK_FIELDS,
+                        fields, cursor, limit, format)
+
+
+def _position_inputs():
+    """Snapshot (ids, kinds, lat, lon, alt_m) of the current geometry; caller holds STATE_LOCK."""
+    geo = _geometry(STATE)
+    return geo.ids, geo.kinds, geo.lat, geo.lon, geo.alt_m
 
 
 @app.get("/nodes/positions")
@@ -243,29 +485,110 @@ def nodes_positions():
     """Return dynamic positions for moving kinds (sat, air, sea) with simple drift.
     Longitudes drift over time; latitudes apply small jitter for air/sea.
     """
-    import math
     now = time.time()
     with STATE_LOCK:
         if not STATE:
             return []
-        # movement parameters (can later be driven by config.yaml)
-        kinds_move = {"sat", "air", "sea"}
-        deg_per_sec = {"sat": 0.15, "air": 0.02, "sea": 0.005}
-        jitter_km = {"air": 1.0, "sea": 0.2, "sat": 0.0}
-        out = []
-        for n in STATE.nodes:
-            lat = float(n.lat)
-            lon = float(n.lon)
-            if n.kind in kinds_move:
-                dps = float(deg_per_sec.get(n.kind, 0.0))
-                # drift longitude, wrap [-180,180]
-                lon = ((lon + dps * now * SPEED_MULTIPLIER + 180.0) % 360.0) - 180.0
-                jk = float(jitter_km.get(n.kind, 0.0))
-                if jk > 0:
-                    # ~1 deg ~ 111km
-                    lat = max(-90.0, min(90.0, lat + (math.sin((now * SPEED_MULTIPLIER) / 17.0 + n.id) * jk) / 111.0))
-            out.append({"id": int(n.id), "lat": lat, "lon": lon, "alt_km": float(n.alt_m) / 1000.0})
-        return out
+        ids, kinds, lat0, lon0, alt_m = _position_inputs()
+    lat, lon = positions.compute_positions(ids, kinds, lat0, lon0, now, SPEED_MULTIPLIER)
+    return [
+        {"id": i, "lat": a, "lon": o, "alt_km": h}
+        for i, a, o, h in zip(ids.tolist(), lat.tolist(), lon.tolist(), (alt_m / 1000.0).tolist())
+    ]
+
+
+POSITIONS = positions.PositionStream()
+POSITIONS_TICK_SEC = float(os.getenv("POSITIONS_TICK_SEC", "1.0"))
+
+
+def _positions_loop() -> None:
+    """Compute positions once per tick and push deltas to every /stream/positions client."""
+    while True:
+        time.sleep(POSITIONS_TICK_SEC)
+        if not POSITIONS.has_subscribers():
+            continue
+        try:
+            with STATE_LOCK:
+                if not STATE:
+                    continue
+                ids, kinds, lat0, lon0, alt_m = _position_inputs()
+            lat, lon = positions.compute_positions(ids, kinds, lat0, lon0, time.time(), SPEED_MULTIPLIER)
+            POSITIONS.publish(ids, lat, lon, alt_m / 1000.0)
+        except Exception:
+            logging.getLogger(__name__).exception("positions tick failed")
+
+
+@app.get("/stream/positions")
+def stream_positions():
+    """SSE stream of ``positions`` frames: a key frame with all nodes, then only moved nodes.
+
+    Each frame's ``data`` is base64 of int32 ids then float32 lat, lon, alt_km columns.
+    """
+    q = POSITIONS.subscribe()
+
+    def _gen():
+        try:
+            yield ":ok\n\n"
+            while True:
+                try:
+                    yield q.get(timeout=15)
+                except queue.Empty:
+                    yield ":keepalive\n\n"
+        finally:
+            POSITIONS.unsubscribe(q)
+
+    return StreamingResponse(_gen(), media_type="text/event-stream")
+
+
+_KIND_PATTERN = "^(sat|air|ground|sea)$"
+
+
+@app.get("/nodes/nearest")
+def nodes_nearest(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(1, ge=1, le=1000),
+    kind: Optional[str] = Query(None, pattern=_KIND_PATTERN),
+):
+    """The ``k`` nodes closest to a point by surface distance, nearest first."""
+    with STATE_LOCK:
+        if not STATE:
+            return []
+        rows, km = _spatial(STATE).nearest(lat, lon, k, kind)
+        return [{**_node_out(STATE.nodes[r]), "distance_km": d} for r, d in zip(rows.tolist(), km.tolist())]
+
+
+@app.get("/nodes/within")
+def nodes_within(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0),
+    kind: Optional[str] = Query(None, pattern=_KIND_PATTERN),
+):
+    """Nodes within ``radius_km`` of a point, nearest first."""
+    with STATE_LOCK:
+        if not STATE:
+            return []
+        rows, km = _spatial(STATE).within(lat, lon, radius_km, kind)
+        return [{**_node_out(STATE.nodes[r]), "distance_km": d} for r, d in zip(rows.tolist(), km.tolist())]
+
+
+@app.get("/nodes/bbox")
+def nodes_bbox(
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lon: float = Query(..., ge=-180, le=180),
+    kind: Optional[str] = Query(None, pattern=_KIND_PATTERN),
+):
+    """Nodes inside a lat/lon box; ``min_lon > max_lon`` wraps across the antimeridian."""
+    if min_lat > max_lat:
+        raise HTTPException(400, "min_lat must be <= max_lat")
+    with STATE_LOCK:
+        if not STATE:
+            return []
+        rows = _spatial(STATE).bbox(min_lat, max_lat, min_lon, max_lon, kind)
+        return [_node_out(STATE.nodes[r]) for r in rows.tolist()]
 
 
 @app.get("/simulate/get-speed")
@@ -300,8 +623,24 @@ def post_route(req: RouteReq):
             w = req.objective["weights"]
             if isinstance(w, list) and len(w) == 4:
                 weights = (float(w[0]), float(w[1]), float(w[2]), float(w[3]))
-        aco = ACO(STATE, weights_override=weights)
-        path, cost = aco.solve(req.src, req.dst)
+        if req.deadline_ms is not None and req.deadline_ms < 0:
+            raise HTTPException(422, "deadline_ms must be >= 0")
+        if req.seed is not None and req.seed < 0:
+            raise HTTPException(422, "seed must be >= 0")
+        n_backups, mode = _disjoint_args(req.k_paths, req.disjoint)
+        key = (int(req.src), int(req.dst), weights)
+        hit = ROUTES.get(key, STATE) if req.cached and req.seed is None else None
+        if hit is not None:
+            # report the solve that found the route; nothing was searched for this request
+            res = replace(hit.solve or SolveResult(), path=list(hit.path), cost=hit.cost, elapsed_ms=0.0)
+            graph, tau = hit.graph, hit.tau
+        else:
+            aco = _route_solver(STATE, weights)
+            res = aco.run(req.src, req.dst, deadline_ms=req.deadline_ms, seed=req.seed)
+            graph, tau = aco.graph, getattr(aco, "tau", None)
+            if res.path:
+                ROUTES.put(key, res.path, res.cost, graph, tau, res)
+        path, cost = res.path, res.cost
         try:
             import logging
 
@@ -324,14 +663,37 @@ def post_route(req: RouteReq):
                 cost = acc
             except Exception:
                 cost = float('nan')
+        backups = _backups(STATE, graph, tau, path, n_backups, mode)
         # compute server-side metrics for apples-to-apples comparison
         try:
-            latency_ms = metrics_lib.path_latency_ms_for_state(path, STATE.nodes)
-            throughput_mbps = metrics_lib.path_throughput_mbps_for_state(path, STATE.nodes)
+            m = metrics_lib.path_metrics(path, _geometry(STATE))
+            latency_ms, throughput_mbps, hops = m["latency_ms"], m["throughput_mbps"], m["hops"]
         except Exception:
             latency_ms = None
             throughput_mbps = None
-        return {"path": path, "cost": float(cost), "latency_ms": latency_ms, "throughput_mbps": throughput_mbps}
+            hops = None
+        return {
+            "path": path,
+            "cost": float(cost),
+            "latency_ms": latency_ms,
+            "throughput_mbps": throughput_mbps,
+            "hops": hops,
+            "iterations": res.iterations,
+            "converged_at": res.converged_at,
+            "truncated": res.truncated,
+            "elapsed_ms": round(res.elapsed_ms, 2),
+            "seed": res.seed,
+            # replay a seed with the same aco.backend; the two walks draw different streams
+            "backend": res.backend,
+            "cached": hit is not None,
+            # local repairs applied to the cached route since it was solved
+            "repairs": hit.repairs if hit is not None else 0,
+            # cheapest first; fewer than k_paths - 1 when the graph has no more disjoint paths
+            "backups": [{"path": p, "cost": c} for p, c in backups],
+            "disjoint": mode,
+            # true when the colony found nothing and the path came from BFS
+            "fallback": not res.path or not math.isfinite(res.cost),
+        }
 
 
 @app.post("/simulate/toggle-link")
@@ -343,7 +705,12 @@ def post_toggle(req: ToggleReq):
         if idx is None:
             raise HTTPException(404, "link not found")
         STATE.links[idx].enabled = req.enabled
-        return {"ok": True}
+        STATE.touch()
+        out = {"ok": True}
+        if not req.enabled:
+            # only cached routes over this link are repaired; the rest stay valid
+            out["routes"] = _repair_summary(ROUTES.links_down(STATE, [(req.u, req.v)]))
+        return out
 
 
 @app.post("/simulate/set-epoch")
@@ -352,29 +719,35 @@ def post_epoch():
     with STATE_LOCK:
         if not STATE:
             raise HTTPException(500, "Graph not ready")
-        STATE = update_epoch(STATE)
-        return {"ok": True}
+        STATE = update_epoch(STATE, SIM_RNG)
+        rep = ROUTES.links_down(STATE, STATE.last_flips)
+        return {"ok": True, "flipped": len(STATE.last_flips), "routes": _repair_summary(rep)}
+
+
+@app.post("/simulate/seed")
+def post_seed(req: SeedReq):
+    """Reseed the simulator's link flips; the same seed replays the same sequence of epochs."""
+    global SIM_RNG
+    if req.seed is not None and req.seed < 0:
+        raise HTTPException(422, "seed must be >= 0")
+    with STATE_LOCK:
+        SIM_RNG = np.random.default_rng(req.seed)
+    return {"ok": True, "seed": req.seed}
 
 
 @app.post("/config/reload")
 def post_reload():
-    global CFG, STATE
-    CFG = load_config()
+    global CFG, STATE, ROUTES, AIRCRAFT
+    # drop the memoized config so env/.env overrides are re-applied too
+    CFG = reload_config()
     with STATE_LOCK:
+        ROUTES = _route_cache(CFG)
+        # aircraft ids were allocated above the old node set; the next poll starts a new store
+        AIRCRAFT = None
         # Try DB again on reload if enabled
-        db_used = False
-        try:
-            if CFG.enable_db:
-                from ..data.db import read_nodes as _read_nodes, available as _db_available
-                if _db_available():
-                    db_nodes = _read_nodes()
-                    if db_nodes:
-                        with open(NODES_PATH, "w", encoding="utf-8") as f:
-                            json.dump(db_nodes, f)
-                        db_used = True
-        except Exception:
-            pass
-        STATE = rebuild_from_nodes(str(NODES_PATH))
+        db_state = _state_from_db()
+        db_used = db_state is not None
+        STATE = db_state if db_used else rebuild_from_nodes(str(NODES_PATH))
     try:
         log = logging.getLogger(__name__)
         if db_used:
@@ -391,13 +764,32 @@ def post_send_packet(req: SendPacketReq):
     with STATE_LOCK:
         if not STATE:
             raise HTTPException(500, "Graph not ready")
+        n_backups, mode = _disjoint_args(req.k_paths, req.disjoint)
+        graph = tau = None
         # allow client-provided path (e.g., FE sends known path) else compute via ACO
         if req.path and len(req.path) >= 2:
             path = [int(x) for x in req.path]
             cost = 0.0
+            if n_backups and req.backups is None:
+                # backups are searched on a solve's graph; reuse the cached route's when there is one
+                hit = ROUTES.get((int(req.src), int(req.dst), None), STATE)
+                if hit is not None:
+                    graph, tau = hit.graph, hit.tau
         else:
-            aco = ACO(STATE)
-            path, cost = aco.solve(req.src, req.dst)
+            if req.seed is not None and req.seed < 0:
+                raise HTTPException(422, "seed must be >= 0")
+            key = (int(req.src), int(req.dst), None)
+            hit = ROUTES.get(key, STATE) if req.seed is None else None
+            if hit is not None:
+                path, cost = list(hit.path), hit.cost
+                graph, tau = hit.graph, hit.tau
+            else:
+                aco = _route_solver(STATE)
+                res = aco.run(req.src, req.dst, seed=req.seed)
+                path, cost = res.path, res.cost
+                graph, tau = aco.graph, getattr(aco, "tau", None)
+                if path:
+                    ROUTES.put(key, path, cost, graph, tau, res)
         # capture links and edge_index snapshot for simulation thread to compute latencies
         links_snapshot = list(STATE.links)
         edge_index_snapshot = dict(STATE.edge_index)
@@ -408,17 +800,28 @@ def post_send_packet(req: SendPacketReq):
         if not path:
             raise HTTPException(status_code=422, detail="No feasible path found for the given src/dst")
         cost = 0.0
+    backups: list[list[int]] = []
+    if req.backups is not None:
+        backups = [[int(x) for x in b] for b in req.backups if len(b) >= 2]
+    elif n_backups:
+        with STATE_LOCK:
+            if graph is None:
+                graph = ACO(STATE).graph
+            backups = [p for p, _c in _backups(STATE, graph, tau, path, n_backups, mode)]
 
     session_id = str(uuid.uuid4())
     # precompute ACO metrics to return to the caller
     try:
-        computed_latency_ms = metrics_lib.path_latency_ms_for_state(path, STATE.nodes)
-        computed_throughput_mbps = metrics_lib.path_throughput_mbps_for_state(path, STATE.nodes)
+        m = metrics_lib.path_metrics(path, _geometry(STATE), with_hops=False)
+        computed_latency_ms = m["latency_ms"]
+        computed_throughput_mbps = m["throughput_mbps"]
     except Exception:
         computed_latency_ms = None
         computed_throughput_mbps = None
 
     def _simulate():
+        # hops may change mid-flight: a packet whose next link goes down fails over to a backup
+        hops, spare = list(path), list(backups)
         # compute cumulative latency per node along the path (ms)
         cumulative = 0.0
         # helper to read latency between u->v
@@ -433,13 +836,15 @@ def post_send_packet(req: SendPacketReq):
                 return float(links_snapshot[idx].latency_ms)
             except Exception:
                 return 0.0
-        for i, node_id in enumerate(path):
+        i = 0
+        while i < len(hops):
+            node_id = hops[i]
             # cumulative latency up to this node (sum of latencies of links before this node)
             if i == 0:
                 cumulative = 0.0
             else:
-                u = path[i - 1]
-                v = path[i]
+                u = hops[i - 1]
+                v = hops[i]
                 cumulative += _link_latency(u, v)
 
             try:
@@ -464,6 +869,19 @@ def post_send_packet(req: SendPacketReq):
             except Exception:
                 pass
             time.sleep(0.2)
+            if i + 1 < len(hops) and not _link_up(node_id, hops[i + 1]):
+                # reroute here, as the node agent would, over the links that are still up
+                down = [(a, b) for p in [hops[: i + 2], *spare] for a, b in zip(p, p[1:]) if not _link_up(a, b)]
+                alt = failover(hops, i, spare, down)
+                if alt is None:
+                    _broadcast({"type": "packet-progress", "status": "failed", "sessionId": session_id,
+                                "nodeId": node_id, "cumulativeLatencyMs": cumulative})
+                    return
+                hops, j = alt
+                spare.pop(j)
+                _broadcast({"type": "packet-failover", "sessionId": session_id, "nodeId": node_id,
+                            "path": hops})
+            i += 1
 
     # Start TCP relay across containers (real traffic), while SSE keeps UI updated
     def _tcp_relay():
@@ -479,7 +897,8 @@ def post_send_packet(req: SendPacketReq):
                     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                     s.settimeout(3.0)
                     s.connect((host, TCP_PORT))
-                    payload = json.dumps({"sessionId": session_id, "path": path, "idx": 0, "message": req.message}).encode("utf-8")
+                    payload = json.dumps({"sessionId": session_id, "path": path, "idx": 0, "message": req.message,
+                                          "backups": backups}).encode("utf-8")
                     s.sendall(payload)
                     s.close()
                     print(f"[tcp] sent payload to {host}")
@@ -492,7 +911,8 @@ def post_send_packet(req: SendPacketReq):
 
     threading.Thread(target=_simulate, daemon=True).start()
     threading.Thread(target=_tcp_relay, daemon=True).start()
-    return {"sessionId": session_id, "path": path, "cost": float(cost) if math.isfinite(cost) else None, "latency_ms": computed_latency_ms, "throughput_mbps": computed_throughput_mbps}
+    return {"sessionId": session_id, "path": path, "cost": float(cost) if math.isfinite(cost) else None, "latency_ms": computed_latency_ms, "throughput_mbps": computed_throughput_mbps,
+            "backups": backups}
 
 
 @app.get("/events")
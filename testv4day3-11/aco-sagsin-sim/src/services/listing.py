@@ -0,0 +1,143 @@
+"""Paged, projected and pre-encoded listings for the controller's /nodes and /links."""
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None  # type: ignore
+    MSGPACK_AVAILABLE = False
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore
+    BROTLI_AVAILABLE = False
+
+NODE_FIELDS = ("id", "kind", "lat", "lon", "alt_m", "name")
+LINK_FIELDS = ("u", "v", "latency_ms", "capacity_mbps", "energy_j", "reliability", "enabled")
+
+# json: list of objects (the historical body); columns: {"fields", "columns"} of
+# flat per-field arrays; msgpack: the columns object, msgpack-encoded
+MEDIA_TYPES = {"json": "application/json", "columns": "application/json", "msgpack": "application/msgpack"}
+
+# bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+
+class ListingError(ValueError):
+    def __init__(self, status: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status = status
+
+
+def parse_fields(spec: Optional[str], allowed: Sequence[str]) -> Tuple[str, ...]:
+    if not spec:
+        return tuple(allowed)
+    cols = tuple(f.strip() for f in spec.split(",") if f.strip())
+    unknown = [f for f in cols if f not in allowed]
+    if unknown:
+        raise ListingError(400, f"unknown fields: {', '.join(unknown)}")
+    return cols
+
+
+def encode_cursor(version: int, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{version}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, version: int) -> int:
+    """Offset encoded in ``cursor``; cursors from an older graph version are rejected (410)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        v, off = (int(x) for x in raw.split(":"))
+    except Exception:
+        raise ListingError(400, "invalid cursor")
+    if v != version:
+        raise ListingError(410, "graph changed since this cursor was issued; restart from the first page")
+    return off
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    accepted = {p.split(";")[0].strip().lower() for p in (accept_encoding or "").split(",")}
+    if BROTLI_AVAILABLE and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def render(rows: Sequence[Dict[str, Any]], cols: Tuple[str, ...], fmt: str) -> bytes:
+    if fmt == "json":
+        return json.dumps([{c: r[c] for c in cols} for r in rows], separators=(",", ":")).encode()
+    obj = {"fields": list(cols), "columns": {c: [r[c] for r in rows] for c in cols}}
+    if fmt == "msgpack":
+        return msgpack.packb(obj)  # type: ignore[union-attr]
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+@dataclass
+class Page:
+    body: bytes
+    media_type: str
+    etag: str
+    total: int
+    next_cursor: Optional[str]
+    _encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def encoded(self, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Body for a negotiated content-encoding, compressed once and memoized."""
+        if encoding is None or len(self.body) < MIN_COMPRESS_BYTES:
+            return self.body, None
+        out = self._encoded.get(encoding)
+        if out is None:
+            if encoding == "br":
+                out = brotli.compress(self.body, quality=5)  # type: ignore[union-attr]
+            else:
+                out = gzip.compress(self.body, compresslevel=6, mtime=0)
+            self._encoded[encoding] = out
+        return out, encoding
+
+
+def etag_for(key: Tuple[Hashable, ...]) -> str:
+    return '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+
+
+class PageCache:
+    """Small LRU of rendered pages keyed by (listing, graph version, query)."""
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self._d: "OrderedDict[Tuple[Hashable, ...], Page]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: Tuple[Hashable, ...], build: Callable[[], Page]) -> Page:
+        with self._lock:
+            page = self._d.get(key)
+            if page is not None:
+                self._d.move_to_end(key)
+                return page
+        page = build()
+        with self._lock:
+            self._d[key] = page
+            while len(self._d) > self.maxsize:
+                self._d.popitem(last=False)
+        return page
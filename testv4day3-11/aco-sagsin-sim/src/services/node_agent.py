@@ -6,6 +6,7 @@ import time
 from pathlib import Path
 
 from ..logging_setup import setup_logging
+from ..net.failover import failover
 import threading
 import socket
 import urllib.request
@@ -15,6 +16,26 @@ from typing import Any
 NODES_PATH = Path("data/generated/nodes.json")
 
 
+def _load_node(idx: int) -> dict[str, Any] | None:
+    """Read this agent's row: O(1) from the mapped columnar file, else parse the JSON."""
+    try:
+        from ..data.nodeset import NodeSet, columnar_path, has_fresh_columnar
+
+        if has_fresh_columnar(NODES_PATH):
+            ns = NodeSet(columnar_path(NODES_PATH))
+            return ns.row(idx) if 0 <= idx < len(ns) else None
+    except Exception:
+        pass
+    with open(NODES_PATH, "r", encoding="utf-8") as f:
+        nodes = json.load(f)
+    if 0 <= idx < len(nodes):
+        try:
+            return nodes[idx]
+        except Exception:
+            return None
+    return None
+
+
 def main() -> None:
     setup_logging()
     idx = int(os.getenv("NODE_INDEX", "0"))
@@ -23,14 +44,7 @@ def main() -> None:
     if not NODES_PATH.exists():
         print("nodes.json not found; exiting")
         return
-    with open(NODES_PATH, "r", encoding="utf-8") as f:
-        nodes = json.load(f)
-    node: dict[str, Any] | None = None
-    if 0 <= idx < len(nodes):
-        try:
-            node = nodes[idx]
-        except Exception:
-            node = None
+    node = _load_node(idx)
     if not node:
         print(f"Node agent in standby (no assigned node for idx={idx}); exiting")
         return
@@ -59,15 +73,18 @@ def main() -> None:
                     msg = json.loads(data.decode("utf-8", errors="ignore"))
                 except Exception:
                     msg = {}
-                # basic fields: sessionId, path, idx, message
+                # basic fields: sessionId, path, idx, message (+ backups for local failover)
                 sid = msg.get("sessionId")
                 path = msg.get("path") or []
                 cur_i = int(msg.get("idx", 0))
                 payload = msg.get("message")
+                backups = [b for b in msg.get("backups") or [] if isinstance(b, list)]
                 print(f"[node-{node.get('id')}] TCP recv sid={sid} idx={cur_i} msg={bool(payload)}")
-                # forward to next hop if any
+                # forward to next hop if any; when it is unreachable switch to a backup path
+                # without asking the controller
                 nxt_i = cur_i + 1
-                if isinstance(path, list) and nxt_i < len(path):
+                down: list[tuple[int, int]] = []
+                while isinstance(path, list) and nxt_i < len(path):
                     next_node_id = int(path[nxt_i])
                     # compose container name on default network
                     host = f"aco-sagsin-sim-node-{next_node_id}"
@@ -75,12 +92,22 @@ def main() -> None:
                         fwd = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                         fwd.settimeout(3.0)
                         fwd.connect((host, TCP_PORT))
-                        fwd_payload = json.dumps({"sessionId": sid, "path": path, "idx": nxt_i, "message": payload}).encode("utf-8")
+                        fwd_payload = json.dumps({"sessionId": sid, "path": path, "idx": nxt_i, "message": payload,
+                                                  "backups": backups}).encode("utf-8")
                         fwd.sendall(fwd_payload)
                         fwd.close()
                         print(f"[node-{node.get('id')}] forwarded to {host}")
+                        break
                     except Exception as e:
                         print(f"[node-{node.get('id')}] forward failed to {host}: {e}")
+                    down.append((int(path[cur_i]), next_node_id))
+                    alt = failover([int(x) for x in path], cur_i, backups, down)
+                    if alt is None:
+                        print(f"[node-{node.get('id')}] no backup path left; dropping sid={sid}")
+                        break
+                    path, j = alt
+                    backups = backups[:j] + backups[j + 1:]
+                    print(f"[node-{node.get('id')}] failing over via {path[nxt_i]}")
                 conn.close()
             except Exception:
                 time.sleep(0.2)
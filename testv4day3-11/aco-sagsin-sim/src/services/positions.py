@@ -0,0 +1,147 @@
+"""Simulated node motion and the server-push positions stream."""
+from __future__ import annotations
+
+import base64
+import json
+import queue
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# movement parameters (can later be driven by config.yaml)
+DEG_PER_SEC = {"sat": 0.15, "air": 0.02, "sea": 0.005}
+JITTER_KM = {"air": 1.0, "sea": 0.2, "sat": 0.0}
+
+
+def compute_positions(ids: np.ndarray, kinds: Sequence[str], lat: np.ndarray, lon: np.ndarray,
+                      now: float, speed: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Drifted (lat, lon) for every node in one vectorized pass.
+
+    Longitudes of moving kinds drift eastward; air/sea latitudes get a small
+    sinusoidal jitter (~1 deg = 111 km). Static kinds are returned unchanged.
+    """
+    kinds = np.asarray(kinds, dtype=object)
+    dps = np.zeros(len(ids))
+    jk = np.zeros(len(ids))
+    for k, v in DEG_PER_SEC.items():
+        dps[kinds == k] = v
+    for k, v in JITTER_KM.items():
+        jk[kinds == k] = v
+    moving = dps > 0
+    t = now * speed
+    out_lon = np.where(moving, ((lon + dps * now * speed + 180.0) % 360.0) - 180.0, lon)
+    jitter = np.sin(t / 17.0 + ids.astype(float)) * jk / 111.0
+    out_lat = np.where(moving & (jk > 0), np.clip(lat + jitter, -90.0, 90.0), lat)
+    return out_lat, out_lon
+
+
+def pack(ids: np.ndarray, lat: np.ndarray, lon: np.ndarray, alt_km: np.ndarray) -> str:
+    """Base64 of little-endian int32 ids followed by float32 lat, lon and alt_km columns."""
+    buf = b"".join((
+        np.asarray(ids, dtype="<i4").tobytes(),
+        np.asarray(lat, dtype="<f4").tobytes(),
+        np.asarray(lon, dtype="<f4").tobytes(),
+        np.asarray(alt_km, dtype="<f4").tobytes(),
+    ))
+    return base64.b64encode(buf).decode("ascii")
+
+
+def unpack(data: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    raw = base64.b64decode(data)
+    n = len(raw) // 16
+    ids = np.frombuffer(raw, dtype="<i4", count=n)
+    cols = np.frombuffer(raw, dtype="<f4", offset=4 * n).reshape(3, n)
+    return ids, cols[0], cols[1], cols[2]
+
+
+class PositionStream:
+    """Fan-out of position frames, computed once per tick for all subscribers.
+
+    The stream keeps the last positions it sent (the baseline). Each
+    ``publish`` sends only nodes that moved more than ``min_delta_deg`` (or
+    ``min_delta_km`` in altitude) from the baseline, so the frame, encoded
+    once, is O(changed nodes) for every client. Membership changes and new
+    subscribers get a key frame with all nodes. Frames are SSE ``positions``
+    events whose JSON data is ``{"seq", "key", "n", "data"}`` with ``data``
+    produced by ``pack``.
+    """
+
+    def __init__(self, min_delta_deg: float = 1e-3, min_delta_km: float = 0.05) -> None:
+        self.min_delta_deg = float(min_delta_deg)
+        self.min_delta_km = float(min_delta_km)
+        self.seq = 0
+        self._ids: Optional[np.ndarray] = None
+        self._lat = self._lon = self._alt = np.empty(0, dtype=np.float32)
+        self._subs: List["queue.Queue[str]"] = []
+        self._lock = threading.Lock()
+
+    def has_subscribers(self) -> bool:
+        with self._lock:
+            return bool(self._subs)
+
+    def _frame(self, key: bool, rows: Optional[np.ndarray] = None) -> str:
+        ids, lat, lon, alt = self._ids, self._lat, self._lon, self._alt
+        if rows is not None:
+            ids, lat, lon, alt = ids[rows], lat[rows], lon[rows], alt[rows]
+        data = {"seq": self.seq, "key": key, "n": int(len(ids)), "data": pack(ids, lat, lon, alt)}
+        return "event: positions\n" + f"data: {json.dumps(data)}\n\n"
+
+    def subscribe(self) -> "queue.Queue[str]":
+        q: "queue.Queue[str]" = queue.Queue(maxsize=64)
+        with self._lock:
+            if self._ids is not None:
+                q.put_nowait(self._frame(True))
+            self._subs.append(q)
+        return q
+
+    def unsubscribe(self, q: "queue.Queue[str]") -> None:
+        with self._lock:
+            if q in self._subs:
+                self._subs.remove(q)
+
+    def publish(self, ids: np.ndarray, lat: np.ndarray, lon: np.ndarray, alt_km: np.ndarray) -> Optional[str]:
+        """Fold one tick of positions into the baseline and push the resulting frame (if any)."""
+        lat = np.asarray(lat, dtype=np.float32)
+        lon = np.asarray(lon, dtype=np.float32)
+        alt = np.asarray(alt_km, dtype=np.float32)
+        with self._lock:
+            if self._ids is None or len(self._ids) != len(ids) or not np.array_equal(self._ids, ids):
+                self._ids = np.asarray(ids, dtype=np.int32).copy()
+                self._lat, self._lon, self._alt = lat.copy(), lon.copy(), alt.copy()
+                self.seq += 1
+                frame = self._frame(True)
+            else:
+                dlon = np.abs(lon - self._lon)
+                dlon = np.minimum(dlon, 360.0 - dlon)
+                moved = (
+                    (np.abs(lat - self._lat) > self.min_delta_deg)
+                    | (dlon > self.min_delta_deg)
+                    | (np.abs(alt - self._alt) > self.min_delta_km)
+                )
+                rows = np.flatnonzero(moved)
+                if not len(rows):
+                    return None
+                self._lat[rows], self._lon[rows], self._alt[rows] = lat[rows], lon[rows], alt[rows]
+                self.seq += 1
+                frame = self._frame(False, rows)
+            subs = list(self._subs)
+        for q in subs:
+            try:
+                q.put_nowait(frame)
+            except queue.Full:
+                # a stalled client resyncs from a key frame instead of buffering forever
+                self._resync(q)
+        return frame
+
+    def _resync(self, q: "queue.Queue[str]") -> None:
+        with self._lock:
+            try:
+                while True:
+                    q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                q.put_nowait(self._frame(True))
+            except queue.Full:
+                pass
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Literal, List, Dict, Optional, Tuple
+import itertools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Literal, List, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .net.geometry import Geometry
 
 NodeKind = Literal["sat", "ground", "air", "sea"]
 
+# process-wide sequence so versions stay unique across rebuilt states
+_GRAPH_VERSIONS = itertools.count(1)
+
 
 @dataclass
 class Node:
@@ -36,3 +43,14 @@ class GraphState:
     adj: Dict[int, List[int]]
     # edge attributes map (u,v)->link index
     edge_index: Dict[Tuple[int, int], int]
+    # per-tick coordinate cache (ids, ECEF, unit vectors) shared by consumers
+    geometry: Optional["Geometry"] = None
+    # changes whenever nodes or links change; used for HTTP ETags and caches
+    version: int = field(default_factory=lambda: next(_GRAPH_VERSIONS))
+    # (u, v) of the links whose enabled flag the last update_epoch toggled
+    last_flips: List[Tuple[int, int]] = field(default_factory=list)
+
+    def touch(self) -> int:
+        """Mark the graph as changed and return the new version."""
+        self.version = next(_GRAPH_VERSIONS)
+        return self.version
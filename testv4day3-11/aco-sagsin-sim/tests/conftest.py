@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import List, NamedTuple, Tuple
+
+import pytest
+
+from src.aco.solver import ACO
+from src.bench.quality import reachable_pairs
+from src.bench.topology import synthetic_nodes
+from src.net.graph import build_graph
+from src.types import GraphState, Node
+
+
+class Topology(NamedTuple):
+    nodes: List[Node]
+    gs: GraphState
+    aco: ACO
+
+    def pairs(self, k: int, seed: int = 0) -> List[Tuple[int, int, List[int], float]]:
+        """Up to ``k`` reachable surface pairs with their optimal (path, cost)."""
+        return reachable_pairs(self.gs, self.nodes, k, seed, self.aco.costs)
+
+
+@pytest.fixture
+def topo() -> Topology:
+    """The 200-node synthetic topology the solver tests share, built fresh per test."""
+    nodes = synthetic_nodes(200, seed=2)
+    gs = build_graph(nodes)
+    return Topology(nodes, gs, ACO(gs))
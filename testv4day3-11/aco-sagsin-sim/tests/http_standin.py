@@ -0,0 +1,71 @@
+"""Tiny local HTTP server serving recorded fixture responses for offline tests."""
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# route -> handler(request_headers) -> (status, headers, body)
+Handler = Callable[[dict], tuple]
+
+
+class StandIn:
+    def __init__(self, routes: Dict[str, Handler], chunk: int = 64) -> None:
+        self.routes = routes
+        self.hits: Dict[str, int] = {}
+        standin = self
+
+        class _H(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                path = self.path.split("?", 1)[0]
+                standin.hits[path] = standin.hits.get(path, 0) + 1
+                fn = standin.routes.get(path)
+                if fn is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status, headers, body = fn(dict(self.headers))
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                if status == 304:
+                    self.end_headers()
+                    return
+                # chunked transfer so clients really see the body arrive in pieces
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i in range(0, len(body), chunk):
+                    part = body[i:i + chunk]
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _H)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandIn":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def fixture(name: str, content_type: str = "application/json", headers: Optional[dict] = None) -> Handler:
+    body = (FIXTURES / name).read_bytes()
+    hdrs = {"Content-Type": content_type, **(headers or {})}
+    return lambda _req: (200, hdrs, body)
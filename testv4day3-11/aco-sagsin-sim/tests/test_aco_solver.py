@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import copy
+from dataclasses import replace
+
+import numpy as np
+
 from src.aco.solver import ACO
 from src.net.graph import build_graph
 from src.types import Link, Node, GraphState
@@ -16,3 +21,128 @@ def test_aco_on_toy():
     aco = ACO(gs)
     path, cost = aco.solve(0, 2)
     assert path[0] == 0 and path[-1] == 2
+
+
+def _chain(n=6):
+    nodes = [Node(id=i, kind="ground", lat=0.05 * (i % 2), lon=0.3 * i, alt_m=0) for i in range(n)]
+    return build_graph(nodes)
+
+
+def test_run_stops_on_stagnation_and_reports_metadata():
+    aco = ACO(_chain())
+    aco.cfg = replace(aco.cfg, ants=4, iters=50)
+    seen = []
+    res = aco.run(0, 5, deadline_ms=0, stagnation=3, on_iteration=lambda i, c: seen.append(i))
+    assert res.path[0] == 0 and res.path[-1] == 5 and res.cost < float("inf")
+    assert res.stagnated and not res.truncated
+    assert res.iterations == res.converged_at + 3 == len(seen) < 50
+    assert res.elapsed_ms >= 0
+
+    full = aco.run(0, 5, deadline_ms=0, stagnation=0)
+    assert full.iterations == 50 and not full.stagnated
+
+
+def test_run_honours_deadline_and_solve_keeps_tuple():
+    aco = ACO(_chain())
+    aco.cfg = replace(aco.cfg, ants=50, iters=10_000)
+    res = aco.run(0, 5, deadline_ms=20, stagnation=0)
+    assert res.truncated and res.iterations < 10_000
+    # the first ant always runs, so the best-so-far path is returned
+    assert res.path and res.converged_at >= 1
+    assert res.elapsed_ms < 1000
+
+    aco.cfg = replace(aco.cfg, ants=3, iters=3)
+    path, cost = aco.solve(0, 5)
+    assert path[-1] == 5 and cost > 0
+
+
+def test_goal_directed_and_bidirectional_walks_are_valid():
+    from src.bench.quality import reachable_pairs
+    from src.bench.topology import synthetic_nodes
+
+    nodes = synthetic_nodes(300, seed=5)
+    gs = build_graph(nodes)
+    base = ACO(gs)
+    g = base.graph
+    pairs = reachable_pairs(gs, nodes, 4, 0, base.costs)
+    # the straight-line bound never exceeds the exact one
+    d = g.row_of[pairs[0][1]]
+    exact = g.distances(d)
+    assert (g.geo_bound(d) <= exact + 1e-9).all()
+
+    totals = {}
+    for name, mode in (("goal", {"goal": "dijkstra"}), ("geo", {"goal": "geo"}),
+                       ("bidir", {"goal": "none", "bidirectional": True}),
+                       ("goal+bidir", {"goal": "dijkstra", "bidirectional": True, "backtracks": 3}),
+                       ("backtrack", {"goal": "none", "backtracks": 5}),
+                       ("plain", {"goal": "none"})):
+        totals[name] = 0.0
+        for i, (s, t, _p, opt) in enumerate(pairs):
+            aco = ACO(gs)
+            aco.cfg = replace(aco.cfg, ants=6, iters=6, **mode)
+            path, cost = aco.solve(s, t, seed=i)
+            totals[name] += cost
+            if not path:
+                # only the inexact heuristics may still lose every ant
+                assert name in ("geo", "bidir", "backtrack", "plain")
+                continue
+            assert path[0] == s and path[-1] == t and len(set(path)) == len(path), name
+            assert abs(sum(base.costs[(u, v)] for u, v in zip(path, path[1:])) - cost) < 1e-9
+            assert cost >= opt - 1e-9
+    assert totals["goal"] < totals["plain"] and totals["goal+bidir"] < totals["plain"]
+
+
+def test_dijkstra_goal_counts_against_the_deadline(monkeypatch):
+    import time
+
+    from src.aco.csr import Colony, CSRGraph
+    from src.bench.topology import synthetic_nodes
+
+    gs = build_graph(synthetic_nodes(300, seed=5))
+    aco = ACO(gs)
+    g = aco.graph
+    s, d = 0, len(gs.nodes) - 1
+    assert g.distances(d, deadline=time.monotonic() - 1) is None
+    assert np.isfinite(g.distances(d, deadline=time.monotonic() + 60)[d])
+
+    # out of time for the exact bound: the colony steers by the straight-line one
+    cfg = replace(aco.cfg, goal="dijkstra", backend="python")
+    late = Colony(g, cfg, np.random.default_rng(0))
+    late.prepare(s, d, deadline=time.monotonic() - 1)
+    geo = Colony(g, replace(cfg, goal="geo"), np.random.default_rng(0))
+    geo.prepare(s, d)
+    assert late.eta_f == geo.eta_f
+
+    seen = []
+    orig = CSRGraph.distances
+    monkeypatch.setattr(CSRGraph, "distances", lambda self, row, deadline=None: seen.append(deadline)
+                        or orig(self, row, deadline))
+    aco.cfg = replace(cfg, ants=2, iters=2)
+    aco.run(gs.nodes[s].id, gs.nodes[d].id, deadline_ms=50, stagnation=0)
+    assert seen and seen[0] is not None
+
+
+def test_seeded_runs_replay_and_report_their_seed(topo):
+    from src.net.updater import update_epoch
+
+    gs = topo.gs
+    s, t = gs.nodes[0].id, gs.nodes[-1].id
+    for backend in ("python", "numba"):
+        runs = []
+        for seed in (5, 5, None):
+            aco = ACO(gs)
+            aco.cfg = replace(aco.cfg, ants=5, iters=6, stagnation_iters=0, backend=backend)
+            runs.append(aco.run(s, t, seed=seed))
+        assert runs[0].seed == 5
+        assert (runs[0].path, runs[0].cost) == (runs[1].path, runs[1].cost)
+        replay = ACO(gs)
+        replay.cfg = replace(replay.cfg, ants=5, iters=6, stagnation_iters=0, backend=backend)
+        again = replay.run(s, t, seed=runs[2].seed)
+        assert (again.path, again.cost) == (runs[2].path, runs[2].cost)
+
+    flipped = []
+    for _ in range(2):
+        g = copy.deepcopy(gs)
+        update_epoch(g, np.random.default_rng(11))
+        flipped.append([link.enabled for link in g.links])
+    assert flipped[0] == flipped[1] and not all(flipped[0])
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import random
+
+from fastapi.testclient import TestClient
+
+import src.services.controller as controller
+from src.config import load_config
+from src.data import fetch_opensky
+from src.data.aircraft import AircraftStore, select_states
+from src.net.graph import build_graph
+from src.net.updater import apply_aircraft_delta
+from src.types import Node
+
+
+def _state(icao, lat, lon, alt=10000.0, cs=""):
+    st = [None] * 17
+    st[0], st[1], st[5], st[6], st[13] = icao, cs, lon, lat, alt
+    return st
+
+
+def _link_set(gs):
+    return {(min(e.u, e.v), max(e.u, e.v)): round(e.latency_ms, 9) for e in gs.links}
+
+
+def test_store_reports_added_moved_removed():
+    store = AircraftStore(id_base=100, timeout_s=30, min_move_m=100)
+    d = store.apply([_state("a1", 10, 100, cs="VN1 "), _state("b2", 11, 101)], now=0)
+    assert d.added == [100, 101] and not d.moved and not d.removed
+    assert store.node(100).name == "VN1"
+
+    # a1 jitters by a few metres (ignored), b2 moves ~1 km
+    d = store.apply([_state("a1", 10.00001, 100), _state("b2", 11.01, 101)], now=10)
+    assert d.added == [] and d.moved == [101] and d.removed == []
+
+    # a1 stops reporting and expires; its slot is reused only on a later poll
+    d = store.apply([_state("b2", 11.01, 101)], now=45)
+    assert d.removed == [100]
+    d = store.apply([_state("b2", 11.01, 101), _state("c3", 12, 102)], now=50)
+    assert d.added == [100] and store.node_id("c3") == 100
+
+
+def test_delta_relink_matches_full_rebuild():
+    rnd = random.Random(3)
+    fixed = [
+        Node(id=i, kind=rnd.choice(["ground", "sat", "sea"]), lat=rnd.uniform(5, 25), lon=rnd.uniform(95, 115),
+             alt_m=0.0)
+        for i in range(120)
+    ]
+    for n in fixed:
+        if n.kind == "sat":
+            n.alt_m = 550_000.0
+    # a seeded air node is superseded by the live store
+    seeded_air = Node(id=120, kind="air", lat=15, lon=105, alt_m=9000.0)
+    store = AircraftStore(id_base=1000)
+    planes = [_state(f"ac{i}", rnd.uniform(5, 25), rnd.uniform(95, 115)) for i in range(30)]
+
+    gs = build_graph(fixed + [seeded_air])
+    gs = apply_aircraft_delta(gs, store, store.apply(planes, now=0))
+    assert 120 not in gs.adj and len(gs.nodes) == 150
+
+    for st in planes[:10]:
+        st[6] += 0.3
+    planes = planes[:25]  # five aircraft drop out
+    store.timeout_s = 5
+    gs = apply_aircraft_delta(gs, store, store.apply(planes, now=10))
+
+    full = build_graph([Node(**n.__dict__) for n in gs.nodes])
+    assert _link_set(gs) == _link_set(full)
+    assert all(gs.links[gs.edge_index[(e.u, e.v)]] is e for e in gs.links)
+
+
+def test_reload_restarts_aircraft_ids_above_new_nodes(tmp_path, monkeypatch):
+    def ground(n):
+        return [Node(id=i, kind="ground", lat=10.0, lon=100.0 + 0.2 * i, alt_m=0.0) for i in range(n)]
+
+    cfg = dataclasses.replace(load_config(), offline=False, enable_air=True, live_aircraft=True,
+                              enable_db=False, continent=None, node_limit=0)
+    nodes_path = tmp_path / "nodes.json"
+    monkeypatch.setattr(controller, "NODES_PATH", nodes_path)
+    monkeypatch.setattr(controller, "reload_config", lambda: cfg)
+    monkeypatch.setattr(controller, "CFG", cfg)
+    monkeypatch.setattr(controller.fetch_opensky, "fetch_states", lambda: [_state("a1", 10.5, 101.0)])
+    monkeypatch.setattr(controller, "AIRCRAFT", None)
+    monkeypatch.setattr(controller, "ROUTES", controller.ROUTES)
+    monkeypatch.setattr(controller, "STATE", build_graph(ground(5)))
+
+    controller._poll_aircraft()
+    assert controller.AIRCRAFT.node_id("a1") == 5
+
+    # the reloaded node set now covers the old aircraft id range
+    nodes_path.write_text(json.dumps([n.__dict__ for n in ground(20)]))
+    assert TestClient(controller.app).post("/config/reload").json() == {"ok": True}
+    controller._poll_aircraft()
+    by_id = {n.id: n for n in controller.STATE.nodes}
+    assert by_id[5].kind == "ground" and by_id[5].lon == 101.0
+    assert controller.AIRCRAFT.node_id("a1") == 20 and by_id[20].kind == "air"
+
+
+def test_select_states_applies_bbox_continent_and_cap():
+    states = [_state("eu1", 48.0, 2.0), _state("us1", 40.0, -74.0), _state("eu2", 52.0, 13.0),
+              _state("eu3", 41.0, 12.0), [None] * 4]
+    cfg = dataclasses.replace(load_config(), continent="europe", node_limit=0)
+    assert [st[0] for st in select_states(states, cfg)] == ["eu1", "eu2", "eu3"]
+
+    cfg = dataclasses.replace(cfg, continent=None, bbox={"min_lat": 45, "max_lat": 90, "min_lon": -180, "max_lon": 180})
+    assert [st[0] for st in select_states(states, cfg)] == ["eu1", "eu2"]
+
+    # tracked aircraft keep their places under the cap
+    cfg = dataclasses.replace(cfg, continent="europe", bbox=load_config().bbox)
+    assert [st[0] for st in select_states(states, cfg, tracked={"eu3"}, cap=2)] == ["eu3", "eu1"]
+
+
+def test_poll_is_opt_in_and_backs_off_on_429(monkeypatch):
+    calls = []
+
+    def limited():
+        calls.append(1)
+        raise fetch_opensky.RateLimited(30.0)
+
+    cfg = dataclasses.replace(load_config(), offline=False, enable_air=True, live_aircraft=False)
+    monkeypatch.setattr(controller, "CFG", cfg)
+    monkeypatch.setattr(controller.fetch_opensky, "fetch_states", limited)
+    monkeypatch.setattr(controller, "_AIR_RETRY_AT", 0.0)
+    monkeypatch.setattr(controller, "_AIR_WAIT_S", 0.0)
+    controller._poll_aircraft()
+    assert calls == []
+
+    monkeypatch.setattr(controller, "CFG", dataclasses.replace(cfg, live_aircraft=True))
+    controller._poll_aircraft()
+    controller._poll_aircraft()
+    assert len(calls) == 1
+    assert controller._AIR_RETRY_AT > controller.time.monotonic() + 25
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from src.bench.routing import bench_size, compare
+from src.bench.topology import MAX_SATS, route_pairs, synthetic_nodes
+
+
+def test_synthetic_nodes_are_seeded_and_mixed():
+    a = synthetic_nodes(1000, seed=7)
+    assert a == synthetic_nodes(1000, seed=7)
+    assert a != synthetic_nodes(1000, seed=8)
+    assert [n.id for n in a] == list(range(1000))
+    kinds = Counter(n.kind for n in a)
+    assert kinds["sat"] == 300 and kinds["ground"] > kinds["air"] > kinds["sea"] > 0
+    assert all(-90 <= n.lat <= 90 and -180 <= n.lon < 180 for n in a)
+    assert Counter(n.kind for n in synthetic_nodes(20_000))["sat"] == MAX_SATS
+
+
+def test_bench_size_reports_every_stage():
+    r = bench_size(100, seed=0, pairs=2, repeat=1, trace_memory=True)
+    assert r["nodes"] == 100 and r["routes"] == 2 and r["links"] > 0
+    for k in ("build_graph_s", "edge_costs_s", "solve_ms_p50", "batch_ms_per_route", "peak_mb"):
+        assert r[k] is not None and r[k] >= 0
+    ratio = compare({"results": [r]}, {"results": [dict(r, build_graph_s=r["build_graph_s"] * 2 or 1)]})
+    assert ratio[0]["nodes"] == 100
+    assert len(route_pairs(synthetic_nodes(100), 4)) == 4
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import time
+import types
+
+import pytest
+
+import src.data.cache as cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache, "load_config", lambda: types.SimpleNamespace(cache_ttl_sec=60, enable_db=False))
+    cache.clear_memory_cache()
+    yield tmp_path
+    cache.clear_memory_cache()
+
+
+def test_roundtrip_through_file_tier(cache_dir):
+    payload = [{"id": i, "name": f"n{i}"} for i in range(100)]
+    cache.save_cache("src", payload)
+    assert cache.load_cache("src") == payload
+    cache.clear_memory_cache()
+    assert cache.load_cache("src") == payload
+    meta = json.loads((cache_dir / "src.meta.json").read_text())
+    assert meta["codec"] in ("gzip", "zstd")
+    assert not list(cache_dir.glob("*.tmp"))
+
+
+def test_expired_sidecar_skips_payload(cache_dir):
+    cache.save_cache("old", {"a": 1})
+    cache.clear_memory_cache()
+    meta_p = cache_dir / "old.meta.json"
+    meta = json.loads(meta_p.read_text())
+    meta["ts"] = time.time() - 3600
+    meta_p.write_text(json.dumps(meta))
+    # a corrupt payload proves the file is never opened once the sidecar says stale
+    cache._payload_path("old", meta["codec"]).write_bytes(b"garbage")
+    assert cache.load_cache("old") is None
+
+
+def test_reads_legacy_json(cache_dir):
+    (cache_dir / "legacy.json").write_text(json.dumps({"_meta": {"ts": time.time()}, "payload": [1, 2]}))
+    assert cache.load_cache("legacy") == [1, 2]
+
+
+def test_lru_bounds_entries():
+    lru = cache._LRU(2)
+    for k in "abc":
+        lru.put(k, 0.0, k)
+    assert lru.get("a") is None and lru.get("c") == (0.0, "c")
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from src.aco.csr import Colony
+from src.aco.solver import ACO
+from src.bench.topology import synthetic_nodes
+from src.net.graph import build_graph
+
+
+def test_candidates_are_cheapest_enabled_neighbours_per_version():
+    gs = build_graph(synthetic_nodes(200, seed=4))
+    aco = ACO(gs)
+    g = aco.graph
+    assert ACO(gs).graph is g
+    cands = g.candidates(3)
+    assert g.candidates(3) is cands
+    for u in gs.adj:
+        full = sorted((v for v in gs.adj[u] if (u, v) in aco.costs), key=lambda v: aco.costs[(u, v)])
+        assert g.path_ids([v for _e, v in cands[g.row_of[u]]]) == full[:3]
+
+    u, v = next((g.ids[r], g.ids[c[0][1]]) for r, c in enumerate(cands) if c)
+    gs.links[gs.edge_index[(int(u), int(v))]].enabled = False
+    gs.touch()
+    fresh = ACO(gs).graph
+    assert fresh is not g
+    assert int(v) not in fresh.path_ids([x for _e, x in fresh.candidates(3)[fresh.row_of[int(u)]]])
+
+
+def test_walk_scores_at_most_k_options_until_all_candidates_are_visited(monkeypatch, topo):
+    gs, aco = topo.gs, topo.aco
+    k = 3
+    cands = aco.graph.candidates(k)
+    seen = []
+    options = Colony._options
+
+    def record(self, cur, blocked, eta):
+        cand = options(self, cur, blocked, eta)
+        open_ = [(e, v) for e, v in cands[cur] if v not in blocked and eta[e] > 0]
+        seen.append((len(cand), len(open_)))
+        if open_:
+            assert cand == open_
+        return cand
+
+    monkeypatch.setattr(Colony, "_options", record)
+    for bidirectional in (False, True):
+        for i, (s, d, _p, _c) in enumerate(topo.pairs(3)):
+            a = ACO(gs)
+            a.cfg = replace(aco.cfg, ants=6, iters=4, candidates=k, backend="python", bidirectional=bidirectional)
+            a.run(s, d, stagnation=0, seed=i)
+    assert all(n <= k for n, open_ in seen if open_)
+    # the full neighbourhood is only opened once every candidate was visited
+    assert any(n > k for n, open_ in seen if not open_)
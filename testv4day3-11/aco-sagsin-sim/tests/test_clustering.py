@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from src.bench.clustering import legacy_dbscan_cluster, synthetic_records
+from src.data.clustering import dbscan_cluster, grid_cluster
+from src.types import Node
+
+
+def test_matches_legacy_dbscan_for_single_kind():
+    nodes = [n for n in synthetic_records(3000, seed=1) if n.kind == "air"]
+    new = dbscan_cluster(nodes, 20.0)
+    old = legacy_dbscan_cluster(nodes, 20.0)
+    assert len(new) == len(old)
+    key = lambda n: (round(n.lat, 9), round(n.lon, 9))  # noqa: E731
+    assert sorted(map(key, new)) == sorted(map(key, old))
+
+
+def test_kinds_are_never_merged():
+    nodes = [
+        Node(id=-1, kind="ground", lat=10.0, lon=10.0, alt_m=0.0, name="g"),
+        Node(id=-1, kind="sat", lat=10.01, lon=10.01, alt_m=550e3, name="s"),
+        Node(id=-1, kind="ground", lat=10.02, lon=10.0, alt_m=0.0),
+    ]
+    out = dbscan_cluster(nodes, 20.0)
+    assert [(n.kind, n.name) for n in out] == [("ground", "g"), ("sat", "s")]
+    assert out[0].lat == pytest.approx(10.01)
+    assert out[1].alt_m == 550e3
+
+
+def test_grid_cluster_buckets_per_kind():
+    nodes = [
+        Node(id=-1, kind="air", lat=1.01, lon=2.01, alt_m=100.0),
+        Node(id=-1, kind="air", lat=1.03, lon=2.05, alt_m=300.0),
+        Node(id=-1, kind="sea", lat=1.02, lon=2.02, alt_m=0.0),
+        Node(id=-1, kind="air", lat=-1.01, lon=2.01, alt_m=0.0),
+    ]
+    out = grid_cluster(nodes, 0.1)
+    assert [n.kind for n in out] == ["air", "sea", "air"]
+    assert out[0].alt_m == pytest.approx(200.0)
+    assert out[0].name == "air-grid"
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+
+from src import config as config_mod
+
+
+def _write(path, ants: int) -> None:
+    path.write_text(f"aco:\n  ants: {ants}\n", encoding="utf-8")
+
+
+def test_load_config_is_memoized_and_tracks_mtime(tmp_path, monkeypatch):
+    monkeypatch.delenv("ANTS", raising=False)
+    monkeypatch.setattr(config_mod, "load_dotenv", lambda *a, **k: False)
+    p = tmp_path / "config.yaml"
+    _write(p, 7)
+    config_mod.invalidate_config()
+
+    c1 = config_mod.load_config(str(p))
+    assert config_mod.load_config(str(p)) is c1
+    assert c1.aco.ants == 7
+
+    _write(p, 9)
+    st = os.stat(p)
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    c2 = config_mod.load_config(str(p))
+    assert c2 is not c1 and c2.aco.ants == 9
+
+    assert config_mod.reload_config(str(p)) is not c2
+    config_mod.invalidate_config()
+
+
+def test_seed_is_optional_and_env_overridable(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_mod, "load_dotenv", lambda *a, **k: False)
+    p = tmp_path / "config.yaml"
+    p.write_text("seed: null\n", encoding="utf-8")
+    monkeypatch.delenv("SEED", raising=False)
+    assert config_mod.reload_config(str(p)).seed is None
+    monkeypatch.setenv("SEED", "42")
+    assert config_mod.reload_config(str(p)).seed == 42
+    config_mod.invalidate_config()
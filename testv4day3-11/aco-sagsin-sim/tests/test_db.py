@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import types
+
+import pytest
+
+import src.data.db as db
+from src.net.updater import rebuild_from_records
+
+mongomock = pytest.importorskip("mongomock")
+
+
+@pytest.fixture
+def store(monkeypatch):
+    cfg = types.SimpleNamespace(
+        enable_db=True,
+        mongo_uri="mongodb://standin",
+        mongo_db="sagsin",
+        mongo_cache_collection="cache",
+        mongo_nodes_collection="nodes",
+        mongo_connect_timeout_sec=1,
+        cache_ttl_sec=60,
+    )
+    # newer pymongo passes ``sort=`` to bulk builders, which mongomock 4.x predates
+    builder = mongomock.collection.BulkOperationBuilder
+    add_update = builder.add_update
+    monkeypatch.setattr(builder, "add_update", lambda self, *a, sort=None, **k: add_update(self, *a, **k))
+    monkeypatch.setattr(db, "MongoClient", mongomock.MongoClient)
+    monkeypatch.setattr(db, "load_config", lambda: cfg)
+    monkeypatch.setattr(db, "NODE_BATCH", 2)  # force several bulk batches
+    s = db._MongoStore()
+    assert s.connect()
+    return s
+
+
+def _records(n):
+    kinds = ["ground", "sat", "air", "sea"]
+    return [
+        {"id": i, "kind": kinds[i % 4], "lat": 10.0 + i * 0.01, "lon": 105.0, "alt_m": 0.0, "name": f"n{i}"}
+        for i in range(n)
+    ]
+
+
+def test_nodes_are_one_document_each_with_indexes(store):
+    assert store.write_nodes(iter(_records(5)))
+    coll = store._nodes_coll
+    assert coll.count_documents({}) == 5
+    doc = coll.find_one({"_id": 3})
+    assert doc["loc"] == {"type": "Point", "coordinates": [105.0, 10.03]}
+    keys = [tuple(ix["key"]) for ix in coll.index_information().values()]
+    assert (("loc", "2dsphere"),) in keys and (("kind", 1),) in keys
+
+    # rewriting with fewer nodes drops the stale ids
+    assert store.write_nodes(_records(3))
+    assert sorted(d["_id"] for d in coll.find()) == [0, 1, 2]
+    assert [r["kind"] for r in store.iter_nodes(kinds=["sat"])] == ["sat"]
+
+
+def test_graph_built_straight_from_cursor(store):
+    store.write_nodes(_records(6))
+    gs = rebuild_from_records(store.iter_nodes())
+    assert [n.id for n in gs.nodes] == list(range(6))
+    assert gs.nodes[4].name == "n4" and len(gs.geometry) == 6
+
+
+def test_legacy_single_document_still_reads(store):
+    store._nodes_coll.insert_one({"_id": "nodes", "payload": _records(2)})
+    assert store.read_nodes() == _records(2)
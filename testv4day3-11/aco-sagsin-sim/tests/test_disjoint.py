@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import math
+
+from fastapi.testclient import TestClient
+
+import src.services.controller as controller
+from src.aco.csr import build_csr
+from src.aco.disjoint import disjoint_paths
+from src.aco.solver import ACO
+from src.bench.quality import reachable_pairs
+from src.bench.topology import synthetic_nodes
+from src.net.failover import failover
+from src.net.graph import _index, build_graph
+from src.types import GraphState, Link, Node
+
+
+def _toy(edges):
+    """Graph over (u, v, cost) links, with its CSR view."""
+    ids = sorted({n for u, v, _c in edges for n in (u, v)})
+    nodes = [Node(id=i, kind="ground", lat=0.0, lon=0.1 * i, alt_m=0) for i in ids]
+    links = [Link(u, v, 1.0, 10.0, 0.0, 1.0) for u, v, _c in edges]
+    adj, edge_index = _index(nodes, links)
+    gs = GraphState(nodes=nodes, links=links, adj=adj, edge_index=edge_index)
+    costs = {}
+    for u, v, c in edges:
+        costs[(u, v)] = costs[(v, u)] = c
+    return gs, build_csr(gs, costs)
+
+
+def _links(path):
+    return {frozenset(x) for x in zip(path, path[1:])}
+
+
+def test_trap_topology_reroutes_the_shortest_path():
+    # the shortest path 0-1-2-3 blocks every other route, but 0-1-3 and 0-2-3 are disjoint
+    gs, g = _toy([(0, 1, 1.0), (1, 2, 1.0), (2, 3, 1.0), (0, 2, 3.0), (1, 3, 3.0)])
+    assert disjoint_paths(g, 0, 3, 1, avoid=[0, 1, 2, 3]) == []
+    for nodes in (False, True):
+        assert sorted(disjoint_paths(g, 0, 3, 3, nodes=nodes)) == [([0, 1, 3], 4.0), ([0, 2, 3], 4.0)]
+
+    # two routes through a shared hub are link- but not node-disjoint
+    gs, g = _toy([(0, 1, 1.0), (1, 4, 1.0), (0, 2, 2.0), (2, 4, 2.0), (4, 3, 1.0), (3, 9, 1.0),
+                  (4, 5, 2.0), (5, 9, 2.0)])
+    assert disjoint_paths(g, 0, 9, 2) == [([0, 1, 4, 3, 9], 4.0), ([0, 2, 4, 5, 9], 8.0)]
+    assert disjoint_paths(g, 0, 9, 2, nodes=True) == [([0, 1, 4, 3, 9], 4.0)]
+    assert disjoint_paths(g, 0, 9, 1, avoid=[0, 1, 4, 3, 9]) == [([0, 2, 4, 5, 9], 8.0)]
+    assert disjoint_paths(g, 0, 9, 1, nodes=True, avoid=[0, 1, 4, 3, 9]) == []
+    # links disabled since the CSR view was built are skipped when gs is given
+    gs.links[gs.edge_index[(4, 5)]].enabled = False
+    assert disjoint_paths(g, 0, 9, 1, avoid=[0, 1, 4, 3, 9], gs=gs) == []
+
+
+def test_backups_avoid_the_route_and_each_other():
+    nodes = synthetic_nodes(400, seed=3)
+    gs = build_graph(nodes)
+    aco = ACO(gs)
+    g = aco.graph
+    found = 0
+    for s, d, path, _cost in reachable_pairs(gs, nodes, 6, 1, aco.costs):
+        for nodes_mode in (False, True):
+            backups = disjoint_paths(g, s, d, 3, nodes=nodes_mode, avoid=path, gs=gs)
+            found += len(backups)
+            used = _links(path)
+            inner = set(path[1:-1])
+            costs = [c for _p, c in backups]
+            assert costs == sorted(costs)
+            for p, c in backups:
+                assert p[0] == s and p[-1] == d and len(set(p)) == len(p)
+                assert not used & _links(p)
+                assert math.isclose(c, sum(aco.costs[(u, v)] for u, v in zip(p, p[1:])))
+                used |= _links(p)
+                if nodes_mode:
+                    assert not inner & set(p[1:-1])
+                    inner |= set(p[1:-1])
+    assert found
+
+
+def test_failover_prefers_the_current_node_then_cranks_back():
+    path = [1, 2, 3, 4, 9]
+    via_3 = [1, 5, 3, 6, 9]
+    via_src = [1, 7, 8, 9]
+    # at 3 with 3->4 down: continue on the backup that passes through 3
+    assert failover(path, 2, [via_src, via_3], [(3, 4)]) == ([1, 2, 3, 6, 9], 1)
+    # at 4 with 4->9 down: walk back to 3 rather than to the source
+    assert failover(path, 3, [via_src, via_3], [(4, 9)]) == ([1, 2, 3, 4, 3, 6, 9], 1)
+    # a backup whose remaining hops are down is skipped
+    assert failover(path, 3, [via_src, via_3], [(4, 9), (6, 3)]) == ([1, 2, 3, 4, 3, 2, 1, 7, 8, 9], 0)
+    assert failover(path, 3, [via_src], [(4, 9), (8, 9)]) is None
+    assert failover(path, 0, [], [(1, 2)]) is None
+
+
+def test_send_packet_computes_backups_only_when_asked(monkeypatch):
+    gs = build_graph(synthetic_nodes(400, seed=3))
+    aco = ACO(gs)
+    s, d, path, _cost = next(pc for pc in reachable_pairs(gs, gs.nodes, 6, 1, aco.costs)
+                             if disjoint_paths(aco.graph, pc[0], pc[1], 1, avoid=pc[2]))
+    monkeypatch.setattr(controller, "STATE", gs)
+    monkeypatch.setattr(controller, "ROUTES", controller.RouteCache(8))
+    built = []
+    monkeypatch.setattr(controller, "ACO", lambda g: built.append(g) or ACO(g))
+    client = TestClient(controller.app)
+
+    # a client-supplied path with the default aco.backup_paths (0) builds nothing
+    r = client.post("/simulate/send-packet", json={"src": s, "dst": d, "path": path})
+    assert r.json()["backups"] == [] and not built
+
+    r = client.post("/simulate/send-packet", json={"src": s, "dst": d, "path": path, "k_paths": 2})
+    (backup,) = r.json()["backups"]
+    assert backup[0] == s and backup[-1] == d and not _links(path) & _links(backup)
+    assert len(built) == 1
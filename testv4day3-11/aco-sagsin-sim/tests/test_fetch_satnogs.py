@@ -19,6 +19,9 @@ def test_fetch_satnogs_handles_lng_and_altitude(monkeypatch):
 
     # Fake httpx client/response
     class FakeResponse:
+        status_code = 200
+        headers: dict = {}
+
         def raise_for_status(self):
             return None
 
@@ -35,7 +38,7 @@ def test_fetch_satnogs_handles_lng_and_altitude(monkeypatch):
         def __exit__(self, exc_type, exc, tb):
             return False
 
-        def get(self, url):
+        def get(self, url, headers=None):
             assert url == mod.API
             return FakeResponse()
 
@@ -57,6 +60,7 @@ def test_fetch_satnogs_handles_lng_and_altitude(monkeypatch):
     # Disable cache IO
     monkeypatch.setattr(mod, "load_cache", lambda *a, **k: None)
     monkeypatch.setattr(mod, "save_cache", lambda *a, **k: None)
+    monkeypatch.setattr(mod, "conditional_headers", lambda name: {})
 
     nodes = mod.fetch()
     assert len(nodes) == 2
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.net.geometry import Geometry
+from src.net.link_models import haversine_km
+from src.types import Node
+
+
+def _nodes():
+    return [
+        Node(id=3, kind="ground", lat=10.0, lon=20.0, alt_m=0.0),
+        Node(id=5, kind="sat", lat=-30.0, lon=170.0, alt_m=550_000.0),
+        Node(id=8, kind="air", lat=45.0, lon=-179.5, alt_m=10_000.0),
+    ]
+
+
+def test_surface_distance_matches_haversine():
+    nodes = _nodes()
+    geo = Geometry.from_nodes(nodes)
+    a, b = geo.rows([3, 5, 8]), geo.rows([5, 8, 3])
+    want = [haversine_km(nodes[i].lat, nodes[i].lon, nodes[j].lat, nodes[j].lon) for i, j in [(0, 1), (1, 2), (2, 0)]]
+    assert geo.surface_km(a, b) == pytest.approx(want)
+    assert geo.surface_km_block(a)[0, 1] == pytest.approx(want[0])
+
+
+def test_update_refreshes_positions_and_nearest():
+    nodes = _nodes()
+    geo = Geometry.from_nodes(nodes)
+    v0 = geo.version
+    nodes[2].lat, nodes[2].lon = 10.0, 21.0
+    geo.update(nodes)
+    assert geo.version > v0
+    best, km = geo.nearest(geo.rows([3]), np.arange(len(geo)))
+    assert int(geo.ids[best[0]]) == 8 and km[0] < 200
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import time
+import types
+
+import src.data.cache as cache
+
+import src.data.ingest as ingest
+from tests.http_standin import StandIn, fixture
+
+
+def _cfg(**bbox):
+    return types.SimpleNamespace(
+        enable_ground=True,
+        enable_sat=True,
+        enable_air=True,
+        enable_sea=True,
+        offline=False,
+        http_retries=2,
+        backoff_factor=0.0,
+        http_timeout_sec=5,
+        bbox={"min_lat": -90, "max_lat": 90, "min_lon": -180, "max_lon": 180, **bbox},
+    )
+
+
+def test_ingest_streams_all_sources_from_standin(monkeypatch):
+    saved = {}
+    monkeypatch.setattr(ingest, "load_cache", lambda name: None)
+    monkeypatch.setattr(ingest, "save_cache", lambda name, payload, validators=None: saved.__setitem__(name, payload))
+    routes = {
+        "/satnogs": fixture("ingest/satnogs.json"),
+        "/celestrak": fixture("ingest/celestrak.json"),
+        "/opensky": fixture("ingest/opensky.json"),
+        "/ndbc": fixture("ingest/ndbc.txt", "text/plain"),
+    }
+    with StandIn(routes, chunk=16) as srv:
+        urls = {
+            "satnogs": srv.base + "/satnogs",
+            "celestrak_active": srv.base + "/celestrak",
+            "opensky": srv.base + "/opensky",
+            "ndbc": srv.base + "/ndbc",
+        }
+        nodes = ingest.run(_cfg(), urls)
+
+    kinds = [n.kind for n in nodes]
+    # canonical source order, invalid records dropped
+    assert kinds == ["ground"] * 2 + ["sat"] * 2 + ["air"] * 2 + ["sea"] * 2
+    assert nodes[0].name == "GS-Hanoi" and nodes[4].name == "VNA123"
+    assert len(saved["opensky"]) == 2
+
+
+def test_ingest_applies_bbox_while_streaming(monkeypatch):
+    monkeypatch.setattr(ingest, "load_cache", lambda name: None)
+    monkeypatch.setattr(ingest, "save_cache", lambda name, payload, validators=None: None)
+    with StandIn({"/satnogs": fixture("ingest/satnogs.json")}) as srv:
+        cfg = _cfg(min_lat=0, max_lat=30, min_lon=90, max_lon=120)
+        cfg.enable_sat = cfg.enable_air = cfg.enable_sea = False
+        nodes = ingest.run(cfg, {"satnogs": srv.base + "/satnogs"})
+    assert [n.name for n in nodes] == ["GS-Hanoi"]
+
+
+def test_conditional_refetch_renews_on_304(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache, "load_config", lambda: types.SimpleNamespace(cache_ttl_sec=60, enable_db=False))
+    cache.clear_memory_cache()
+    body = fixture("ingest/satnogs.json")({})[2]
+    seen = []
+
+    def handler(req):
+        seen.append(req.get("If-None-Match"))
+        if req.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"', "Content-Length": "0"}, b""
+        return 200, {"Content-Type": "application/json", "ETag": '"v1"'}, body
+
+    cfg = _cfg()
+    cfg.enable_sat = cfg.enable_air = cfg.enable_sea = False
+    with StandIn({"/satnogs": handler}) as srv:
+        urls = {"satnogs": srv.base + "/satnogs"}
+        first = ingest.run(cfg, urls)
+        meta_p = tmp_path / "satnogs.meta.json"
+        meta = json.loads(meta_p.read_text())
+        assert meta["validators"] == {"etag": '"v1"'}
+        meta["ts"] = time.time() - 3600
+        meta_p.write_text(json.dumps(meta))
+        cache.clear_memory_cache()
+        second = ingest.run(cfg, urls)
+
+    assert seen == [None, '"v1"']
+    assert [n.name for n in second] == [n.name for n in first]
+    assert time.time() - json.loads(meta_p.read_text())["ts"] < 60
+    cache.clear_memory_cache()
+
+
+def _truncated_then(full: bytes, fail_times: int):
+    calls = []
+
+    def handler(_req):
+        calls.append(1)
+        body = full if len(calls) > fail_times else full[: full.index(b"GS-Paris")]
+        return 200, {"Content-Type": "application/json"}, body
+
+    return handler
+
+
+def test_midstream_failure_retries_without_duplicates(monkeypatch):
+    saved = {}
+    monkeypatch.setattr(ingest, "load_cache", lambda name: None)
+    monkeypatch.setattr(ingest, "save_cache", lambda name, payload, validators=None: saved.__setitem__(name, payload))
+    body = fixture("ingest/satnogs.json")({})[2]
+    cfg = _cfg()
+    cfg.enable_sat = cfg.enable_air = cfg.enable_sea = False
+    with StandIn({"/satnogs": _truncated_then(body, 1)}) as srv:
+        nodes = ingest.run(cfg, {"satnogs": srv.base + "/satnogs"})
+    assert [n.name for n in nodes] == ["GS-Hanoi", "GS-Paris"]
+    assert [n["name"] for n in saved["satnogs"]] == ["GS-Hanoi", "GS-Paris"]
+
+
+def test_truncated_feed_is_not_cached_and_falls_back(monkeypatch):
+    saved = {}
+    monkeypatch.setattr(ingest, "load_cache", lambda name: None)
+    monkeypatch.setattr(ingest, "save_cache", lambda name, payload, validators=None: saved.__setitem__(name, payload))
+    old = [{"id": 7, "kind": "ground", "lat": 1.0, "lon": 2.0, "alt_m": 0.0, "name": "old-0"},
+           {"id": 8, "kind": "ground", "lat": 1.0, "lon": 3.0, "alt_m": 0.0, "name": "old-1"}]
+    monkeypatch.setattr(ingest, "load_stale_cache", lambda name: old)
+    body = fixture("ingest/satnogs.json")({})[2]
+    cfg = _cfg()
+    cfg.enable_sat = cfg.enable_air = cfg.enable_sea = False
+    with StandIn({"/satnogs": _truncated_then(body, 99)}) as srv:
+        nodes = ingest.run(cfg, {"satnogs": srv.base + "/satnogs"})
+    # the one fresh record, then the previous entry from where the stream broke off
+    assert [n.name for n in nodes] == ["GS-Hanoi", "old-1"]
+    assert saved == {}
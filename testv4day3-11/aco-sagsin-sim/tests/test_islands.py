@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+
+from src.aco.csr import Colony, build_csr
+from src.aco.islands import IslandACO, island_params
+from src.aco.solver import ACO
+
+
+def test_colony_replays_aco_for_same_seed(topo):
+    gs, aco = topo.gs, topo.aco
+    aco.cfg = replace(aco.cfg, ants=6, iters=8, backend="python")
+    g = build_csr(gs, aco.costs)
+    assert g.n_edges == len(aco.costs)
+    for i, (s, d, _p, _c) in enumerate(topo.pairs(3)):
+        a = ACO(gs)
+        a.cfg = aco.cfg
+        want = a.run(s, d, stagnation=0, seed=i)
+        col = Colony(g, aco.cfg, np.random.default_rng(i))
+        for _ in range(8):
+            col.iterate(g.row_of[s], g.row_of[d], 6)
+        assert g.path_ids(col.best_rows) == want.path
+        assert col.best_cost == want.cost
+
+
+def test_islands_share_a_valid_best_path(topo):
+    gs = topo.gs
+    solver = IslandACO(gs, islands=2, exchange_every=2)
+    solver.cfg = replace(solver.cfg, ants=4, iters=6, goal="dijkstra")
+    s, d, _opt_path, opt = topo.pairs(1, seed=1)[0]
+    res = solver.run(s, d, stagnation=0, seed=5)
+    assert res.path[0] == s and res.path[-1] == d
+    assert res.cost >= opt - 1e-9
+    assert abs(sum(solver.costs[(u, v)] for u, v in zip(res.path, res.path[1:])) - res.cost) < 1e-9
+    assert res.iterations == 6 and not res.truncated
+
+    single = IslandACO(gs, islands=1)
+    single.cfg = solver.cfg
+    a, b = single.run(s, d, seed=3), single.run(s, d, seed=3)
+    assert a.path == b.path and a.cost == b.cost
+    assert island_params(solver.cfg, 0) == solver.cfg
+    assert island_params(solver.cfg, 2).q0 > solver.cfg.q0
+
+
+def test_single_island_replays_aco_seed(topo):
+    gs, aco = topo.gs, topo.aco
+    (s, d, _p, _c), = topo.pairs(1, seed=1)
+    aco.cfg = replace(aco.cfg, ants=6, iters=8, stagnation_iters=0)
+    solver = IslandACO(gs, islands=1)
+    solver.cfg = aco.cfg
+    want = aco.run(s, d, seed=123)
+    got = solver.run(s, d, seed=123)
+    assert got.seed == 123
+    assert (got.path, got.cost, got.converged_at) == (want.path, want.cost, want.converged_at)
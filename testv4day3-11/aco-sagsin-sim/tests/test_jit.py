@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from src.aco import jit
+from src.aco.csr import Colony
+from src.aco.solver import ACO
+
+needs_numba = pytest.mark.skipif(not jit.NUMBA_AVAILABLE, reason="numba not installed")
+
+
+def test_python_backend_and_missing_numba_use_plain_colony(monkeypatch, topo):
+    aco, (pair,) = topo.aco, topo.pairs(1)
+    cfg = replace(aco.cfg, backend="python")
+    assert type(jit.make_colony(aco.graph, cfg, np.random.default_rng(0))) is Colony
+    monkeypatch.setattr(jit, "NUMBA_AVAILABLE", False)
+    cfg = replace(aco.cfg, backend="numba")
+    assert type(jit.make_colony(aco.graph, cfg, np.random.default_rng(0))) is Colony
+    aco.cfg = replace(cfg, ants=4, iters=4, goal="dijkstra")
+    res = aco.run(*pair[:2])
+    assert res.path[0] == pair[0] and res.path[-1] == pair[1]
+    assert res.backend == "python"
+
+
+@needs_numba
+def test_jit_colony_is_bitwise_reproducible_per_seed(topo):
+    gs, aco, pairs = topo.gs, topo.aco, topo.pairs(3)
+    for mode in ({"goal": "none", "backtracks": 2}, {"goal": "dijkstra", "candidates": 3}):
+        cfg = replace(aco.cfg, backend="numba", ants=6, iters=8, stagnation_iters=0, **mode)
+        runs = []
+        for _ in range(2):
+            a = ACO(gs, rng=np.random.default_rng(7))
+            a.cfg = cfg
+            res = [a.run(s, d) for s, d, _p, _c in pairs]
+            runs.append(([(r.path, r.cost, r.converged_at) for r in res], a.tau.copy()))
+        assert runs[0][0] == runs[1][0]
+        assert np.array_equal(runs[0][1], runs[1][1])
+        assert any(path for path, _c, _at in runs[0][0])
+        for (path, cost, _at), (s, d, _p, opt) in zip(runs[0][0], pairs):
+            if not path:
+                continue
+            assert path[0] == s and path[-1] == d and len(set(path)) == len(path)
+            assert cost >= opt - 1e-9
+
+
+@needs_numba
+def test_jit_colony_follows_python_colony_when_greedy(topo):
+    # with q0 = 1 every step is the argmax, so both backends take the same
+    # steps regardless of their random streams
+    aco, pairs = topo.aco, topo.pairs(3)
+    cfg = replace(aco.cfg, q0=1.0, goal="dijkstra", bidirectional=False, backtracks=1, candidates=0)
+    g = aco.graph
+    for s, d, _p, _c in pairs:
+        py = Colony(g, cfg, np.random.default_rng(1))
+        nb = jit.JitColony(g, cfg, np.random.default_rng(1))
+        for _ in range(3):
+            py.iterate(g.row_of[s], g.row_of[d], 4)
+            nb.iterate(g.row_of[s], g.row_of[d], 4)
+        assert nb.best_rows == py.best_rows and nb.best_cost == py.best_cost
+        assert np.array_equal(nb.tau_np, py.tau_np)
+
+
+@needs_numba
+def test_walk_kernel_matches_its_interpreted_form(topo):
+    aco, pairs = topo.aco, topo.pairs(3)
+    g = aco.graph
+    cfg = replace(aco.cfg, goal="none", candidates=4, backtracks=3)
+    col = jit.JitColony(g, cfg, np.random.default_rng(3))
+    s, d = g.row_of[pairs[0][0]], g.row_of[pairs[0][1]]
+    col.prepare(s, d)
+    out = []
+    for fn in (jit._walk, jit._walk.py_func):
+        tau = col.tau_np.copy()
+        state = jit.rng_state(11)
+        mark = np.zeros(len(g.ids), dtype=np.int64)
+        rows, edges = np.empty(len(g.ids), dtype=np.int64), np.empty(len(g.ids), dtype=np.int64)
+        walks = []
+        for stamp in range(1, 6):
+            n, acc = fn(g.indptr, g.indices, g.cost, tau, col._eta, col._cptr, col._cedge, s, d,
+                        cfg.alpha, cfg.q0, cfg.xi, cfg.tau0, cfg.backtracks, mark, stamp, rows, edges,
+                        col._opts, col._scores, state)
+            walks.append((rows[:n].tolist(), acc))
+        out.append((walks, tau))
+    assert out[0][0] == out[1][0]
+    assert np.array_equal(out[0][1], out[1][1])
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.services.controller as controller
+from src.net.graph import build_graph
+from src.types import Node
+
+
+@pytest.fixture
+def client():
+    nodes = [Node(id=i, kind="ground", lat=0.0, lon=i * 0.5, alt_m=0.0) for i in range(40)]
+    controller.STATE = build_graph(nodes)
+    try:
+        yield TestClient(controller.app)
+    finally:
+        controller.STATE = None
+
+
+def test_unchanged_poll_is_304_until_graph_changes(client):
+    r = client.get("/links")
+    etag = r.headers["etag"]
+    assert r.status_code == 200 and len(r.json()) == len(controller.STATE.links)
+    assert client.get("/links", headers={"If-None-Match": etag}).status_code == 304
+
+    e = controller.STATE.links[0]
+    client.post("/simulate/toggle-link", json={"u": e.u, "v": e.v, "enabled": False})
+    r = client.get("/links", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["etag"] != etag
+
+
+def test_cursor_pages_cover_everything_once(client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7, "fields": "id,name"}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/nodes", params=params)
+        page = r.json()
+        assert all(set(p) == {"id", "name"} for p in page)
+        assert r.headers["x-total-count"] == "40"
+        seen += [p["id"] for p in page]
+        cursor = r.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert seen == list(range(40))
+
+    stale = client.get("/nodes", params={"limit": 7}).headers["x-next-cursor"]
+    controller.STATE.touch()
+    assert client.get("/nodes", params={"cursor": stale}).status_code == 410
+    assert client.get("/nodes", params={"fields": "id,bogus"}).status_code == 400
+
+
+def test_columns_format_and_gzip(client):
+    r = client.get("/links", params={"format": "columns", "fields": "u,v"})
+    body = r.json()
+    assert body["fields"] == ["u", "v"]
+    assert len(body["columns"]["u"]) == len(controller.STATE.links)
+
+    plain = client.get("/links", headers={"Accept-Encoding": "identity"})
+    packed = client.get("/links", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers
+    assert packed.headers["content-encoding"] == "gzip"
+    assert int(packed.headers["content-length"]) < len(plain.content)
+    assert packed.json() == plain.json()  # the test client decodes gzip transparently
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from src.lib import metrics
+from src.net.geometry import Geometry
+from src.types import Node
+
+
+def _nodes():
+    return [
+        Node(id=10, kind="ground", lat=0.0, lon=0.0, alt_m=0.0),
+        Node(id=11, kind="sat", lat=5.0, lon=5.0, alt_m=550_000.0),
+        Node(id=12, kind="ground", lat=10.0, lon=10.0, alt_m=0.0),
+    ]
+
+
+def _scalar_latency(path, nodes):
+    by_id = {n.id: n for n in nodes}
+    total = 0.0
+    for u, v in zip(path, path[1:]):
+        a, b = by_id[u], by_id[v]
+        d = metrics.slant_range_m(a.lat, a.lon, a.alt_m, b.lat, b.lon, b.alt_m)
+        bps = metrics.link_throughput_bps_from_budget(d)
+        total += metrics.hop_latency_ms(1500, max(1.0, bps), d)
+    return total
+
+
+def test_path_metrics_match_scalar_formulas():
+    nodes = _nodes()
+    idx = Geometry.from_nodes(nodes)
+    path = [10, 11, 12]
+    res = metrics.path_metrics(path, idx)
+    assert res["latency_ms"] == pytest.approx(_scalar_latency(path, nodes))
+    assert len(res["hops"]) == 2 and res["hops"][0]["u"] == 10
+    assert res["throughput_mbps"] == pytest.approx(min(h["throughput_mbps"] for h in res["hops"]))
+    assert metrics.path_latency_ms_for_state(path, nodes) == pytest.approx(res["latency_ms"])
+
+
+def test_batch_path_metrics_handles_empty_and_unknown_hops():
+    idx = Geometry.from_nodes(_nodes())
+    out = metrics.batch_path_metrics([[10, 11], [], [10, 99], [11, 12, 10]], idx)
+    assert out[0]["latency_ms"] > 0
+    assert out[1] == {"latency_ms": 0.0, "throughput_mbps": 0.0}
+    assert out[2]["latency_ms"] == 0.0
+    assert math.isfinite(out[3]["throughput_mbps"])
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+
+from src.data.nodeset import NodeSet, has_fresh_columnar, write_nodeset
+from src.net.updater import rebuild_from_nodes
+from src.types import Node
+
+
+def _nodes():
+    return [
+        Node(id=0, kind="ground", lat=0.0, lon=0.0, alt_m=0.0, name="Hà Nội"),
+        Node(id=1, kind="ground", lat=0.1, lon=0.1, alt_m=0.0, name=""),
+        Node(id=2, kind="sat", lat=0.2, lon=0.2, alt_m=550000.0, name="sat-2"),
+    ]
+
+
+def test_roundtrip_and_row_access(tmp_path):
+    nodes = _nodes()
+    write_nodeset(nodes, tmp_path / "nodes.npy")
+    ns = NodeSet(tmp_path / "nodes.npy")
+    assert len(ns) == 3
+    assert ns.row(0)["name"] == "Hà Nội"
+    assert ns.nodes() == nodes
+    assert isinstance(ns.lat, np.memmap) or ns.lat.base is not None
+
+
+def test_rebuild_prefers_fresh_columnar(tmp_path):
+    nodes = _nodes()
+    jp = tmp_path / "nodes.json"
+    jp.write_text(json.dumps([n.__dict__ for n in nodes]), encoding="utf-8")
+    assert not has_fresh_columnar(jp)
+    write_nodeset(nodes, tmp_path / "nodes.npy")
+    assert has_fresh_columnar(jp)
+    gs = rebuild_from_nodes(str(jp))
+    assert [n.id for n in gs.nodes] == [0, 1, 2]
+    assert gs.geometry is not None and len(gs.geometry) == 3
+
+    # a newer JSON (e.g. written by the controller from MongoDB) wins
+    st = os.stat(tmp_path / "nodes.npy")
+    os.utime(jp, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not has_fresh_columnar(jp)
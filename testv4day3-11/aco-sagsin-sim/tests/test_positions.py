@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import math
+
+import numpy as np
+
+from src.services.positions import PositionStream, compute_positions, unpack
+
+
+def _scalar(i, kind, lat, lon, now, speed):
+    # the per-node loop /nodes/positions used before vectorizing
+    dps = {"sat": 0.15, "air": 0.02, "sea": 0.005}
+    jit = {"air": 1.0, "sea": 0.2, "sat": 0.0}
+    if kind in dps:
+        lon = ((lon + dps[kind] * now * speed + 180.0) % 360.0) - 180.0
+        jk = jit.get(kind, 0.0)
+        if jk > 0:
+            lat = max(-90.0, min(90.0, lat + (math.sin((now * speed) / 17.0 + i) * jk) / 111.0))
+    return lat, lon
+
+
+def test_vectorized_positions_match_scalar_loop():
+    rng = np.random.default_rng(1)
+    n = 500
+    ids = np.arange(n)
+    kinds = rng.choice(["sat", "air", "ground", "sea"], n).tolist()
+    lat0, lon0 = rng.uniform(-89.99, 89.99, n), rng.uniform(-180, 180, n)
+    lat, lon = compute_positions(ids, kinds, lat0, lon0, now=1.7e9 + 0.25, speed=3.0)
+    for i in range(n):
+        want = _scalar(i, kinds[i], lat0[i], lon0[i], 1.7e9 + 0.25, 3.0)
+        assert math.isclose(lat[i], want[0], abs_tol=1e-9) and math.isclose(lon[i], want[1], abs_tol=1e-9)
+
+
+def _data(frame):
+    return json.loads(frame.split("data: ", 1)[1])
+
+
+def test_stream_sends_key_frame_then_only_moved_nodes():
+    s = PositionStream(min_delta_deg=0.01)
+    ids = np.array([10, 11, 12])
+    lat, lon, alt = np.zeros(3), np.array([0.0, 179.999, 5.0]), np.ones(3)
+    key = _data(s.publish(ids, lat, lon, alt))
+    assert key["key"] and key["n"] == 3
+
+    q = s.subscribe()  # late joiner starts from the current baseline
+    assert _data(q.get_nowait())["key"]
+
+    lon2 = np.array([0.005, -179.995, 5.5])  # below threshold, across the antimeridian, moved
+    delta = _data(s.publish(ids, lat, lon2, alt))
+    assert not delta["key"] and delta["n"] == 1
+    got_ids, _, got_lon, _ = unpack(delta["data"])
+    assert got_ids.tolist() == [12] and abs(got_lon[0] - 5.5) < 1e-6
+    assert _data(q.get_nowait())["seq"] == delta["seq"]
+
+    # small steps accumulate against the baseline until they cross the threshold
+    assert s.publish(ids, lat, lon2, alt) is None
+    lon3 = lon2 + np.array([0.006, 0.0, 0.0])
+    assert unpack(_data(s.publish(ids, lat, lon3, alt))["data"])[0].tolist() == [10]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import src.services.controller as controller
+from src.aco.routes import RouteCache, link_key
+from src.aco.solver import ACO, SolveResult
+from src.net.shortest import shortest_path
+from src.net.updater import update_epoch
+
+
+def _cached(topo, n_pairs=4, capacity=16):
+    gs, aco = topo.gs, topo.aco
+    pairs = topo.pairs(n_pairs)
+    cache = RouteCache(capacity, pheromone=0.5, tau0=aco.cfg.tau0)
+    for s, d, path, cost in pairs:
+        solver = ACO(gs)
+        res = solver.run(s, d, seed=1)
+        cache.put((s, d), res.path or path, res.cost if res.path else cost, solver.graph, solver.tau)
+    return gs, aco.costs, cache, pairs
+
+
+def _set(gs, u, v, enabled):
+    gs.links[gs.edge_index[(u, v)]].enabled = enabled
+    gs.touch()
+
+
+def test_only_routes_over_a_failed_link_are_repaired(topo):
+    gs, costs, cache, pairs = _cached(topo)
+    (s, d, _p, _c), = pairs[:1]
+    route = cache.get((s, d))
+    u, v = route.path[len(route.path) // 2 - 1], route.path[len(route.path) // 2]
+    users = cache.routes_using(u, v)
+    assert (s, d) in users
+    untouched = {k: cache.get(k).path for k in [(p[0], p[1]) for p in pairs] if k not in users}
+
+    _set(gs, u, v, False)
+    rep = cache.links_down(gs, [(u, v)])
+    assert rep.affected == len(users) and rep.repaired + rep.dropped == rep.affected
+    fixed = cache.get((s, d), gs)
+    assert fixed is not None and fixed.repairs == 1
+    path = fixed.path
+    assert path[0] == s and path[-1] == d and len(set(path)) == len(path)
+    assert link_key(u, v) not in {link_key(a, b) for a, b in zip(path, path[1:])}
+    assert all(gs.links[gs.edge_index[(a, b)]].enabled for a, b in zip(path, path[1:]))
+    assert math.isclose(fixed.cost, sum(costs[(a, b)] for a, b in zip(path, path[1:])))
+    assert fixed.cost >= shortest_path(gs, s, d, costs)[1] - 1e-9
+    assert (s, d) not in cache.routes_using(u, v)
+    for k, p in untouched.items():
+        assert cache.get(k).path == p and cache.get(k).repairs == 0
+
+
+def test_unrepairable_routes_are_dropped_and_unindexed(topo):
+    gs, _costs, cache, pairs = _cached(topo, n_pairs=1)
+    s, d, _p, _c = pairs[0]
+    cut = [(d, v) for v in gs.adj[d]]
+    for u, v in cut:
+        _set(gs, u, v, False)
+    rep = cache.links_down(gs, cut)
+    assert (rep.affected, rep.dropped) == (1, 1)
+    assert cache.get((s, d)) is None and len(cache) == 0
+    assert not any(cache.routes_using(u, v) for u, v in cut)
+
+
+def test_stale_hits_eviction_and_epoch_flips(topo):
+    gs, _costs, cache, pairs = _cached(topo, n_pairs=3, capacity=2)
+    assert len(cache) == 2 and cache.get((pairs[0][0], pairs[0][1])) is None
+    key = (pairs[2][0], pairs[2][1])
+    a, b = cache.get(key).path[:2]
+    # a change the cache was not told about is caught on lookup
+    _set(gs, a, b, False)
+    assert cache.get(key, gs) is None and not cache.routes_using(a, b)
+
+    before = [link.enabled for link in gs.links]
+    update_epoch(gs, np.random.default_rng(3))
+    changed = {(link.u, link.v) for link, was in zip(gs.links, before) if link.enabled != was}
+    assert changed and set(gs.last_flips) == changed
+
+
+def test_hits_report_their_solve_and_truncated_solves_are_not_kept(monkeypatch, topo):
+    gs, _costs, cache, pairs = _cached(topo, n_pairs=1)
+    (s, d, path, cost), = pairs
+    cache.put((d, s), path[::-1], cost, cache.get((s, d)).graph, solve=SolveResult(truncated=True))
+    assert cache.get((d, s)) is None
+
+    monkeypatch.setattr(controller, "STATE", gs)
+    monkeypatch.setattr(controller, "ROUTES", RouteCache(8))
+    client = TestClient(controller.app)
+    solved = client.post("/route", json={"src": s, "dst": d}).json()
+    hit = client.post("/route", json={"src": s, "dst": d}).json()
+    assert not solved["cached"] and hit["cached"] and hit["path"] == solved["path"]
+    for k in ("seed", "iterations", "converged_at", "truncated", "backend"):
+        assert hit[k] == solved[k]
+    assert hit["seed"] is not None and hit["iterations"] > 0
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import itertools
+
+from src.aco.objective import compute_edge_costs
+from src.bench.quality import bench_quality, parse_variants
+from src.net.graph import build_graph
+from src.net.shortest import dijkstra, shortest_path
+from src.types import Node
+
+
+def _brute(gs, costs, src, dst):
+    best = float("inf")
+    others = [n.id for n in gs.nodes if n.id not in (src, dst)]
+    for k in range(len(others) + 1):
+        for mid in itertools.permutations(others, k):
+            p = (src, *mid, dst)
+            if all((u, v) in costs for u, v in zip(p, p[1:])):
+                best = min(best, sum(costs[(u, v)] for u, v in zip(p, p[1:])))
+    return best
+
+
+def test_shortest_path_matches_brute_force_and_skips_disabled():
+    # ground chain 33 km apart with jitter: each node reaches its next two neighbours
+    nodes = [Node(id=i, kind="ground", lat=0.05 * (i % 2), lon=0.3 * i, alt_m=0) for i in range(6)]
+    gs = build_graph(nodes)
+    costs = compute_edge_costs(gs)
+    for s, d in [(0, 5), (1, 4), (5, 0)]:
+        path, cost = shortest_path(gs, s, d, costs)
+        assert path[0] == s and path[-1] == d
+        assert abs(cost - _brute(gs, costs, s, d)) < 1e-9
+        assert abs(sum(costs[(u, v)] for u, v in zip(path, path[1:])) - cost) < 1e-9
+    dist, _ = dijkstra(gs, 0, costs)
+    assert set(dist) == set(range(6)) and dist[0] == 0.0
+
+    # cutting every link out of node 5 makes it unreachable
+    for v in gs.adj[5]:
+        gs.links[gs.edge_index[(5, v)]].enabled = False
+    assert shortest_path(gs, 0, 5, costs) == ([], float("inf"))
+
+
+def test_quality_harness_reports_gap_and_curves():
+    r = bench_quality(150, seed=1, pairs=3, variants=parse_variants("4x3,6x5"))
+    assert r["pairs"] > 0
+    for v, iters in zip(r["variants"], (3, 5)):
+        assert len(v["anytime"]) == iters
+        assert v["success_rate"] + v["bfs_fallback_rate"] == 1.0
+        if v["gap_mean"] is not None:
+            assert v["gap_mean"] >= -1e-9 and v["latency_ms_p99"] >= v["latency_ms_p50"]
+        found = [c["found"] for c in v["anytime"]]
+        assert found == sorted(found)
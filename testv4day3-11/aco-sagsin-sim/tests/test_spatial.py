@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import src.services.controller as controller
+from src.bench.spatial import synthetic_geometry
+from src.net.geometry import Geometry
+from src.net.graph import build_graph
+from src.net.spatial import SpatialIndex
+from src.types import Node
+
+
+def _brute_km(geo, lat, lon):
+    q = Geometry(np.array([0]), np.array([lat]), np.array([lon]), np.zeros(1))
+    chord = np.linalg.norm(geo.unit - q.unit[0], axis=1)
+    return 2 * 6371.0 * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def test_queries_match_brute_force():
+    geo = synthetic_geometry(10_000)
+    idx = SpatialIndex(geo)
+    km = _brute_km(geo, 21.0, 105.8)
+    rows, d = idx.nearest(21.0, 105.8, k=5)
+    assert rows.tolist() == np.argsort(km)[:5].tolist()
+    np.testing.assert_allclose(d, np.sort(km)[:5], rtol=1e-9)
+
+    sats = np.flatnonzero(np.asarray(geo.kinds) == "sat")
+    rows, _ = idx.within(21.0, 105.8, 800.0, kind="sat")
+    assert set(rows.tolist()) == set(sats[km[sats] <= 800.0].tolist())
+
+    rows = idx.bbox(-10, 10, 170, -170)  # wraps the antimeridian
+    want = (np.abs(geo.lat) <= 10) & ((geo.lon >= 170) | (geo.lon <= -170))
+    assert set(rows.tolist()) == set(np.flatnonzero(want).tolist())
+
+    best, _ = idx.nearest_rows(np.arange(50), kind="sat")
+    ref, _ = geo.nearest(np.arange(50), sats)
+    assert best.tolist() == ref.tolist()
+
+
+def test_tree_follows_position_updates_and_endpoints():
+    nodes = [Node(id=i, kind="ground", lat=0.0, lon=float(i), alt_m=0.0) for i in range(5)]
+    gs = build_graph(nodes)
+    controller.STATE = gs
+    try:
+        client = TestClient(controller.app)
+        got = client.get("/nodes/nearest", params={"lat": 0, "lon": 3.9, "k": 2}).json()
+        assert [g["id"] for g in got] == [4, 3]
+        nodes[0].lon = 3.95
+        gs.geometry.update(nodes)
+        got = client.get("/nodes/within", params={"lat": 0, "lon": 3.9, "radius_km": 8}).json()
+        assert [g["id"] for g in got] == [0]
+        got = client.get("/nodes/bbox", params={"min_lat": -1, "max_lat": 1, "min_lon": 0.5, "max_lon": 2.5}).json()
+        assert [g["id"] for g in got] == [1, 2]
+    finally:
+        controller.STATE = None
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.data.stream import JsonArrayItems
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64])
+def test_json_array_items_any_chunking(size):
+    data = [{"a": i, "s": "x]y,{"} for i in range(20)] + [[1, 2], 3.25, None]
+    text = json.dumps(data)
+    p = JsonArrayItems()
+    got = []
+    for i in range(0, len(text), size):
+        got.extend(p.feed(text[i:i + size]))
+    got.extend(p.close())
+    assert got == data
+
+
+def test_json_array_items_under_key():
+    doc = json.dumps({"time": 1, "states": [["abc", "CS1"], ["def", None]], "tail": [9]})
+    p = JsonArrayItems(key="states")
+    got = []
+    for i in range(0, len(doc), 5):
+        got.extend(p.feed(doc[i:i + 5]))
+    got.extend(p.close())
+    assert got == [["abc", "CS1"], ["def", None]]
+    # the rest of the object arriving with the closing bracket is ignored
+    whole = JsonArrayItems(key="states")
+    assert whole.feed(doc) + whole.close() == got
+
+
+def test_json_array_items_missing_key_and_truncation():
+    p = JsonArrayItems(key="states")
+    assert p.feed('{"time": 1, "states": null}') == []
+    assert p.close() == []
+    t = JsonArrayItems()
+    t.feed('[{"a": 1}, {"b"')
+    with pytest.raises(ValueError):
+        t.close()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.net.geometry import Geometry
+from src.net.graph import build_graph
+from src.net.link_models import elevation_ok
+from src.net.visibility import elevation_deg, segment_clears_earth
+from src.types import Node
+
+R = 6_371_000.0
+
+
+def test_elevation_and_occlusion_batches():
+    obs = np.array([[R, 0, 0], [R, 0, 0]])
+    tgt = np.array([[R + 500e3, 0, 0], [R * np.cos(0.2), R * np.sin(0.2), 0]])
+    el = elevation_deg(obs, tgt)
+    assert el[0] == pytest.approx(90.0)
+    assert el[1] < 0
+
+    p1 = np.array([[R + 500e3, 0, 0], [R + 500e3, 0, 0]])
+    p2 = np.array([[-(R + 500e3), 0, 0], [R + 500e3, 100e3, 0]])
+    assert segment_clears_earth(p1, p2).tolist() == [False, True]
+
+
+def test_build_graph_enforces_elevation_min():
+    gnd = Node(id=0, kind="ground", lat=0.0, lon=0.0, alt_m=0.0)
+    overhead = Node(id=1, kind="sat", lat=0.5, lon=0.5, alt_m=550_000.0)
+    low = Node(id=2, kind="sat", lat=0.0, lon=15.0, alt_m=300_000.0)  # in range, ~2.4 deg elevation
+    assert elevation_ok(gnd, overhead, 5.0)
+    assert not elevation_ok(gnd, low, 5.0)
+
+    gs = build_graph([gnd, overhead, low])
+    assert (0, 1) in gs.edge_index
+    assert (0, 2) not in gs.edge_index
+    assert isinstance(gs.geometry, Geometry)
+
+
+def test_elevation_mask_only_gates_satellites():
+    gnd = Node(id=0, kind="ground", lat=0.0, lon=0.0, alt_m=0.0)
+    plane = Node(id=1, kind="air", lat=0.0, lon=2.2, alt_m=10_000.0)  # ~245 km, ~1.2 deg elevation
+    beyond = Node(id=2, kind="air", lat=0.0, lon=3.6, alt_m=10_000.0)  # past the radio horizon
+    assert elevation_ok(gnd, plane, 5.0)
+    assert not elevation_ok(gnd, beyond, 0.0)
+
+    gs = build_graph([gnd, plane])
+    assert (0, 1) in gs.edge_index